@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Compare the suds and zeep backends side by side; loading the bundled WSDL,
+marshalling requests, unmarshalling replies into Python dictionaries and
+full calls against a transport replying with the test fixtures.
+
+Usage: python benchmarks/backends.py [order lines]
+"""
+
+from __future__ import print_function
+
+import sys
+
+import suds.cache
+
+from common import get_client, get_fixture_transport, \
+    large_read_order_response, report
+
+
+BACKENDS = ('suds', 'zeep')
+
+READ_ORDER_KWARGS = {
+    'Checkout': {'OrderToken': '0cfb4be2-47cf-4eac-865c-d66657953d5c'}
+}
+
+
+def load(backend):
+    """ Load bundled WSDL, without suds' snapshot. """
+
+    get_client(
+        bundled_wsdl=True, cache=suds.cache.NoCache(), backend=backend
+    )
+
+
+def unmarshal(client, reply):
+    """ Return reply unmarshalled by the backend and converted. """
+
+    return client._to_python(
+        client.backend.unmarshal('ReadOrder', reply), 'ReadOrder'
+    )
+
+
+def main(lines=10):
+    clients = dict(
+        (backend, get_client(
+            bundled_wsdl=True, transport=get_fixture_transport(),
+            backend=backend
+        )) for backend in BACKENDS
+    )
+
+    reply = large_read_order_response(lines)
+    kwargs = clients['suds']._from_python(
+        dict(READ_ORDER_KWARGS, Webshop={'IntRef': 'x'}), 'ReadOrder'
+    )
+
+    timings = {}
+
+    for backend in BACKENDS:
+        client = clients[backend]
+
+        timings[backend] = [
+            report(
+                'load WSDL %s' % backend, lambda: load(backend), repeat=10
+            ),
+            report(
+                'marshal ReadOrder %s' % backend,
+                lambda: client.backend.marshal('ReadOrder', kwargs),
+                number=1000
+            ),
+            report(
+                'unmarshal ReadOrder %s (%d lines)' % (backend, lines),
+                lambda: unmarshal(client, reply), number=100
+            ),
+            report(
+                'call ReadOrder %s' % backend,
+                lambda: client.read_order(**READ_ORDER_KWARGS), number=100
+            ),
+        ]
+
+    for name, before, after in zip(
+        ('load', 'marshal', 'unmarshal', 'call'),
+        timings['suds'], timings['zeep']
+    ):
+        print('%-30s %10.2fx' % ('speedup zeep %s' % name, before / after))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
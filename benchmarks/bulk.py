@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Compare throughput of ReadOrder calls made one by one with client.map() at
+various concurrency levels, against the stand-in server with log-normally
+distributed latency, in requests per second.
+
+Usage: python benchmarks/bulk.py [number] [median latency in ms]
+"""
+
+from __future__ import print_function
+
+import sys
+import time
+
+from common import get_client
+
+from postnl_checkout.standin import StandinApp, StandinServer, lognormal
+
+
+WORKERS = (1, 4, 16, 32)
+
+
+def get_kwargs(number):
+    """ Return list of ReadOrder arguments. """
+
+    return [
+        {'Checkout': {'OrderToken': 'token-%d' % index}}
+        for index in range(number)
+    ]
+
+
+def main(number=200, latency=50):
+    server = StandinServer(
+        StandinApp(latency=lognormal(latency / 1e3, 0.25), seed=0)
+    ).start()
+
+    client = get_client(
+        bundled_wsdl=True, fast_parser=True, envelope_templates=True,
+        pool_size=max(WORKERS)
+    )
+    client.suds_client.set_options(location=server.location)
+
+    print('ReadOrder, %d calls, %d ms median latency' % (number, latency))
+
+    kwargs = get_kwargs(number)
+
+    start = time.time()
+    for item in kwargs:
+        client.read_order(**item)
+    timing = time.time() - start
+
+    print('%-30s %10.0f req/s' % ('sequential', number / timing))
+
+    for workers in WORKERS:
+        start = time.time()
+        results = list(client.map('read_order', kwargs, workers))
+        timing = time.time() - start
+
+        assert not any(result.exception for result in results)
+
+        print('%-30s %10.0f req/s' % (
+            'map, %d workers' % workers, number / timing
+        ))
+
+    client.suds_client.options.transport._session.close()
+    server.stop()
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Compare upstream requests and throughput of bursts of concurrent ReadOrder
+calls for a few order tokens, with and without coalescing of identical
+calls in flight, against the stand-in server with log-normally distributed
+latency.
+
+Usage: python benchmarks/coalescing.py [number] [tokens] [median latency in ms]
+"""
+
+from __future__ import print_function
+
+import sys
+import time
+
+from common import get_client
+
+from postnl_checkout.singleflight import SingleFlight
+from postnl_checkout.standin import StandinApp, StandinServer, lognormal
+
+
+WORKERS = 16
+
+
+def get_kwargs(number, tokens):
+    """ Return list of ReadOrder arguments, cycling through tokens. """
+
+    return [
+        {'Checkout': {'OrderToken': 'token-%d' % (index % tokens)}}
+        for index in range(number)
+    ]
+
+
+def main(number=400, tokens=4, latency=50):
+    app = StandinApp(latency=lognormal(latency / 1e3, 0.25), seed=0)
+    server = StandinServer(app).start()
+
+    client = get_client(
+        bundled_wsdl=True, fast_parser=True, envelope_templates=True,
+        pool_size=WORKERS
+    )
+    client.suds_client.set_options(location=server.location)
+
+    print('ReadOrder, %d calls for %d tokens, %d workers, %d ms latency' % (
+        number, tokens, WORKERS, latency
+    ))
+
+    kwargs = get_kwargs(number, tokens)
+
+    for name, single_flight in (
+        ('uncoalesced', None),
+        ('coalesced', SingleFlight())
+    ):
+        client.single_flight = single_flight
+        app.stats.clear()
+
+        start = time.time()
+        results = list(client.map('read_order', kwargs, WORKERS))
+        timing = time.time() - start
+
+        assert not any(result.exception for result in results)
+
+        requests = sum(
+            count for (operation, outcome), count in app.stats.items()
+            if operation == 'ReadOrder'
+        )
+
+        print('%-30s %10.0f req/s %10d upstream' % (
+            name, number / timing, requests
+        ))
+
+    client.suds_client.options.transport._session.close()
+    server.stop()
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
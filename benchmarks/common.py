@@ -0,0 +1,120 @@
+""" Helpers shared by the benchmark scripts. """
+
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from postnl_checkout.client import PostNLCheckoutClient
+from postnl_checkout.recording import RecordedExchange, ReplayTransport, \
+    get_key
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'tests', 'data')
+
+OPTIE_TEMPLATE = (
+    '<tpp:ReadOrderResponseOpties>'
+    '<tpp:Code>CARD%(index)d</tpp:Code>'
+    '<tpp:Prijs>%(index)d.50</tpp:Prijs>'
+    '<tpp:Text>Order line %(index)d</tpp:Text>'
+    '</tpp:ReadOrderResponseOpties>'
+)
+
+COMMUNICATIE_TEMPLATE = (
+    '<tpp:ReadOrderResponseCommunicatieOptie>'
+    '<tpp:Code>REMARK%(index)d</tpp:Code>'
+    '<tpp:Text>Remark %(index)d</tpp:Text>'
+    '</tpp:ReadOrderResponseCommunicatieOptie>'
+)
+
+
+def read_file(filename):
+    """ Return contents of file in test data directory. """
+    return open(os.path.join(DATA_DIR, filename)).read()
+
+
+def get_client(**kwargs):
+    """ Return client for the sandbox with the test credentials. """
+
+    return PostNLCheckoutClient(
+        username='klant1', password='xx',
+        webshop_id='a0713e4083a049a996c302f48bb3f535',
+        environment='sandbox', **kwargs
+    )
+
+
+def large_read_order_response(lines):
+    """
+    Return ReadOrder response fixture with the given number of options
+    (order lines) and communication options.
+    """
+
+    reply = read_file('read_order_response.xml')
+
+    opties = ''.join(
+        OPTIE_TEMPLATE % {'index': index} for index in range(lines)
+    )
+    communicatie = ''.join(
+        COMMUNICATIE_TEMPLATE % {'index': index} for index in range(lines)
+    )
+
+    reply = reply.replace(
+        '<tpp:Opties>', '<tpp:Opties>' + opties
+    )
+    reply = reply.replace(
+        '<tpp:CommunicatieOpties>', '<tpp:CommunicatieOpties>' + communicatie
+    )
+
+    return reply
+
+
+def get_fixture_transport(replies=None):
+    """
+    Return transport replying to operations with test fixtures, by default
+    those for a successful call.
+    """
+
+    if replies is None:
+        replies = {
+            'PrepareOrder': 'prepare_order_response.xml',
+            'ReadOrder': 'read_order_response.xml',
+            'ConfirmOrder': 'confirm_order_response.xml',
+            'UpdateOrder': 'update_order_response_success.xml',
+            'PingStatus': 'ping_status_response_ok.xml',
+        }
+
+    exchanges = dict(
+        (
+            get_key(operation, b''),
+            RecordedExchange(
+                operation, 200, 'text/xml', 0, b'', read_file(filename)
+            )
+        ) for operation, filename in replies.items()
+    )
+
+    # Unrecorded requests get the reply for their operation
+    return ReplayTransport(None, exchanges=exchanges)
+
+
+def unmarshal(client, operation, reply):
+    """ Return suds object unmarshalled from reply. """
+
+    method = getattr(client.service, operation).method
+
+    return method.binding.output.get_reply(method, reply)[1]
+
+
+def report(name, func, number=1, repeat=5):
+    """ Print best time per call of func. """
+
+    timing = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+    if timing < 1e-3:
+        print('%-30s %10.2f us' % (name, timing * 1e6))
+    else:
+        print('%-30s %10.2f ms' % (name, timing * 1e3))
+
+    return timing
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""
+Compare name based and schema driven (converter plan) conversion of a
+ReadOrder response to Pythonic format.
+
+Usage: python benchmarks/conversion.py [number]
+"""
+
+import sys
+
+from common import get_client, read_file, report, unmarshal
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    client = get_client(bundled_wsdl=True)
+
+    response = unmarshal(
+        client, 'ReadOrder', read_file('read_order_response.xml')
+    )
+
+    # Build plan before timing
+    client._get_converter_plan('ReadOrder')
+
+    assert client._to_python(response) == \
+        client._to_python(response, 'ReadOrder')
+
+    report(
+        'name based', lambda: client._to_python(response), number=number
+    )
+    report(
+        'converter plan', lambda: client._to_python(response, 'ReadOrder'),
+        number=number
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Compare parsing PostNL datetimes with strptime() to the fixed-format
+parser, on its own and in bulk conversion of an order history.
+
+Usage: python benchmarks/dates.py [orders]
+"""
+
+from __future__ import print_function
+
+import copy
+import datetime
+import random
+import sys
+
+from common import get_client, read_file, report
+
+from postnl_checkout.client import PostNLCheckoutClient
+from postnl_checkout.dates import DATETIME_FORMAT, _parse_datetime, \
+    parse_datetime
+
+
+class StrptimeClient(PostNLCheckoutClient):
+    """ Client parsing datetimes with strptime(), as before. """
+
+    @classmethod
+    def _parse_datetime(cls, value):
+        return datetime.datetime.strptime(value, cls.datetime_format)
+
+
+def order_history(client, orders, days=90):
+    """
+    Return unconverted ReadOrder results for orders delivered over the
+    given number of days.
+    """
+
+    method = client.service.ReadOrder.method
+    response = client._sudsobject_to_dict(method.binding.output.get_reply(
+        method, read_file('read_order_response.xml')
+    )[1])
+
+    start = datetime.datetime(2016, 1, 1)
+    generator = random.Random(0)
+
+    def random_date(days):
+        return (
+            start + datetime.timedelta(days=generator.randrange(days))
+        ).strftime(DATETIME_FORMAT)
+
+    history = []
+
+    for index in range(orders):
+        order = copy.deepcopy(response)
+
+        bezorging = order['Voorkeuren']['Bezorging']
+        bezorging['Datum'] = bezorging['VerzendDatum'] = random_date(days)
+
+        order['Consument']['GeboorteDatum'] = random_date(365 * 60)
+
+        history.append(order)
+
+    return history
+
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    client = get_client(bundled_wsdl=True)
+
+    value = u'26-04-2012 00:00:00'
+
+    before = report(
+        'strptime', lambda: datetime.datetime.strptime(value, DATETIME_FORMAT),
+        number=10000
+    )
+    report('fixed format', lambda: _parse_datetime(value), number=10000)
+    after = report('memoized', lambda: parse_datetime(value), number=10000)
+
+    print('%-30s %10.2fx' % ('speedup', before / after))
+
+    history = order_history(client, orders)
+
+    before = report(
+        'strptime (%d orders)' % orders, lambda: [
+            StrptimeClient._to_python(order, 'ReadOrder') for order in history
+        ]
+    )
+    after = report(
+        'fixed format (%d orders)' % orders, lambda: [
+            client._to_python(order, 'ReadOrder') for order in history
+        ]
+    )
+
+    print('%-30s %10.2fx' % ('speedup', before / after))
+
+
+if __name__ == '__main__':
+    main()
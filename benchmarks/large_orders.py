@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Compare the former recursive _sudsobject_to_dict with the current one on
+ReadOrder responses with many order lines.
+
+Usage: python benchmarks/large_orders.py
+"""
+
+from __future__ import print_function
+
+from common import get_client, large_read_order_response, report, unmarshal
+
+
+def recursive_to_dict(obj, wrapper=None, key=''):
+    """ Recursive implementation of _sudsobject_to_dict, for reference. """
+    if not wrapper:
+        wrapper = lambda k, v: v
+
+    if hasattr(obj, 'items'):
+        iterator = obj.items()
+    elif hasattr(obj, '__keylist__'):
+        iterator = obj
+    else:
+        return wrapper(key, obj)
+
+    out = {}
+    for key, value in iterator:
+        if isinstance(value, list):
+            out[key] = []
+            for item in value:
+                out[key].append(recursive_to_dict(item, wrapper, key))
+        else:
+            out[key] = recursive_to_dict(value, wrapper, key)
+
+    return out
+
+
+def main():
+    client = get_client(bundled_wsdl=True)
+
+    for lines in (10, 100, 1000):
+        response = unmarshal(
+            client, 'ReadOrder', large_read_order_response(lines)
+        )
+
+        assert recursive_to_dict(response) == \
+            client._sudsobject_to_dict(response)
+
+        number = max(1, 2000 / lines)
+
+        before = report(
+            'recursive (%d lines)' % lines,
+            lambda: recursive_to_dict(response), number=number
+        )
+        after = report(
+            'iterative (%d lines)' % lines,
+            lambda: client._sudsobject_to_dict(response), number=number
+        )
+
+        print('%-30s %10.2fx' % ('speedup', before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Compare eager conversion of ReadOrder responses with LazyResult mappings
+when reading only a few fields, and when reading all of them.
+
+Usage: python benchmarks/lazy.py
+"""
+
+from __future__ import print_function
+
+from common import get_client, large_read_order_response, report, unmarshal
+
+
+def read_fields(result):
+    """ Read the fields callers typically use. """
+
+    return (
+        result['Consument']['Email'],
+        result['Order']['ExtRef'],
+        result['BetaalMethode']['Prijs']
+    )
+
+
+def main():
+    client = get_client(bundled_wsdl=True)
+
+    # Build plan before timing
+    client._get_converter_plan('ReadOrder')
+
+    for lines in (0, 10, 100):
+        response = unmarshal(
+            client, 'ReadOrder', large_read_order_response(lines)
+        )
+
+        eager = client._to_python(response, 'ReadOrder')
+        lazy = client._to_lazy_python(response, 'ReadOrder')
+
+        assert lazy == eager
+        assert read_fields(lazy) == read_fields(eager)
+
+        number = max(1, 2000 / (lines or 1))
+
+        before = report(
+            'eager, 3 fields (%d lines)' % lines,
+            lambda: read_fields(client._to_python(response, 'ReadOrder')),
+            number=number
+        )
+        after = report(
+            'lazy, 3 fields (%d lines)' % lines,
+            lambda: read_fields(
+                client._to_lazy_python(response, 'ReadOrder')
+            ),
+            number=number
+        )
+
+        print('%-30s %10.2fx' % ('speedup', before / after))
+
+        report(
+            'lazy, all fields (%d lines)' % lines,
+            lambda: client._to_lazy_python(response, 'ReadOrder').to_dict(),
+            number=number
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Report memory per ReadOrder result kept in memory, as dictionaries and as
+records generated from the XSD's.
+
+Usage: python benchmarks/memory.py [orders]
+"""
+
+from __future__ import print_function
+
+import sys
+
+from common import get_client, large_read_order_response, unmarshal
+
+from postnl_checkout.records import Record
+
+
+def deep_size(objects):
+    """
+    Return bytes taken by objects and everything they refer to, counting
+    shared objects once.
+    """
+
+    seen = set()
+    stack = list(objects)
+    size = 0
+
+    while stack:
+        obj = stack.pop()
+
+        if id(obj) in seen:
+            continue
+
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, list):
+            stack.extend(obj)
+        elif isinstance(obj, Record):
+            # Keys are shared by the class
+            stack.extend(obj.values())
+
+    return size
+
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    client = get_client(bundled_wsdl=True)
+
+    for lines in (1, 10):
+        response = unmarshal(
+            client, 'ReadOrder', large_read_order_response(lines)
+        )
+
+        dicts = [
+            client._to_python(response, 'ReadOrder')
+            for index in range(orders)
+        ]
+        records = [
+            client._to_python(response, 'ReadOrder', records=True)
+            for index in range(orders)
+        ]
+
+        before = deep_size(dicts) / float(orders)
+        after = deep_size(records) / float(orders)
+
+        print('%-30s %10d bytes' % ('dictionaries (%d lines)' % lines, before))
+        print('%-30s %10d bytes' % ('records (%d lines)' % lines, after))
+        print('%-30s %10.2fx' % ('saving', before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Compare suds unmarshalling plus _to_python with the single pass response
+parser, for parse time and peak memory.
+
+Peak memory is measured as the maximum resident set size of a separate
+process per measurement, before and after parsing.
+
+Usage: python benchmarks/parser.py
+"""
+
+from __future__ import print_function
+
+import resource
+import subprocess
+import sys
+
+from common import get_client, large_read_order_response, report, unmarshal
+
+
+def suds_parse(client, reply):
+    return client._to_python(
+        unmarshal(client, 'ReadOrder', reply), 'ReadOrder'
+    )
+
+
+def fast_parse(client, reply):
+    return client._get_response_parser('ReadOrder').parse(reply)
+
+
+def peak_memory(mode, lines):
+    """ Return peak memory in kB before and after parsing in subprocess. """
+
+    output = subprocess.check_output(
+        [sys.executable, __file__, 'memory', mode, str(lines)]
+    )
+
+    return map(int, output.split())
+
+
+def measure_memory(mode, lines):
+    """ Print peak memory before and after parsing, run in subprocess. """
+
+    client = get_client(bundled_wsdl=True)
+    reply = large_read_order_response(lines)
+
+    # Warm up with a small response, building plans and parsers
+    func = {'suds': suds_parse, 'fast': fast_parse}[mode]
+    func(client, large_read_order_response(1))
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    func(client, reply)
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(before, after)
+
+
+def main():
+    # Measure memory first, as subprocesses inherit the peak of this one
+    for lines in (1000, 10000):
+        for mode in ('suds', 'fast'):
+            before, after = peak_memory(mode, lines)
+            print('%-30s %7d kB (+%d kB)' % (
+                'peak memory %s (%d lines)' % (mode, lines),
+                after, after - before
+            ))
+
+    client = get_client(bundled_wsdl=True)
+
+    for lines in (1, 10, 100, 1000):
+        reply = large_read_order_response(lines)
+
+        assert suds_parse(client, reply) == fast_parse(client, reply)
+
+        number = max(1, 1000 / lines)
+
+        before = report(
+            'suds (%d lines)' % lines,
+            lambda: suds_parse(client, reply), number=number
+        )
+        after = report(
+            'fast parser (%d lines)' % lines,
+            lambda: fast_parse(client, reply), number=number
+        )
+        print('%-30s %10.2fx' % ('speedup', before / after))
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['memory']:
+        measure_memory(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Record PrepareOrder and ReadOrder exchanges with the stand-in server and
+replay them from disk, in calls per second.
+
+Usage: python benchmarks/replay.py [number]
+"""
+
+from __future__ import print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from common import get_client
+
+from serialization import KWARGS
+
+from postnl_checkout.recording import RecordingTransport, ReplayTransport
+from postnl_checkout.standin import StandinApp, StandinServer
+
+
+OPTIONS = {
+    'bundled_wsdl': True,
+    'fast_parser': True,
+    'envelope_templates': True
+}
+
+READ_ORDER_KWARGS = {
+    'Checkout': {'OrderToken': '0cfb4be2-47cf-4eac-865c-d66657953d5c'}
+}
+
+
+def prepare_order(client):
+    kwargs = dict(KWARGS)
+    del kwargs['Webshop']
+
+    return client.prepare_order(**kwargs)
+
+
+def read_order(client):
+    return client.read_order(**READ_ORDER_KWARGS)
+
+
+def record(path):
+    """ Record one exchange per operation. """
+
+    transport = RecordingTransport(path)
+    client = get_client(transport=transport, **OPTIONS)
+
+    server = StandinServer(StandinApp(latency=0.05)).start()
+    client.suds_client.set_options(location=server.location)
+
+    prepare_order(client)
+    read_order(client)
+
+    server.stop()
+
+    transport._session.close()
+    transport.close()
+
+
+def main(number=5000):
+    directory = tempfile.mkdtemp()
+
+    try:
+        path = os.path.join(directory, 'recording')
+        record(path)
+
+        print('Recording of %d bytes' % (
+            os.path.getsize(path) + os.path.getsize(path + '.idx')
+        ))
+
+        client = get_client(transport=ReplayTransport(path), **OPTIONS)
+
+        for func in (prepare_order, read_order):
+            start = time.time()
+            for index in range(number):
+                func(client)
+            timing = time.time() - start
+
+            print('%-30s %10.0f calls/s' % (
+                'replay %s' % func.__name__, number / timing
+            ))
+
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Compare suds marshalling of PrepareOrder requests with rendering them from
+pre-compiled envelope templates, in requests per second.
+
+Usage: python benchmarks/serialization.py [number]
+"""
+
+from __future__ import print_function
+
+import datetime
+import sys
+
+from common import get_client, report
+
+
+KWARGS = {
+    'AangebodenBetaalMethoden': {
+        'PrepareOrderBetaalMethode': {'Code': 'IDEAL', 'Prijs': '5.00'}
+    },
+    'AangebodenOpties': {
+        'PrepareOrderOptie': [
+            {'Code': 'WRAP%d' % index, 'Prijs': '2.50'}
+            for index in range(10)
+        ]
+    },
+    'Consument': {'ExtRef': 'test@e-id.nl'},
+    'Order': {
+        'ExtRef': '1105_900',
+        'OrderDatum': datetime.datetime(2011, 7, 21, 20, 11),
+        'Subtotaal': '125.00',
+        'VerzendDatum': datetime.datetime(2011, 7, 22, 20, 11),
+        'VerzendKosten': '12.50'
+    },
+    'Retour': {
+        'BeschrijvingUrl': 'http://www.kadowereld.nl/url/beschrijving',
+        'PolicyUrl': 'http://www.kadowereld.nl/url/policy',
+        'RetourTermijn': 28,
+        'StartProcesUrl': 'http://www.kadowereld.nl/url/startproces'
+    },
+    'Webshop': {'IntRef': 'a0713e4083a049a996c302f48bb3f535'}
+}
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    client = get_client(bundled_wsdl=True, envelope_templates=True)
+    kwargs = client._from_python(KWARGS, 'PrepareOrder')
+
+    method = client.service.PrepareOrder.method
+
+    def suds_marshal():
+        return method.binding.input.get_message(
+            method, [], kwargs
+        ).plain().encode('utf-8')
+
+    def render():
+        return client._render_envelope('PrepareOrder', kwargs)
+
+    assert suds_marshal() == render()
+
+    for name, func in (('suds', suds_marshal), ('template', render)):
+        timing = report(name, func, number=number)
+        print('%-30s %10.0f req/s' % ('', 1 / timing))
+
+
+if __name__ == '__main__':
+    main()
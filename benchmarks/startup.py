@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""
+Compare client startup time for remote and bundled WSDL.
+
+Remote documents are served from `tests/data/wsdl` through httmock, so the
+numbers exclude network latency; a real deploy pays that on top.
+
+Usage: python benchmarks/startup.py [repetitions]
+"""
+
+import sys
+
+from httmock import HTTMock
+
+import suds.cache
+
+from common import get_client, read_file, report
+
+
+def wsdl_response(url, request):
+    """ Serve WSDL and XSD's from test data. """
+    filename = url.path.rsplit('/', 1)[1]
+
+    if not filename.endswith('.xsd'):
+        filename = 'WebshopCheckoutWebService_1.wsdl'
+
+    return read_file('wsdl/' + filename)
+
+
+def remote():
+    with HTTMock(wsdl_response):
+        get_client()
+
+
+def bundled():
+    get_client(bundled_wsdl=True, cache=suds.cache.NoCache())
+
+
+def bundled_snapshot():
+    get_client(bundled_wsdl=True)
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    # Make sure the snapshot exists
+    bundled_snapshot()
+
+    for func in (remote, bundled, bundled_snapshot):
+        report(func.__name__, func, repeat=repeat)
+
+
+if __name__ == '__main__':
+    main()
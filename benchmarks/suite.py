@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+"""
+Microbenchmarks of the conversion functions and full calls against a
+transport replying with the test fixtures, compared with stored baselines.
+
+Usage: python benchmarks/suite.py [--save] [--threshold 0.3] [filter ...]
+
+Reports time per call and the ratio to the baseline, exiting with status 1
+when any benchmark is slower than its baseline by more than the threshold.
+With --save, results are stored as the new baselines.
+
+Ratios are corrected for the speed of the machine, as measured by a
+reference workload, so baselines remain meaningful on other machines.
+Still, save baselines on the same machine before comparing changes.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+from common import get_client, get_fixture_transport, read_file, unmarshal
+
+from lazy import read_fields
+
+from serialization import KWARGS
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Minimum seconds per repetition
+MIN_TIME = 0.2
+
+READ_ORDER_KWARGS = {
+    'Checkout': {'OrderToken': '0cfb4be2-47cf-4eac-865c-d66657953d5c'}
+}
+
+
+def prepare_order_kwargs():
+    """ Return PrepareOrder arguments, less the webshop. """
+
+    kwargs = dict(KWARGS)
+    del kwargs['Webshop']
+
+    return kwargs
+
+
+def get_benchmarks():
+    """ Return list of (name, function) to benchmark. """
+
+    client = get_client(bundled_wsdl=True, transport=get_fixture_transport())
+    fast_client = get_client(
+        bundled_wsdl=True, fast_parser=True, envelope_templates=True,
+        transport=get_fixture_transport()
+    )
+
+    reply = read_file('read_order_response.xml')
+    response = unmarshal(client, 'ReadOrder', reply)
+
+    from_python_kwargs = prepare_order_kwargs()
+    prepare_kwargs = client._from_python(KWARGS, 'PrepareOrder')
+
+    return [
+        ('parse_datetime', lambda: client._parse_datetime(
+            '26-04-2012 00:00:00'
+        )),
+        ('from_python PrepareOrder', lambda: client._from_python(
+            from_python_kwargs, 'PrepareOrder'
+        )),
+        ('sudsobject_to_dict ReadOrder', lambda: client._sudsobject_to_dict(
+            response
+        )),
+        ('to_python ReadOrder', lambda: client._to_python(
+            response, 'ReadOrder'
+        )),
+        ('lazy to_python ReadOrder', lambda: read_fields(
+            client._to_lazy_python(response, 'ReadOrder')
+        )),
+        ('records to_python ReadOrder', lambda: client._to_python(
+            response, 'ReadOrder', records=True
+        )),
+        ('unmarshal ReadOrder', lambda: unmarshal(
+            client, 'ReadOrder', reply
+        )),
+        ('parse_reply ReadOrder', lambda: fast_client._parse_reply(
+            'ReadOrder', reply
+        )),
+        ('render_envelope PrepareOrder', lambda: fast_client._render_envelope(
+            'PrepareOrder', prepare_kwargs
+        )),
+        ('validate PrepareOrder', lambda: client._validate_request(
+            'PrepareOrder', prepare_kwargs
+        )),
+        ('call PrepareOrder', lambda: client.prepare_order(
+            **prepare_order_kwargs()
+        )),
+        ('call ReadOrder', lambda: client.read_order(**READ_ORDER_KWARGS)),
+        ('call PingStatus', lambda: client.ping_status()),
+        ('fast call PrepareOrder', lambda: fast_client.prepare_order(
+            **prepare_order_kwargs()
+        )),
+        ('fast call ReadOrder', lambda: fast_client.read_order(
+            **READ_ORDER_KWARGS
+        )),
+        ('fast call PingStatus', lambda: fast_client.ping_status()),
+    ]
+
+
+def reference():
+    """ Pure Python workload measuring the speed of the machine. """
+
+    result = {}
+    for index in range(1000):
+        result[str(index)] = [index] * 3
+
+    return sorted(result)
+
+
+def measure(func, repeat):
+    """ Return best seconds per call of func. """
+
+    # Calibrate number of calls per repetition
+    number = 1
+    while True:
+        timing = timeit.timeit(func, number=number)
+        if timing >= MIN_TIME:
+            break
+        number *= 2
+
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def format_time(timing):
+    if timing < 1e-3:
+        return '%8.2f us' % (timing * 1e6)
+
+    return '%8.2f ms' % (timing * 1e3)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        'filters', nargs='*', help='only run benchmarks containing these'
+    )
+    parser.add_argument(
+        '--save', action='store_true', help='store results as baselines'
+    )
+    parser.add_argument(
+        '--threshold', type=float, default=0.3,
+        help='fraction slower than baseline considered a regression'
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+
+    options = parser.parse_args(args)
+
+    baseline = {}
+    if os.path.exists(options.baseline):
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+
+    baselines = baseline.get('results', {})
+
+    if baseline and baseline.get('python') != platform.python_version():
+        print('Baselines were recorded with Python %s' % baseline['python'])
+
+    # Machine speed relative to baseline
+    speed = measure(reference, options.repeat)
+
+    if 'reference' in baseline:
+        speed /= baseline['reference']
+    else:
+        speed = 1.0
+
+    results = {}
+    regressions = []
+
+    for name, func in get_benchmarks():
+        if options.filters and not any(
+            text in name for text in options.filters
+        ):
+            continue
+
+        timing = results[name] = measure(func, options.repeat)
+
+        line = '%-32s %s' % (name, format_time(timing))
+
+        if name in baselines:
+            ratio = timing / baselines[name] / speed
+            line += '  %5.2fx baseline' % ratio
+
+            if ratio > 1 + options.threshold:
+                line += '  REGRESSION'
+                regressions.append(name)
+
+        print(line)
+
+    if options.save:
+        if options.filters:
+            # Keep baselines of benchmarks not run
+            baselines.update(results)
+            results = baselines
+
+        with open(options.baseline, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'reference': measure(reference, options.repeat),
+                'results': results
+            }, f, indent=4, sort_keys=True)
+
+        print('Saved baselines to %s' % options.baseline)
+
+    elif regressions:
+        print('%d regression(s) beyond %d%%: %s' % (
+            len(regressions), options.threshold * 100, ', '.join(regressions)
+        ))
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,590 @@
+"""
+Asyncio client for the PostNL checkout web service, requiring Python 3.5+.
+
+Only the HTTP exchange is asynchronous. Requests are rendered from envelope
+templates (or marshalled by the backend for arguments outside the schema) and
+replies are parsed by the single pass parser, reusing the conversion and
+exception handling of `PostNLCheckoutClient`, as well as its retries, circuit
+breaker and result cache.
+"""
+
+import asyncio
+import logging
+import ssl
+import time
+
+from .client import PostNLCheckoutClient
+from .compat import urlparse
+from .exceptions import PostNLRequestException, PostNLResponseException, \
+    PostNLUnavailableException
+from .timing import CallTiming
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTransport(object):
+    """ Interface for asynchronous HTTP transports. """
+
+    async def post(self, url, body, headers, timeout=None, idempotent=False):
+        """
+        POST body to url, returning (status, reply body). Only `idempotent`
+        requests may be sent again once they may have been received.
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        """ Close connections held by the transport. """
+        pass
+
+
+class _StaleConnection(Exception):
+    """
+    Raised when a reused connection turns out to be closed, before the
+    request could have been received or for idempotent requests.
+    """
+    pass
+
+
+class PooledTransport(AsyncTransport):
+    """
+    HTTP/1.1 transport on asyncio streams, keeping connections alive for
+    reuse. At most `pool_size` connections per host are open at any time;
+    further requests wait for a connection to become available.
+    """
+
+    def __init__(self, pool_size=10, ssl_context=None):
+        self.pool_size = pool_size
+        self.ssl_context = ssl_context
+
+        # Idle connections; (scheme, host, port) -> list of (reader, writer)
+        self._idle = {}
+
+        # Open connections per host; (scheme, host, port) -> semaphore
+        self._semaphores = {}
+
+    def _get_semaphore(self, key):
+        """ Return semaphore limiting connections to host. """
+
+        if key not in self._semaphores:
+            self._semaphores[key] = asyncio.Semaphore(self.pool_size)
+
+        return self._semaphores[key]
+
+    async def _connect(self, key):
+        """ Open new connection to host. """
+
+        scheme, host, port = key
+
+        if scheme == 'https':
+            context = self.ssl_context or ssl.create_default_context()
+        else:
+            context = None
+
+        return await asyncio.open_connection(host, port, ssl=context)
+
+    async def _exchange(
+        self, connection, url, body, headers, reused, idempotent
+    ):
+        """
+        Send request over connection and read the reply, returning
+        (status, reply body, whether connection can be kept alive).
+        """
+
+        reader, writer = connection
+
+        path = url.path or '/'
+        if url.query:
+            path += '?' + url.query
+
+        lines = [
+            'POST %s HTTP/1.1' % path,
+            'Host: %s' % url.netloc,
+            'Content-Length: %d' % len(body),
+        ]
+        lines.extend('%s: %s' % header for header in headers.items())
+
+        try:
+            writer.write(
+                ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+            )
+            await writer.drain()
+        except ConnectionError:
+            if reused:
+                raise _StaleConnection()
+            raise
+
+        # Once written, the server may have received and processed the
+        # request before closing the connection
+        stale = reused and idempotent
+
+        try:
+            status_line = await reader.readline()
+        except ConnectionError:
+            if stale:
+                raise _StaleConnection()
+            raise
+
+        if not status_line:
+            if stale:
+                raise _StaleConnection()
+            raise ConnectionError('Connection closed without reply.')
+
+        version, status = status_line.decode('latin-1').split(None, 2)[:2]
+
+        # Reply headers, with lowercase names
+        reply_headers = {}
+
+        while True:
+            line = (await reader.readline()).decode('latin-1').strip()
+            if not line:
+                break
+
+            name, value = line.split(':', 1)
+            reply_headers[name.strip().lower()] = value.strip()
+
+        keep_alive = (
+            version == 'HTTP/1.1' and
+            reply_headers.get('connection', '').lower() != 'close'
+        )
+
+        if reply_headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if not size:
+                    # Skip trailers
+                    while (await reader.readline()).strip():
+                        pass
+                    break
+
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+
+            reply = b''.join(chunks)
+
+        elif 'content-length' in reply_headers:
+            reply = await reader.readexactly(
+                int(reply_headers['content-length'])
+            )
+
+        else:
+            reply = await reader.read()
+            keep_alive = False
+
+        return int(status), reply, keep_alive
+
+    async def _post(self, key, url, body, headers, idempotent):
+        """ POST over an idle connection if available, else a new one. """
+
+        idle = self._idle.setdefault(key, [])
+
+        while True:
+            reused = bool(idle)
+            connection = idle.pop() if reused else await self._connect(key)
+
+            try:
+                status, reply, keep_alive = await self._exchange(
+                    connection, url, body, headers, reused, idempotent
+                )
+            except _StaleConnection:
+                connection[1].close()
+                continue
+            except BaseException:
+                connection[1].close()
+                raise
+
+            if keep_alive:
+                idle.append(connection)
+            else:
+                connection[1].close()
+
+            return status, reply
+
+    async def post(self, url, body, headers, timeout=None, idempotent=False):
+        """
+        POST body to url, returning (status, reply body). Requests failing on
+        a reused connection closed by the server are sent again over another
+        connection when idempotent, or else when they were not written.
+        """
+
+        url = urlparse(url)
+        key = (
+            url.scheme, url.hostname,
+            url.port or (443 if url.scheme == 'https' else 80)
+        )
+
+        async with self._get_semaphore(key):
+            return await asyncio.wait_for(
+                self._post(key, url, body, headers, idempotent), timeout
+            )
+
+    async def close(self):
+        """ Close idle connections. """
+
+        for connections in self._idle.values():
+            while connections:
+                connections.pop()[1].close()
+
+
+class AiohttpTransport(AsyncTransport):
+    """ Transport using an aiohttp client session; requires aiohttp. """
+
+    def __init__(self, pool_size=10, session=None):
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError('AiohttpTransport requires aiohttp.')
+
+        self.aiohttp = aiohttp
+        self.pool_size = pool_size
+        self.session = session
+
+    async def post(self, url, body, headers, timeout=None, idempotent=False):
+        """ POST body to url, returning (status, reply body). """
+
+        if self.session is None:
+            # Session should be created from within a coroutine
+            self.session = self.aiohttp.ClientSession(
+                connector=self.aiohttp.TCPConnector(limit=self.pool_size)
+            )
+
+        async with self.session.post(
+            url, data=body, headers=headers,
+            timeout=self.aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            return response.status, await response.read()
+
+    async def close(self):
+        """ Close client session. """
+
+        if self.session is not None:
+            await self.session.close()
+
+
+class AsyncPostNLCheckoutClient(PostNLCheckoutClient):
+    """
+    Asyncio client exposing the PostNL checkout client, with awaitable API
+    methods.
+
+    The bundled WSDL is always used, so no documents are fetched when
+    instantiating. Requests are sent through `transport`, by default a
+    PooledTransport.
+
+    Coalescing through a SingleFlight and `map()` rely on threads and are
+    not supported; gather the coroutines instead.
+    """
+
+    def __init__(
+        self, username, password, webshop_id, environment,
+        timeout=PostNLCheckoutClient.default_timeout, cache=None,
+        transport=None, operation_timeouts=None, retries=0,
+        retry_backoff=0.1, circuit_breaker=None, result_cache=None
+    ):
+        """
+        Initialize, setting required attributes and instantiate web service.
+
+        Timeouts are as for `PostNLCheckoutClient`, except that (connect,
+        read) tuples bound the total time of a request by their sum.
+        Retries, the circuit breaker and the result cache are as for
+        `PostNLCheckoutClient`, waiting for retries without blocking the
+        event loop.
+        """
+
+        PostNLCheckoutClient.__init__(
+            self, username, password, webshop_id, environment,
+            timeout=timeout, cache=cache, bundled_wsdl=True,
+            fast_parser=True, envelope_templates=True,
+            operation_timeouts=operation_timeouts, retries=retries,
+            retry_backoff=retry_backoff, circuit_breaker=circuit_breaker,
+            result_cache=result_cache
+        )
+
+        self.transport = transport or PooledTransport()
+
+    def map(self, operation, iterable, max_workers=4, ordered=False):
+        """ Not supported; gather the coroutines of the calls instead. """
+
+        raise NotImplementedError(
+            'map() calls from threads; use asyncio.gather() instead.'
+        )
+
+    async def close(self):
+        """ Close connections of the transport. """
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _get_timeout(self, method_name):
+        """ Return total timeout in seconds for operation, or None. """
+
+        timeout = self.backend.transport.get_timeout(method_name)
+
+        if isinstance(timeout, tuple):
+            return sum(timeout)
+
+        return timeout
+
+    def _is_transient_error(self, exception):
+        """ Return whether exception is due to a timeout or as for sync. """
+
+        if isinstance(exception, asyncio.TimeoutError):
+            return True
+
+        return PostNLCheckoutClient._is_transient_error(self, exception)
+
+    async def _api_call(self, method_name, **kwargs):
+        """ Wrapper for API calls. """
+
+        if self.single_flight is not None:
+            raise TypeError(
+                'Coalescing calls through a SingleFlight is not supported '
+                'by the asyncio client.'
+            )
+
+        if not self.timing_hooks:
+            return await self._timed_api_call(method_name, kwargs, None)
+
+        timing = CallTiming(method_name)
+
+        try:
+            result = await self._timed_api_call(method_name, kwargs, timing)
+
+        except PostNLRequestException as e:
+            self._report_timing(timing, CallTiming.FAULT, e)
+            raise
+
+        except Exception as e:
+            self._report_timing(timing, CallTiming.ERROR, e)
+            raise
+
+        self._report_timing(timing, CallTiming.SUCCESS)
+
+        return result
+
+    async def _timed_api_call(self, method_name, kwargs, timing):
+        """
+        Perform API call with retries, recording phases in timing unless
+        it is None.
+        """
+
+        # Convert arguments from Pythonic formats
+        kwargs = self._from_python(kwargs, method_name)
+
+        if timing:
+            timing.mark('convert')
+
+        envelope = self._render_envelope(method_name, kwargs)
+
+        if envelope is None:
+            envelope = self.backend.marshal(method_name, kwargs)
+
+        request = self.backend.get_request(method_name, envelope)
+
+        if timing:
+            timing.mark('serialize')
+            timing.request_size = len(request.message)
+
+        if method_name in self.retry_operations:
+            retries = self.retries
+        else:
+            retries = 0
+
+        breaker = self.circuit_breaker
+        retry = 0
+
+        while True:
+            if breaker and not breaker.allow():
+                raise PostNLUnavailableException(
+                    'PostNL service unavailable, not calling %s.' %
+                    method_name
+                )
+
+            try:
+                result = await self._perform_call(
+                    method_name, request, timing
+                )
+
+            except Exception as e:
+                if not self._is_transient_error(e):
+                    # Service replied
+                    if breaker:
+                        breaker.record_success()
+                    raise
+
+                if breaker:
+                    breaker.record_failure()
+
+                if retry >= retries:
+                    raise
+
+                delay = self._get_retry_delay(retry)
+                retry += 1
+
+                logger.warning(
+                    'Retrying %s in %.2f seconds (%d/%d) after error: %s',
+                    method_name, delay, retry, retries, e
+                )
+
+                await asyncio.sleep(delay)
+
+                if timing:
+                    timing.mark('backoff')
+
+            else:
+                if breaker:
+                    breaker.record_success()
+
+                return result
+
+    async def _perform_call(self, method_name, request, timing=None):
+        """ Perform API call once, posting the request. """
+
+        if timing:
+            timing.attempts += 1
+
+        # Perform API call
+        status, reply = await self.transport.post(
+            request.url, request.message, request.headers,
+            self._get_timeout(method_name),
+            idempotent=method_name in self.retry_operations
+        )
+
+        if timing:
+            timing.mark('network')
+            timing.response_size = len(reply)
+
+        try:
+            if status != 200:
+                reply = self.backend.handle_error_reply(
+                    method_name, status, reply
+                )
+
+                if reply is None:
+                    return None
+
+            return self._parse_reply(method_name, reply)
+
+        except self.backend.fault_classes as e:
+            # Catch CIF Exception details and re-raise
+            raise self.backend.get_request_exception(e)
+
+        finally:
+            if timing:
+                timing.mark('parse')
+
+    async def prepare_order(self, **kwargs):
+        """ Wrapper around PrepareOrder API call. """
+
+        # Add webshop before executing request
+        self._add_webshop(kwargs)
+
+        self._validate_request('PrepareOrder', kwargs)
+
+        # Execute API call
+        return await self._api_call('PrepareOrder', **kwargs)
+
+    async def read_order(self, **kwargs):
+        """ Wrapper around ReadOrder API call. """
+
+        # Add webshop before executing request
+        self._add_webshop(kwargs)
+
+        self._validate_request('ReadOrder', kwargs)
+
+        cache = self.result_cache
+        token = self._get_argument(kwargs, 'Checkout', 'OrderToken')
+
+        if cache is None or token is None:
+            # Execute API call; without order token, as unvalidated
+            # arguments may lack it, PostNL replies with a fault
+            return await self._api_call('ReadOrder', **kwargs)
+
+        key = self._get_result_cache_key(token)
+
+        result = cache.get(key)
+        if result is None:
+            # Results read while the order is confirmed or updated are
+            # discarded
+            since = time.time()
+
+            result = await self._api_call('ReadOrder', **kwargs)
+
+            # UpdateOrder refers to orders by ExtRef
+            order = result.get('Order')
+            ext_ref = order and order.get('ExtRef')
+
+            cache.set(key, result, aliases=(
+                (self._get_result_cache_key(ext_ref), ) if ext_ref else ()
+            ), since=since)
+
+        return result
+
+    async def confirm_order(self, **kwargs):
+        """ Wrapper around ConfirmOrder API call. """
+
+        # Add webshop before executing request
+        self._add_webshop(kwargs)
+
+        self._validate_request('ConfirmOrder', kwargs)
+
+        try:
+            # Execute API call
+            result = await self._api_call('ConfirmOrder', **kwargs)
+        finally:
+            token = self._get_argument(kwargs, 'Checkout', 'OrderToken')
+
+            if self.result_cache is not None and token is not None:
+                self.result_cache.invalidate(
+                    self._get_result_cache_key(token)
+                )
+
+        # Make sure the response is sensible
+        if not 'Order' in result and 'ExtRef' in result['Order']:
+            raise PostNLResponseException('No order reference in result.')
+
+        # Return the result
+        return result
+
+    async def update_order(self, **kwargs):
+        """ Wrapper around UpdateOrder API call. """
+
+        # Add webshop before executing request
+        self._add_webshop(kwargs)
+
+        self._validate_request('UpdateOrder', kwargs)
+
+        try:
+            # Execute API call
+            result = await self._api_call('UpdateOrder', **kwargs)
+        finally:
+            if self.result_cache is not None:
+                ext_ref = self._get_argument(kwargs, 'Order', 'ExtRef')
+
+                if ext_ref:
+                    self.result_cache.invalidate(
+                        alias=self._get_result_cache_key(ext_ref)
+                    )
+
+        # Return the result
+        assert result in ('true', 'false')
+
+        return result == 'true'
+
+    async def ping_status(self, **kwargs):
+        """
+        Wrapper around PingStatus API call.
+
+        Returns True if service OK, False for not OK.
+        """
+
+        # Execute API call
+        result = await self._api_call('PingStatus')
+
+        assert result in ('OK', 'NOK')
+
+        return result == 'OK'
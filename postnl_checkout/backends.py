@@ -0,0 +1,330 @@
+"""
+SOAP libraries used by the client to load the WSDL, marshal requests,
+unmarshal replies and raise faults.
+
+`SudsBackend` is the default. `ZeepBackend`, in `postnl_checkout.zeep_backend`,
+uses zeep and lxml, which load the WSDL and unmarshal replies considerably
+faster. Backends are chosen by name, as in `BACKENDS`.
+
+Both send requests through the same suds-style transports (see
+`postnl_checkout.transport` and `postnl_checkout.recording`), so timeouts,
+connection pooling, recording and replay apply to either.
+"""
+
+import copy
+
+from importlib import import_module
+
+import suds
+import suds.client
+import suds.options
+import suds.plugin
+import suds.transport
+import suds.wsse
+
+from suds.properties import Unskin
+
+from .exceptions import PostNLRequestException
+
+
+# Backend classes by name
+BACKENDS = {
+    'suds': 'postnl_checkout.backends.SudsBackend',
+    'zeep': 'postnl_checkout.zeep_backend.ZeepBackend',
+}
+
+
+def get_backend_class(name):
+    """ Return backend class by name, importing its module. """
+
+    try:
+        path = BACKENDS[name]
+    except KeyError:
+        raise ValueError('Unknown SOAP backend: %s' % name)
+
+    module_name, class_name = path.rsplit('.', 1)
+
+    return getattr(import_module(module_name), class_name)
+
+
+class SOAPBackend(object):
+    """
+    Interface of SOAP backends, each instance of which is used by a single
+    client.
+
+    Results are returned as the backend's objects, which the client's
+    converters read as dictionaries (see `PostNLCheckoutClient._get_items`),
+    or as plain values.
+    """
+
+    # Name, as in BACKENDS
+    name = None
+
+    # Exceptions raised for SOAP faults
+    fault_classes = ()
+
+    def __init__(
+        self, wsdl_url, location, transport, username, password_digest,
+        cache=None, raw_replies=False
+    ):
+        """
+        Load the WSDL at `wsdl_url` through `transport`, optionally
+        overriding the service location. When `raw_replies` is set, `call()`
+        returns raw replies rather than unmarshalled results.
+        """
+        self.transport = transport
+
+    def clone(self, username=None, password_digest=None):
+        """
+        Return copy for use by another thread, sharing the loaded WSDL and
+        the connection pool of the transport, authenticating with other
+        credentials when given.
+        """
+        raise NotImplementedError
+
+    def get_location(self, operation):
+        """ Return URL to post requests for operation to. """
+        raise NotImplementedError
+
+    def get_action(self, operation):
+        """ Return (quoted) SOAPAction header for operation. """
+        raise NotImplementedError
+
+    def call(self, operation, kwargs):
+        """ Call operation with arguments, returning the result. """
+        raise NotImplementedError
+
+    def marshal(self, operation, kwargs):
+        """ Return UTF-8 encoded request envelope for arguments. """
+        raise NotImplementedError
+
+    def unmarshal(self, operation, reply):
+        """
+        Return result from raw reply, raising one of `fault_classes` for
+        faults.
+        """
+        raise NotImplementedError
+
+    def raise_fault(self, operation, reply, status=500):
+        """ Raise the fault in a raw reply, if any. """
+        raise NotImplementedError
+
+    def get_fault_message(self, fault):
+        """ Return PostNL's error message from a fault. """
+        raise NotImplementedError
+
+    def get_error_status(self, exception):
+        """
+        Return HTTP status for errors from the transport, 0 for errors
+        without reply, or None for other exceptions.
+        """
+
+        if isinstance(exception, suds.transport.TransportError):
+            return exception.httpcode
+
+        # Raised like suds does for error replies without fault
+        if (
+            type(exception) is Exception and len(exception.args) == 1 and
+            isinstance(exception.args[0], tuple)
+        ):
+            return exception.args[0][0]
+
+        return None
+
+    def get_request_exception(self, fault):
+        """ Return PostNLRequestException for a fault. """
+
+        return PostNLRequestException(self.get_fault_message(fault))
+
+    def get_request(self, operation, envelope):
+        """ Return transport Request posting envelope to the service. """
+
+        request = suds.transport.Request(
+            self.get_location(operation), envelope
+        )
+        request.headers = {
+            'Content-Type': 'text/xml; charset=utf-8',
+            'SOAPAction': self.get_action(operation)
+        }
+
+        return request
+
+    def handle_error_reply(self, operation, status, reply, reason=''):
+        """
+        Handle reply with an error status the way suds does; returning None
+        for accepted requests without content, raising a fault for faults
+        and an Exception otherwise.
+        """
+
+        if status in (202, 204):
+            return None
+
+        if status == 500 and reply:
+            self.raise_fault(operation, reply, status)
+
+        raise Exception((status, reason))
+
+    def send(self, operation, envelope):
+        """
+        Send rendered envelope through the transport, returning the raw
+        reply. Faults are raised as by `handle_error_reply()`.
+        """
+
+        request = self.get_request(operation, envelope)
+
+        try:
+            return self.transport.send(request).message
+
+        except suds.transport.TransportError as e:
+            return self.handle_error_reply(
+                operation, e.httpcode, e.fp and e.fp.read(), str(e)
+            )
+
+
+class _CredentialsPlugin(suds.plugin.MessagePlugin):
+    """
+    Replace the credentials in the WS-Security header, which suds renders
+    from the options the (shared) WSDL was last opened with.
+    """
+
+    def __init__(self, username, password_digest):
+        self.username = username
+        self.password_digest = password_digest
+
+    def apply(self, envelope):
+        """ Set credentials in the header of envelope. """
+
+        token = envelope.childAtPath('Header/Security/UsernameToken')
+
+        token.getChild('Username').setText(self.username)
+        token.getChild('Password').setText(self.password_digest)
+
+    def marshalled(self, context):
+        self.apply(context.envelope)
+
+
+class SudsBackend(SOAPBackend):
+    """ Backend using suds. """
+
+    name = 'suds'
+
+    fault_classes = (suds.WebFault, )
+
+    def __init__(
+        self, wsdl_url, location, transport, username, password_digest,
+        cache=None, raw_replies=False
+    ):
+        super(SudsBackend, self).__init__(
+            wsdl_url, location, transport, username, password_digest
+        )
+
+        # Clients may share the WSDL loaded by another through the cache,
+        # which would render its credentials instead
+        self.suds_client = suds.client.Client(
+            wsdl_url,
+            transport=transport,
+            cachingpolicy=1, cache=cache,
+            wsse=self._get_security(username, password_digest),
+            plugins=[_CredentialsPlugin(username, password_digest)]
+        )
+
+        if location:
+            self.suds_client.set_options(location=location)
+
+        if raw_replies:
+            self.suds_client.set_options(retxml=True)
+
+        self.service = self.suds_client.service
+
+    @classmethod
+    def _get_security(cls, username, password_digest):
+        """ Return WS-Security authenticating with the credentials. """
+
+        security = suds.wsse.Security()
+        token = suds.wsse.UsernameToken(username, password_digest)
+        security.tokens.append(token)
+
+        return security
+
+    def clone(self, username=None, password_digest=None):
+        """
+        Like suds' `Client.clone()`, which is not used as suds-community
+        fails to deep copy options linked to those of the transport.
+        """
+
+        options = Unskin(self.suds_client.options)
+
+        values = dict(
+            (name, options.get(name)) for name in options.modified
+        )
+        values['transport'] = copy.deepcopy(values['transport'])
+
+        if username is not None:
+            values['wsse'] = self._get_security(username, password_digest)
+            values['plugins'] = [
+                plugin for plugin in values.get('plugins', ())
+                if not isinstance(plugin, _CredentialsPlugin)
+            ] + [_CredentialsPlugin(username, password_digest)]
+
+        suds_client = copy.copy(self.suds_client)
+        suds_client.options = suds.options.Options(**values)
+        suds_client.service = suds.client.ServiceSelector(
+            suds_client, suds_client.wsdl.services
+        )
+        suds_client.messages = dict(tx=None, rx=None)
+
+        clone = copy.copy(self)
+        clone.suds_client = suds_client
+        clone.service = suds_client.service
+        clone.transport = suds_client.options.transport
+
+        return clone
+
+    def _get_method(self, operation):
+        return getattr(self.service, operation).method
+
+    def get_location(self, operation):
+        return (
+            self.suds_client.options.location or
+            self._get_method(operation).location
+        )
+
+    def get_action(self, operation):
+        return self._get_method(operation).soap.action
+
+    def get_request(self, operation, envelope):
+        request = super(SudsBackend, self).get_request(operation, envelope)
+        request.headers.update(self.suds_client.options.headers)
+
+        return request
+
+    def call(self, operation, kwargs):
+        return getattr(self.service, operation)(**kwargs)
+
+    def marshal(self, operation, kwargs):
+        method = self._get_method(operation)
+
+        envelope = method.binding.input.get_message(method, [], kwargs)
+
+        for plugin in self.suds_client.options.plugins:
+            if isinstance(plugin, _CredentialsPlugin):
+                plugin.apply(envelope.root())
+
+        return envelope.plain().encode('utf-8')
+
+    def unmarshal(self, operation, reply):
+        if not reply:
+            return None
+
+        method = self._get_method(operation)
+
+        return method.binding.input.get_reply(method, reply)[1]
+
+    def raise_fault(self, operation, reply, status=500):
+        # Have suds raise WebFault for the fault in the reply
+        getattr(self.service, operation)(
+            __inject={'reply': reply, 'status': status}
+        )
+
+    def get_fault_message(self, fault):
+        return fault.fault.detail.CifException.Errors.ExceptionData.ErrorMsg
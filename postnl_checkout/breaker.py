@@ -0,0 +1,87 @@
+"""
+Circuit breaker failing calls fast while the web service is unavailable.
+
+After `failure_threshold` consecutive failures the circuit opens and calls
+are refused. Once `reset_timeout` seconds have passed, the circuit is
+half-open and a single trial call is let through; its success closes the
+circuit, its failure opens it again for another `reset_timeout`.
+"""
+
+import threading
+import time
+
+
+class CircuitBreaker(object):
+    """ Thread-safe circuit breaker, shared by clones of a client. """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+
+        self._failures = 0
+
+        # Time circuit was opened, or last trial call let through
+        self._opened_at = None
+
+    @property
+    def state(self):
+        """ Current state; CLOSED, OPEN or HALF_OPEN. """
+
+        opened_at = self._opened_at
+
+        if opened_at is None:
+            return self.CLOSED
+
+        if time.time() - opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+
+        return self.OPEN
+
+    def allow(self):
+        """
+        Return whether a call may be made. In the half-open state, only the
+        first caller gets to make a trial call.
+        """
+
+        with self._lock:
+            if self._opened_at is None:
+                return True
+
+            now = time.time()
+
+            if now - self._opened_at >= self.reset_timeout:
+                # Restart timer, allowing another trial should this one
+                # never report back
+                self._opened_at = now
+                return True
+
+            return False
+
+    def record_success(self):
+        """ Close the circuit. """
+
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        """ Count failure, opening the circuit beyond the threshold. """
+
+        with self._lock:
+            self._failures += 1
+
+            if (
+                self._opened_at is not None or
+                self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.time()
+
+    def reset(self):
+        """ Close the circuit, forgetting failures. """
+        self.record_success()
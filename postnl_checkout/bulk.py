@@ -0,0 +1,128 @@
+"""
+Bounded-concurrency execution of many API calls.
+
+Calls are run by a fixed number of worker threads, each with its own clone
+of the client, sharing the parsed WSDL and connection pool. The input is
+consumed lazily, keeping at most two items per worker queued, and results
+are yielded as they become available. Failing calls do not abort the batch;
+their exception is yielded instead of a result.
+"""
+
+import collections
+import threading
+
+from .compat import queue
+
+
+# Outcome of a single call; `index` is the position of `kwargs` in the input
+# and either `result` or `exception` is set
+BulkResult = collections.namedtuple(
+    'BulkResult', ('index', 'kwargs', 'result', 'exception')
+)
+
+
+def _work(client, operation, tasks, results):
+    """ Worker thread; perform calls from tasks until None is received. """
+
+    method = getattr(client, operation)
+
+    while True:
+        task = tasks.get()
+
+        if task is None:
+            return
+
+        index, kwargs = task
+
+        try:
+            result = BulkResult(index, kwargs, method(**kwargs), None)
+        except Exception as e:
+            result = BulkResult(index, kwargs, None, e)
+
+        results.put(result)
+
+
+def bulk_map(client, operation, iterable, max_workers=4, ordered=False):
+    """
+    Call `operation` (the name of an API method of `client`, e.g.
+    'read_order') with keyword arguments from each dictionary in `iterable`,
+    running at most `max_workers` calls at once.
+
+    Returns generator of a BulkResult per item, in order of completion or,
+    when `ordered`, in order of input. Closing the generator before it is
+    exhausted discards queued calls and stops the workers.
+    """
+
+    if max_workers < 1:
+        raise ValueError('max_workers should be at least 1.')
+
+    if not callable(getattr(client, operation, None)):
+        raise ValueError('Unknown operation %r.' % operation)
+
+    return _generate(client, operation, iterable, max_workers, ordered)
+
+
+def _generate(client, operation, iterable, max_workers, ordered):
+    """ Generator running the calls for bulk_map. """
+
+    tasks = queue.Queue()
+    results = queue.Queue()
+
+    workers = []
+
+    try:
+        for index in range(max_workers):
+            worker = threading.Thread(
+                target=_work,
+                args=(client.clone(), operation, tasks, results)
+            )
+            worker.daemon = True
+            worker.start()
+
+            workers.append(worker)
+
+        items = enumerate(iterable)
+        exhausted = False
+        pending = 0
+
+        # Results received ahead of their turn when ordered; index -> result
+        buffered = {}
+        next_index = 0
+
+        while True:
+            # Queue up to two items per worker, counting buffered results
+            while (
+                not exhausted and pending + len(buffered) < 2 * max_workers
+            ):
+                try:
+                    tasks.put(next(items))
+                    pending += 1
+                except StopIteration:
+                    exhausted = True
+
+            if not pending:
+                break
+
+            result = results.get()
+            pending -= 1
+
+            if not ordered:
+                yield result
+                continue
+
+            buffered[result.index] = result
+
+            while next_index in buffered:
+                yield buffered.pop(next_index)
+                next_index += 1
+
+    finally:
+        # Discard calls which have not been started
+        while True:
+            try:
+                tasks.get_nowait()
+            except queue.Empty:
+                break
+
+        for worker in workers:
+            tasks.put(None)
@@ -0,0 +1,210 @@
+"""
+Read-through cache of results, i.e. of ReadOrder by order token, shared by
+clones of a client.
+
+Entries expire after `ttl` seconds. Besides its key, an entry can be
+invalidated through aliases, such as the order's ExtRef with which
+UpdateOrder refers to it. Invalidations leave a tombstone for `ttl`
+seconds, so values read from the service before an invalidation are not
+stored after it. Storage is implemented by subclasses of
+`BaseResultCache`; `ResultCache` keeps entries in the process.
+"""
+
+import copy
+import threading
+import time
+
+
+class BaseResultCache(object):
+    """
+    Result cache counting hits, misses and invalidations, storing entries
+    through `_load()`, `_store()` and `_remove()`.
+    """
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+
+        self._stats_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _count(self, name):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _load(self, key):
+        """ Return value stored for key, or None. """
+        raise NotImplementedError
+
+    def _store(self, key, value):
+        """ Store value for key, expiring after ttl. """
+        raise NotImplementedError
+
+    def _remove(self, key):
+        """ Remove value stored for key, if any. """
+        raise NotImplementedError
+
+    @classmethod
+    def _get_alias_key(cls, alias):
+        return 'alias:%s' % alias
+
+    @classmethod
+    def _get_tombstone_key(cls, key):
+        return 'invalidated:%s' % key
+
+    def _invalidated_since(self, since, keys):
+        """ Return whether any of keys was invalidated at or after since. """
+
+        for key in keys:
+            invalidated = self._load(self._get_tombstone_key(key))
+
+            if invalidated is not None and invalidated >= since:
+                return True
+
+        return False
+
+    def get(self, key):
+        """ Return cached value for key, or None. """
+
+        value = self._load(key)
+
+        if value is None:
+            self._count('misses')
+        else:
+            self._count('hits')
+
+        return value
+
+    def set(self, key, value, aliases=(), since=None):
+        """
+        Cache value for key, which may be invalidated by aliases.
+
+        With `since`, the time reading the value started, the value is
+        discarded when key or an alias was invalidated meanwhile.
+        """
+
+        self._store(key, value)
+
+        alias_keys = [self._get_alias_key(alias) for alias in aliases]
+
+        for alias_key in alias_keys:
+            self._store(alias_key, key)
+
+        if since is None:
+            return
+
+        # Checked after storing, so invalidations while storing are seen
+        if self._invalidated_since(since, [key] + alias_keys):
+            self._remove(key)
+
+    def invalidate(self, key=None, alias=None):
+        """ Remove value cached for key, or for the key of an alias. """
+
+        now = time.time()
+
+        if alias is not None:
+            alias_key = self._get_alias_key(alias)
+
+            # For values read before their aliases are known
+            self._store(self._get_tombstone_key(alias_key), now)
+
+            key = self._load(alias_key)
+            self._remove(alias_key)
+
+        if key is not None:
+            self._store(self._get_tombstone_key(key), now)
+            self._remove(key)
+
+        self._count('invalidations')
+
+    def stats(self):
+        """ Return dictionary of hits, misses, invalidations and hit ratio. """
+
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_ratio': float(self.hits) / lookups if lookups else None
+            }
+
+    def reset_stats(self):
+        """ Reset counts to zero. """
+
+        with self._stats_lock:
+            self.hits = self.misses = self.invalidations = 0
+
+
+class ResultCache(BaseResultCache):
+    """
+    Thread-safe in-process result cache of at most `max_size` entries.
+
+    Values are copied when stored and when returned, so callers cannot
+    change cached results.
+    """
+
+    def __init__(self, ttl=60, max_size=1000):
+        super(ResultCache, self).__init__(ttl)
+
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+
+        # key -> (expiry time, value)
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            expires, value = entry
+
+            if expires <= time.time():
+                del self._entries[key]
+                return None
+
+        return copy.deepcopy(value)
+
+    def _store(self, key, value):
+        value = copy.deepcopy(value)
+
+        with self._lock:
+            entries = self._entries
+
+            if len(entries) >= self.max_size and key not in entries:
+                self._evict()
+
+            entries[key] = (time.time() + self.ttl, value)
+
+    def _remove(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _evict(self):
+        """ Remove expired entries, or else the one expiring first. """
+
+        now = time.time()
+        entries = self._entries
+
+        for key, (expires, value) in list(entries.items()):
+            if expires <= now:
+                del entries[key]
+
+        if len(entries) >= self.max_size:
+            del entries[min(entries, key=lambda key: entries[key][0])]
+
+    def clear(self):
+        """ Remove all entries. """
+
+        with self._lock:
+            self._entries.clear()
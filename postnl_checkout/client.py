@@ -1,18 +1,39 @@
 import logging
 logger = logging.getLogger(__name__)
 
+import os
+import copy
 import hashlib
 import datetime
 import decimal
+import random
+import sys
+import time
+
+from .bulk import bulk_map
+from .compat import pathname2url, string_types, text_type
+from .dates import DATETIME_FORMAT, format_datetime, parse_datetime
+from .envelope import EnvelopeTemplate, UnsupportedValue, \
+    render_security_header
+from .exceptions import PostNLRequestException, PostNLResponseException, \
+    PostNLUnavailableException
+from .lazy import LazyResult
+from .parser import FaultResponse, ResponseParser
+from .records import convert_to_records, get_record_class
+from .schema import get_schema
+from .singleflight import make_key
+from .timing import CallTiming
+from .validation import RequestValidator
+from .utils import contains_any
 
-import requests
 
-import suds
+# Kinds of nodes in objects to convert
+NODE_VALUE, NODE_DICT, NODE_SUDS, NODE_ZEEP = range(4)
 
-import suds_requests
 
-from .exceptions import PostNLRequestException, PostNLResponseException
-from .utils import contains_any
+def _no_op(key, value):
+    """ Default wrapper for _sudsobject_to_dict, returning value as is. """
+    return value
 
 
 class PostNLCheckoutClient(object):
@@ -21,6 +42,9 @@ class PostNLCheckoutClient(object):
 
     This part should not depend on Django in any way and might be separated
     from the rest of the module later.
+
+    The SOAP and HTTP libraries (suds, requests) are imported when first
+    used, so importing this module, i.e. from Django models, stays cheap.
     """
 
     SANDBOX_ENDPOINT_URL = (
@@ -33,181 +57,868 @@ class PostNLCheckoutClient(object):
         'WebshopCheckoutWebService/2_2/WebshopCheckoutService.svc?wsdl'
     )
 
+    # Version of the WSDL/XSD bundle shipped with this package
+    WSDL_VERSION = '2_2'
+
+    BUNDLED_WSDL_PATH = os.path.join(
+        os.path.dirname(__file__), 'wsdl', WSDL_VERSION,
+        'WebshopCheckoutWebService_1.wsdl'
+    )
+
+    # Operations of the web service
+    operations = (
+        'PrepareOrder', 'ReadOrder', 'ConfirmOrder', 'UpdateOrder',
+        'PingStatus'
+    )
+
     # PostNL date/time format
-    datetime_format = '%d-%m-%Y %H:%M:%S'
+    datetime_format = DATETIME_FORMAT
 
     # Monetary fields to convert
     monetary_fields = (
         'Prijs', 'Kosten', 'Subtotaal', 'VerzendKosten', 'PaymentTotal'
     )
 
+    # Default (connect, read) timeout in seconds for fetching the WSDL and
+    # operations without an operation timeout; as transport.DEFAULT_TIMEOUT,
+    # which is not imported until used
+    default_timeout = (3.05, 30)
+
+    # Default (connect, read) timeouts in seconds by operation, taking
+    # precedence over the general timeout; pings should fail fast, whereas
+    # ReadOrder replies with the full order and may take longer
+    operation_timeouts = {
+        'PrepareOrder': (3.05, 10),
+        'ReadOrder': (3.05, 30),
+        'ConfirmOrder': (3.05, 10),
+        'UpdateOrder': (3.05, 10),
+        'PingStatus': (3.05, 5),
+    }
+
+    # Idempotent operations, retried on transient errors and coalesced
+    retry_operations = ('ReadOrder', 'PingStatus')
+
+    # Maximum seconds to wait between retries
+    retry_max_backoff = 2.0
+
+    # Cache of converter plans; (class, operation, output) -> plan
+    _converter_plans = {}
+
+    # Cache of node kinds by class of converted objects
+    _node_kinds = {}
+
+    # Cache of response parsers; (class, operation) -> parser
+    _response_parsers = {}
+
+    # Cache of compiled request envelopes; operation -> template
+    _envelope_templates = {}
+
+    # Elements required by operations besides those the XSD's require
+    required_elements = {
+        'PrepareOrder': ('Webshop', 'Order'),
+        'ReadOrder': ('Webshop', 'Checkout.OrderToken'),
+        'ConfirmOrder': ('Webshop', 'Checkout.OrderToken', 'Order'),
+        'UpdateOrder': ('Webshop', 'Order.ExtRef'),
+    }
+
+    # Cache of compiled request validators; (class, operation) -> validator
+    _request_validators = {}
+
+    # Cache of digests of the bundled WSDL and XSD's; path -> hex digest
+    _bundle_digests = {}
+
     def __init__(
         self, username, password, webshop_id, environment,
-        timeout=None, cache=None
+        timeout=default_timeout, cache=None, bundled_wsdl=False,
+        fast_parser=False,
+        envelope_templates=False, pool_size=10, pool_block=False,
+        operation_timeouts=None, retries=0, retry_backoff=0.1,
+        circuit_breaker=None, transport=None, lazy_results=False,
+        record_results=False, result_cache=None, single_flight=None,
+        validate_requests=True, backend='suds'
     ):
         """
         Initialize, setting required attributes and instantiate web service.
+
+        Timeouts are either seconds or (connect, read) tuples, or None to
+        wait indefinitely. `timeout` applies to fetching the WSDL and to
+        operations without an entry in `operation_timeouts`, which updates
+        the class defaults.
+
+        Up to `pool_size` connections are kept alive for reuse; with
+        `pool_block` set, requests wait for a connection instead of opening
+        connections beyond the pool size.
+
+        When `bundled_wsdl` is set, the WSDL and XSD's shipped with this
+        package are used instead of fetching them from PostNL.
+
+        When `fast_parser` is set, replies are parsed directly into Pythonic
+        format instead of being unmarshalled by the backend. Note that in
+        this case the backend returns raw XML replies.
+
+        When `envelope_templates` is set, requests are rendered from
+        envelopes pre-compiled from the bundled XSD's rather than marshalled
+        by the backend, falling back to the backend for arguments outside
+        the schema.
+
+        Operations in `retry_operations` are attempted up to `retries` more
+        times on connection errors, timeouts and server errors, waiting a
+        random time up to `retry_backoff` seconds, doubling for each retry.
+        With a CircuitBreaker as `circuit_breaker`, calls raise
+        PostNLUnavailableException without being attempted while the
+        service is considered down.
+
+        A `transport`, i.e. a RecordingTransport or ReplayTransport, is used
+        instead of a PostNLTransport built from the timeout and pool
+        arguments.
+
+        With `lazy_results` set, results are returned as read-only
+        LazyResult mappings, converting values when first accessed, rather
+        than as fully converted dictionaries. As the fast parser converts
+        while parsing, this has no effect together with `fast_parser`.
+
+        With `record_results` set, results are returned as compact records
+        generated from the XSD's (see `postnl_checkout.records`), for
+        keeping many results in memory. Neither does this affect the fast
+        parser.
+
+        With a ResultCache (or another BaseResultCache) as `result_cache`,
+        ReadOrder results are cached by order token until they expire or
+        ConfirmOrder or UpdateOrder is called for the order.
+
+        With a SingleFlight as `single_flight`, concurrent identical calls
+        of operations in `retry_operations` share a single request.
+
+        Unless `validate_requests` is unset, arguments are validated against
+        the bundled XSD's and `required_elements` before calling, raising
+        PostNLRequestException for invalid arguments.
+
+        `backend` names the SOAP library loading the WSDL, marshalling
+        requests and unmarshalling replies; 'suds' or 'zeep' (see
+        `postnl_checkout.backends`).
         """
+        if lazy_results and record_results:
+            raise ValueError(
+                'lazy_results and record_results are mutually exclusive.'
+            )
+
         self.webshop_id = webshop_id
+        self.fast_parser = fast_parser
+        self.lazy_results = lazy_results
+        self.record_results = record_results
+
+        # Shared by clones
+        self.result_cache = result_cache
+        self.single_flight = single_flight
 
-        # Setup Requests session
-        session = self._get_session(timeout)
+        self.validate_requests = validate_requests
 
-        # Instantiate web service.
-        self.suds_client = self._get_client(
-            environment, session, username, password, cache
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+
+        # Shared by clones
+        self.circuit_breaker = circuit_breaker
+
+        # Callables receiving a CallTiming for each call, shared by clones
+        self.timing_hooks = []
+
+        if envelope_templates:
+            # Security header is the same for every request
+            self.security_header = render_security_header(
+                username, self._get_password_digest(password)
+            )
+        else:
+            self.security_header = None
+
+        if transport is None:
+            from .transport import PostNLTransport
+
+            # Setup Requests session
+            session = self._get_session(pool_size, pool_block)
+
+            transport = PostNLTransport(
+                session, timeout,
+                self._get_operation_timeouts(operation_timeouts)
+            )
+
+        # Instantiate web service; with the fast parser, the backend
+        # returns raw XML replies
+        self.backend = self._get_backend(
+            backend, environment, transport, username, password, cache,
+            bundled_wsdl, fast_parser
         )
 
-        self.service = self.suds_client.service
+    @property
+    def suds_client(self):
+        """ suds client of the suds backend. """
+        return self.backend.suds_client
+
+    @property
+    def service(self):
+        """ Service of the backend's client, calling raw operations. """
+        return self.backend.service
+
+    def clone(self, username=None, password=None, webshop_id=None):
+        """
+        Return copy of the client for use by another thread, sharing the
+        parsed WSDL and the connection pool.
+
+        Given `username` and `password`, and `webshop_id`, the copy calls
+        on behalf of another webshop.
+        """
+
+        if (username is None) != (password is None):
+            raise ValueError('Both username and password are required.')
+
+        clone = copy.copy(self)
+
+        if username is None:
+            clone.backend = self.backend.clone()
+        else:
+            password_digest = self._get_password_digest(password)
+
+            clone.backend = self.backend.clone(username, password_digest)
+
+            if self.security_header:
+                clone.security_header = render_security_header(
+                    username, password_digest
+                )
+
+        if webshop_id is not None:
+            clone.webshop_id = webshop_id
+
+        return clone
+
+    def warm_up(self):
+        """
+        Build what calls of each operation use, ahead of the first calls;
+        the model of the bundled XSD's, converter plans and request
+        validators, as well as response parsers, envelope templates and
+        record classes when enabled. These are shared by all clients of the
+        class.
+        """
+
+        for operation in self.operations:
+            plan = self._get_converter_plan(operation)
+            self._get_converter_plan(operation, output=False)
+            self._get_request_validator(operation)
+
+            if self.fast_parser:
+                self._get_response_parser(operation)
+
+            if self.security_header:
+                self._get_envelope_template(operation)
+
+            if self.record_results and plan:
+                self._get_record_class(operation)
+
+    def map(self, operation, iterable, max_workers=4, ordered=False):
+        """
+        Call API method `operation`, e.g. 'read_order', with keyword
+        arguments from each dictionary in `iterable`, on at most
+        `max_workers` clones of the client at once.
+
+        Returns generator of BulkResult's (index, kwargs, result, exception)
+        as calls complete or, when `ordered`, in order of `iterable`. Errors
+        are yielded as exception rather than raised.
+        """
+
+        return bulk_map(self, operation, iterable, max_workers, ordered)
 
     @classmethod
-    def _get_session(cls, timeout=None):
-        """ Setup requests session. """
+    def _get_session(cls, pool_size=10, pool_block=False):
+        """ Setup requests session with connection pool. """
+        import requests
+        import requests.adapters
+
         session = requests.Session()
         session.verify = True
 
-        if timeout:
-            session.timeout = timeout
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=pool_size, pool_block=pool_block
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
 
         return session
 
     @classmethod
-    def _get_client(
-        cls, environment, session, username, password, cache=None
-    ):
-        """ Return webservice from SOAP client (suds). """
+    def _get_operation_timeouts(cls, operation_timeouts=None):
+        """ Return class default operation timeouts, updated by argument. """
+
+        timeouts = dict(cls.operation_timeouts)
+        timeouts.update(operation_timeouts or {})
+
+        return timeouts
+
+    @classmethod
+    def _get_endpoint_url(cls, environment):
+        """ Return WSDL URL of the web service for environment. """
 
-        # Endpoint URL depending on environment
         assert environment in ('sandbox', 'production'), 'Unknown environment'
 
         if environment == 'production':
-            webservice_url = cls.PRODUCTION_ENDPOINT_URL
-        else:
-            webservice_url = cls.SANDBOX_ENDPOINT_URL
+            return cls.PRODUCTION_ENDPOINT_URL
+
+        return cls.SANDBOX_ENDPOINT_URL
+
+    @classmethod
+    def _get_bundled_wsdl_url(cls):
+        """ Return file URL of the bundled WSDL. """
+
+        return 'file:' + pathname2url(
+            os.path.abspath(cls.BUNDLED_WSDL_PATH)
+        )
+
+    @classmethod
+    def _get_snapshot_location(cls):
+        """
+        Return directory of the snapshot cache; in the user's cache
+        directory, by contents of the bundle and Python version, as pickles
+        are not compatible between major versions.
+        """
+
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+            os.path.expanduser('~'), '.cache'
+        )
+
+        return os.path.join(
+            base, 'postnl_checkout', '%s-%s-py%d' % (
+                cls.WSDL_VERSION, cls._get_bundle_digest(),
+                sys.version_info[0]
+            )
+        )
+
+    @classmethod
+    def _get_snapshot_cache(cls):
+        """
+        Return file cache holding the pickled suds definitions parsed from
+        the bundled WSDL, so subsequent processes need not parse it again.
+        """
+        import suds.cache
+
+        location = cls._get_snapshot_location()
+
+        try:
+            # Pickles are loaded, so others may not write them
+            os.makedirs(location, 0o700)
+        except OSError:
+            # Existing, or else suds skips caching
+            pass
+
+        # Keyed by contents of the bundle, so the snapshot never expires
+        return suds.cache.ObjectCache(location=location, days=0)
+
+    @classmethod
+    def _get_bundle_digest(cls):
+        """
+        Return SHA-1 hex digest of the contents of the bundled WSDL and
+        XSD's, identifying the bundle for caches shared between processes.
+        """
+
+        directory = os.path.dirname(cls.BUNDLED_WSDL_PATH)
+
+        if directory not in cls._bundle_digests:
+            sha1 = hashlib.sha1()
+
+            for filename in sorted(os.listdir(directory)):
+                with open(os.path.join(directory, filename), 'rb') as f:
+                    sha1.update(f.read())
+
+            cls._bundle_digests[directory] = sha1.hexdigest()
+
+        return cls._bundle_digests[directory]
+
+    @classmethod
+    def _get_remote_digest(cls, environment, timeout=default_timeout):
+        """
+        Return SHA-1 hex digest of the WSDL fetched from PostNL for
+        environment, identifying it for caches shared between processes.
+        """
+        import requests
+
+        response = requests.get(
+            cls._get_endpoint_url(environment), timeout=timeout
+        )
+        response.raise_for_status()
+
+        return hashlib.sha1(response.content).hexdigest()
+
+    @classmethod
+    def _get_password_digest(cls, password):
+        """ Return password as sent to PostNL; its SHA-1 hex digest. """
+
+        if isinstance(password, text_type):
+            password = password.encode('utf-8')
 
-        # Setup authentication
         sha1 = hashlib.sha1()
         sha1.update(password)
 
-        security = suds.wsse.Security()
-        token = suds.wsse.UsernameToken(username, sha1.hexdigest())
-        security.tokens.append(token)
+        return sha1.hexdigest()
 
-        # Instantiate client
-        client = suds.client.Client(
-            webservice_url,
-            transport=suds_requests.RequestsTransport(session),
-            cachingpolicy=1, cache=cache,
-            wsse=security
-        )
+    @classmethod
+    def _get_backend(
+        cls, backend, environment, transport, username, password, cache=None,
+        bundled_wsdl=False, raw_replies=False
+    ):
+        """ Return SOAPBackend by name, loading the web service. """
+        from .backends import get_backend_class
+
+        # Endpoint URL depending on environment
+        endpoint_url = cls._get_endpoint_url(environment)
 
-        return client
+        if bundled_wsdl:
+            webservice_url = cls._get_bundled_wsdl_url()
+
+            # Only the service location differs from the bundle
+            location = endpoint_url.split('?', 1)[0]
+
+            if cache is None:
+                cache = cls._get_snapshot_cache()
+        else:
+            webservice_url = endpoint_url
+            location = None
+
+        return get_backend_class(backend)(
+            webservice_url, location, transport, username,
+            cls._get_password_digest(password), cache, raw_replies
+        )
 
     @classmethod
     def _parse_datetime(cls, value):
         """ Parse datetime in PostNL format. """
 
+        if cls.datetime_format == DATETIME_FORMAT:
+            # Memoized, without strptime
+            return parse_datetime(value)
+
         return datetime.datetime.strptime(value, cls.datetime_format)
 
     @classmethod
     def _format_datetime(cls, value):
         """ Format datetime in PostNL format. """
 
+        if cls.datetime_format == DATETIME_FORMAT:
+            return format_datetime(value)
+
         return datetime.datetime.strftime(value, cls.datetime_format)
 
     @classmethod
-    def _assert_required_attributes(cls, kwargs, required):
-        """ Assert whether all required attributes are present. """
+    def _get_request_validator(cls, operation):
+        """ Return (cached) RequestValidator for arguments of operation. """
+
+        key = (cls, operation)
+
+        if key not in cls._request_validators:
+            cls._request_validators[key] = RequestValidator(
+                cls._get_schema(), operation,
+                cls.required_elements.get(operation, ())
+            )
+
+        return cls._request_validators[key]
+
+    def _validate_request(self, operation, kwargs):
+        """
+        Raise PostNLRequestException when arguments are invalid, if enabled.
+        """
+
+        if self.validate_requests:
+            self._get_request_validator(operation).validate(kwargs)
+
+    @classmethod
+    def _get_items(cls, obj):
+        """
+        Return iterator over (key, value) pairs for a (suds or zeep)
+        dict-ish object or None when the object is a plain value.
+
+        The kind of object is determined once per class.
+        """
+        obj_class = obj.__class__
+
+        try:
+            kind = cls._node_kinds[obj_class]
+        except KeyError:
+            if hasattr(obj, 'items'):
+                kind = NODE_DICT
+            elif hasattr(obj, '__keylist__'):
+                kind = NODE_SUDS
+            elif hasattr(obj, '__values__'):
+                kind = NODE_ZEEP
+            else:
+                kind = NODE_VALUE
+
+            cls._node_kinds[obj_class] = kind
+
+        if kind is NODE_DICT:
+            return obj.items()
 
-        for key in required:
-            assert key in kwargs, 'Required argument %s not present.' % key
+        if kind is NODE_SUDS:
+            # Iterating suds objects yields (key, value) pairs
+            return obj
+
+        if kind is NODE_ZEEP:
+            return obj.__values__.items()
+
+        return None
 
     @classmethod
     def _sudsobject_to_dict(cls, obj, wrapper=None, key=''):
         """
-        Recursively convert a (suds) dict-ish object to a dictionary,
-        optionally mapping values through the wrapper function.
+        Convert a (suds) dict-ish object to a dictionary, optionally mapping
+        values through the wrapper function.
+
+        Nested objects are converted using an explicit stack of dictionaries
+        still to be filled, rather than by recursion.
 
         Inspired by: http://www.snip2code.com/Snippet/15899/convert-suds-response-to-dictionary
         """
         if not wrapper:
-            # Default wrapper to a no-op
-            # Note: this is not a great idea performance-wise
-            wrapper = lambda k, v: v
-
-        if hasattr(obj, 'items'):
-            # Dictionary
-            iterator = obj.items()
-        elif hasattr(obj, '__keylist__'):
-            # Suds object
-            iterator = obj
-        else:
+            wrapper = _no_op
+
+        get_items = cls._get_items
+
+        iterator = get_items(obj)
+        if iterator is None:
             # Object is not dictionary-like, return wrapped value
             return wrapper(key, obj)
 
-        # Object is dictionary-like, potentially recurse
-
         out = {}
-        for key, value in iterator:
-            if isinstance(value, list):
-                # Value is list
-                out[key] = []
-                for item in value:
-                    out[key].append(
-                        cls._sudsobject_to_dict(item, wrapper, key)
-                    )
-            else:
-                # Attempt recursion
-                out[key] = cls._sudsobject_to_dict(value, wrapper, key)
+
+        # Dictionaries to fill, with the items to fill them with
+        stack = [(out, iterator)]
+        push = stack.append
+
+        def convert(key, value):
+            """ Wrap value or schedule conversion of dict-ish value. """
+            iterator = get_items(value)
+
+            if iterator is None:
+                return wrapper(key, value)
+
+            child = {}
+            push((child, iterator))
+
+            return child
+
+        while stack:
+            target, iterator = stack.pop()
+
+            for key, value in iterator:
+                if isinstance(value, list):
+                    target[key] = [convert(key, item) for item in value]
+                else:
+                    target[key] = convert(key, value)
 
         return out
 
     @classmethod
-    def _from_python(cls, obj):
-        """ Convert object from Pythonic format to API format. """
+    def _get_schema(cls):
+        """ Return model of the bundled XSD's. """
 
-        def wrapper(key, value):
-            """ Wrapper used to convert values. """
-            # Leave None in place
-            if value is None:
-                return None
+        return get_schema(os.path.dirname(cls.BUNDLED_WSDL_PATH))
 
-            # Convert dates
-            if 'Datum' in key:
-                return unicode(cls._format_datetime(value))
+    @classmethod
+    def _get_leaf_type(cls, name, type_name):
+        """
+        Return Python type ('datetime', 'decimal' or 'string') for a leaf
+        element from its XSD type.
 
-            # Default; convert to strings
-            return unicode(value)
+        As PostNL declares all values as `xs:string`, these are typed by
+        element name instead.
+        """
+
+        type_name = cls._get_schema().get_builtin(type_name)
+
+        if type_name == 'xs:dateTime':
+            return 'datetime'
 
-        obj = cls._sudsobject_to_dict(obj, wrapper)
+        if type_name == 'xs:decimal':
+            return 'decimal'
 
-        return obj
+        # Fall back to element name for PostNL's strings
+        if 'Datum' in name:
+            return 'datetime'
+
+        if contains_any(name, cls.monetary_fields):
+            return 'decimal'
+
+        return 'string'
 
     @classmethod
-    def _to_python(cls, obj):
-        """ Convert object from API format to Pythonic format. """
+    def _get_converter_plan(cls, operation, output=True):
+        """
+        Return plan for converting the output (or input) of an operation.
+
+        The plan is a tree of dictionaries mirroring the element structure,
+        with leaf elements mapped to their converter function. Plans are
+        built once from the bundled XSD's and cached on the class.
+        """
+
+        key = (cls, operation, output)
+
+        if key in cls._converter_plans:
+            return cls._converter_plans[key]
+
+        schema = cls._get_schema()
 
-        def wrapper(key, value):
-            """ Wrapper used to convert values. """
+        if output:
+            element = operation + 'Response'
+            converters = {
+                'datetime': cls._parse_datetime,
+                'decimal': decimal.Decimal,
+                'string': text_type
+            }
+        else:
+            element = operation
+            converters = {
+                'datetime': lambda value: text_type(
+                    cls._format_datetime(value)
+                ),
+                'decimal': text_type,
+                'string': text_type
+            }
+
+        def build(children):
+            plan = {}
+
+            for child in children:
+                if schema.is_complex(child.type):
+                    plan[child.name] = build(
+                        schema.complex_types[child.type]
+                    )
+                else:
+                    plan[child.name] = converters[
+                        cls._get_leaf_type(child.name, child.type)
+                    ]
+
+            return plan
+
+        if element in schema.elements:
+            plan = build(schema.get_children(element))
+        else:
+            # Operation without message, i.e. PingStatus input
+            plan = None
+
+        cls._converter_plans[key] = plan
+
+        return plan
+
+    @classmethod
+    def _convert_with_plan(cls, obj, plan, wrapper):
+        """
+        Convert a (suds) dict-ish object to a dictionary according to plan,
+        falling back to the wrapper function for elements not in the plan.
+        """
 
-            # Leave None in place
+        get_items = cls._get_items
+        to_dict = cls._sudsobject_to_dict
+
+        iterator = get_items(obj)
+        if iterator is None:
+            return wrapper('', obj)
+
+        out = {}
+
+        # Dictionaries to fill, with their items and plan
+        stack = [(out, iterator, plan)]
+        push = stack.append
+
+        def convert(key, value, node):
+            """ Convert value or schedule conversion of dict-ish value. """
             if value is None:
                 return None
 
-            # Convert dates
-            if 'Datum' in key:
-                return cls._parse_datetime(value)
+            if not isinstance(node, dict):
+                # Leaf element; node is the converter
+                return node(value)
+
+            iterator = get_items(value)
+
+            if iterator is None:
+                # Unexpected value where complex type was expected
+                return wrapper(key, value)
+
+            child = {}
+            push((child, iterator, node))
+
+            return child
+
+        while stack:
+            target, iterator, plan = stack.pop()
+
+            for key, value in iterator:
+                node = plan.get(key)
+
+                if node is None:
+                    # Not in schema, use wrapper
+                    target[key] = to_dict(value, wrapper, key)
+                elif isinstance(value, list):
+                    target[key] = [
+                        convert(key, item, node) for item in value
+                    ]
+                else:
+                    target[key] = convert(key, value, node)
+
+        return out
+
+    @classmethod
+    def _from_python_value(cls, key, value):
+        """ Convert value from Pythonic format to API format. """
+
+        # Leave None in place
+        if value is None:
+            return None
+
+        # Convert dates
+        if 'Datum' in key:
+            return text_type(cls._format_datetime(value))
+
+        # Default; convert to strings
+        return text_type(value)
+
+    @classmethod
+    def _to_python_value(cls, key, value):
+        """ Convert value from API format to Pythonic format. """
+
+        # Leave None in place
+        if value is None:
+            return None
+
+        # Convert dates
+        if 'Datum' in key:
+            return cls._parse_datetime(value)
+
+        # Convert monetary amounts to Decimal
+        if contains_any(key, cls.monetary_fields):
+            return decimal.Decimal(value)
+
+        # Return string version of value
+        return text_type(value)
+
+    @classmethod
+    def _from_python(cls, obj, operation=None):
+        """
+        Convert object from Pythonic format to API format, using the
+        converter plan for operation's input when given.
+        """
+
+        plan = operation and cls._get_converter_plan(operation, output=False)
+
+        if plan:
+            return cls._convert_with_plan(obj, plan, cls._from_python_value)
+
+        return cls._sudsobject_to_dict(obj, cls._from_python_value)
+
+    @classmethod
+    def _get_record_class(cls, operation):
+        """ Return generated record class for replies of operation. """
+
+        return get_record_class(
+            cls._get_schema().elements[operation + 'Response']
+        )
+
+    @classmethod
+    def _to_python(cls, obj, operation=None, records=False):
+        """
+        Convert object from API format to Pythonic format, using the
+        converter plan for operation's output when given.
+
+        With `records` set, the result for an operation is a record rather
+        than a dictionary.
+        """
+
+        plan = operation and cls._get_converter_plan(operation)
+
+        if plan:
+            if records:
+                return convert_to_records(
+                    obj, plan, cls._get_record_class(operation),
+                    cls._get_items, cls._sudsobject_to_dict,
+                    cls._to_python_value
+                )
+
+            return cls._convert_with_plan(obj, plan, cls._to_python_value)
+
+        return cls._sudsobject_to_dict(obj, cls._to_python_value)
 
-            # Convert monetary amounts to Decimal
-            if contains_any(key, cls.monetary_fields):
-                return decimal.Decimal(value)
+    @classmethod
+    def _to_lazy_python(cls, obj, operation=None):
+        """
+        Return LazyResult converting object from API format on access, or
+        the converted value for plain values.
+        """
+
+        iterator = cls._get_items(obj)
+        if iterator is None:
+            return cls._to_python_value('', obj)
+
+        plan = operation and cls._get_converter_plan(operation) or None
+
+        return LazyResult(
+            iterator, plan, cls._get_items, cls._to_python_value
+        )
+
+    @classmethod
+    def _get_response_parser(cls, operation):
+        """ Return (cached) ResponseParser for replies of operation. """
 
-            # Return string version of value
-            return unicode(value)
+        key = (cls, operation)
 
-        obj = cls._sudsobject_to_dict(obj, wrapper)
+        if key not in cls._response_parsers:
+            cls._response_parsers[key] = ResponseParser(
+                cls._get_schema(), operation + 'Response',
+                cls._get_converter_plan(operation), cls._to_python_value
+            )
 
-        return obj
+        return cls._response_parsers[key]
+
+    def _parse_reply(self, method_name, reply):
+        """
+        Parse raw reply into Pythonic format, having the backend raise the
+        fault in replies containing one.
+        """
+
+        try:
+            return self._get_response_parser(method_name).parse(reply)
+        except FaultResponse:
+            self.backend.raise_fault(method_name, reply, 200)
+
+            return self._to_python(
+                self.backend.unmarshal(method_name, reply), method_name
+            )
+
+    @classmethod
+    def _get_envelope_template(cls, operation):
+        """ Return (cached) EnvelopeTemplate for requests of operation. """
+
+        if operation not in cls._envelope_templates:
+            cls._envelope_templates[operation] = EnvelopeTemplate(
+                cls._get_schema(), operation
+            )
+
+        return cls._envelope_templates[operation]
+
+    def _render_envelope(self, method_name, kwargs):
+        """
+        Return request envelope rendered from template, or None when
+        templates are disabled or the arguments require marshalling by the
+        backend.
+        """
+
+        if not self.security_header:
+            return None
+
+        try:
+            return self._get_envelope_template(method_name).render(
+                kwargs, self.security_header
+            )
+        except UnsupportedValue:
+            logger.debug(
+                'Arguments for %s not supported by template, marshalling.',
+                method_name
+            )
+
+            return None
 
     def _add_webshop(self, kwargs):
         """ Add webshop to argument dictionary. """
@@ -217,28 +928,267 @@ class PostNLCheckoutClient(object):
             'IntRef': self.webshop_id
         }
 
+    @classmethod
+    def _get_argument(cls, kwargs, name, child):
+        """
+        Return child element of argument, or None when missing; arguments
+        need not have been validated.
+        """
+
+        value = kwargs.get(name)
+
+        if isinstance(value, dict):
+            return value.get(child)
+
+        return None
+
+    def _get_result_cache_key(self, value):
+        """
+        Return key or alias in the result cache for an order token or
+        ExtRef; by webshop, as clones for other webshops share the cache
+        and ExtRef's are only unique within a webshop.
+        """
+
+        return u'%s:%s' % (self.webshop_id, value)
+
+    def _is_transient_error(self, exception):
+        """
+        Return whether exception is due to a connection error, timeout or
+        server error, as reported by suds with Exception((status, reason))
+        and a status of 0 for errors without reply.
+        """
+
+        status = self.backend.get_error_status(exception)
+
+        if status is None:
+            import socket
+
+            import requests
+
+            return isinstance(
+                exception, (requests.RequestException, socket.error)
+            )
+
+        return not status or status >= 500
+
+    def _get_retry_delay(self, retry):
+        """ Return jittered exponential backoff before numbered retry. """
+
+        return random.uniform(
+            0, min(self.retry_max_backoff, self.retry_backoff * 2 ** retry)
+        )
+
+    def add_timing_hook(self, hook):
+        """
+        Register callable to be called with a CallTiming after each API
+        call, for this client and its clones. Exceptions raised by hooks are
+        logged and ignored.
+        """
+
+        self.timing_hooks.append(hook)
+
+    def remove_timing_hook(self, hook):
+        """ Unregister timing hook. """
+
+        self.timing_hooks.remove(hook)
+
+    def _report_timing(self, timing, outcome, exception=None):
+        """ Finish timing and pass it to the timing hooks. """
+
+        timing.finish(outcome, exception)
+
+        for hook in self.timing_hooks:
+            try:
+                hook(timing)
+            except Exception:
+                logger.exception('Error in timing hook %r', hook)
+
     def _api_call(self, method_name, **kwargs):
-        """ Wrapper for API calls. """
+        """
+        Wrapper for API calls, coalescing concurrent identical calls of
+        idempotent operations when enabled.
+        """
+
+        return self._coalesced_api_call(method_name, kwargs)[0]
 
-        # Get relevant method
-        method = getattr(self.service, method_name)
+    def _coalesced_api_call(self, method_name, kwargs):
+        """
+        Perform API call, or share that of a concurrent identical call;
+        returning the result and whether it was shared.
+        """
+
+        single_flight = self.single_flight
+
+        if single_flight is None or method_name not in self.retry_operations:
+            return self._uncoalesced_api_call(method_name, kwargs), False
+
+        try:
+            key = make_key(method_name, kwargs)
+            hash(key)
+        except TypeError:
+            # Unhashable arguments
+            return self._uncoalesced_api_call(method_name, kwargs), False
+
+        result, shared = single_flight.do(
+            key, lambda: self._uncoalesced_api_call(method_name, kwargs)
+        )
+
+        if shared and not isinstance(result, string_types):
+            # Result of another caller, who may change it; records and
+            # lazy results included
+            result = copy.deepcopy(result)
+
+        return result, shared
+
+    def _uncoalesced_api_call(self, method_name, kwargs):
+        """ Perform API call, reporting its timing to hooks. """
+
+        if not self.timing_hooks:
+            return self._timed_api_call(method_name, kwargs, None)
+
+        timing = CallTiming(method_name)
+
+        try:
+            result = self._timed_api_call(method_name, kwargs, timing)
+
+        except PostNLRequestException as e:
+            self._report_timing(timing, CallTiming.FAULT, e)
+            raise
+
+        except Exception as e:
+            self._report_timing(timing, CallTiming.ERROR, e)
+            raise
+
+        self._report_timing(timing, CallTiming.SUCCESS)
+
+        return result
+
+    def _timed_api_call(self, method_name, kwargs, timing):
+        """
+        Perform API call with retries, recording phases in timing unless
+        it is None.
+        """
 
         # Convert arguments from Pythonic formats
-        kwargs = self._from_python(kwargs)
+        kwargs = self._from_python(kwargs, method_name)
+
+        if timing:
+            timing.mark('convert')
+
+        envelope = self._render_envelope(method_name, kwargs)
+
+        if timing:
+            timing.mark('serialize')
+
+        if method_name in self.retry_operations:
+            retries = self.retries
+        else:
+            retries = 0
+
+        breaker = self.circuit_breaker
+        retry = 0
+
+        while True:
+            if breaker and not breaker.allow():
+                raise PostNLUnavailableException(
+                    'PostNL service unavailable, not calling %s.' %
+                    method_name
+                )
+
+            try:
+                result = self._perform_call(
+                    method_name, kwargs, envelope, timing
+                )
+
+            except Exception as e:
+                if not self._is_transient_error(e):
+                    # Service replied
+                    if breaker:
+                        breaker.record_success()
+                    raise
+
+                if breaker:
+                    breaker.record_failure()
+
+                if retry >= retries:
+                    raise
+
+                delay = self._get_retry_delay(retry)
+                retry += 1
+
+                logger.warning(
+                    'Retrying %s in %.2f seconds (%d/%d) after error: %s',
+                    method_name, delay, retry, retries, e
+                )
+
+                time.sleep(delay)
+
+                if timing:
+                    timing.mark('backoff')
+
+            else:
+                if breaker:
+                    breaker.record_success()
+
+                return result
+
+    def _perform_call(self, method_name, kwargs, envelope, timing=None):
+        """
+        Perform API call once, sending the rendered envelope if available.
+        """
+
+        if timing:
+            transport = self.backend.transport
+            transport.last_exchange = None
+
+            timing.attempts += 1
 
         try:
-            # Perform API call
-            result = method(**kwargs)
+            try:
+                if envelope is None:
+                    # Perform API call through the backend
+                    result = self.backend.call(method_name, kwargs)
+                else:
+                    # Send pre-rendered envelope, result is the raw reply
+                    result = self.backend.send(method_name, envelope)
+            finally:
+                if timing:
+                    # Time up to sending was spent marshalling, time after
+                    # receiving (by the backend) parsing
+                    timing.exchange(transport.last_exchange)
+
+            if self.fast_parser:
+                # Result is the raw reply
+                result = self._parse_reply(method_name, result)
+
+                if timing:
+                    timing.mark('parse')
+
+                return result
+
+            if envelope is not None:
+                result = self.backend.unmarshal(method_name, result)
+
+        except self.backend.fault_classes as e:
+            if timing:
+                timing.mark('parse')
 
-        except suds.WebFault, e:
             # Catch CIF Exception details and re-raise
+            raise self.backend.get_request_exception(e)
 
-            # Get error message
-            error = e.fault.detail.CifException.Errors.ExceptionData.ErrorMsg
-            raise PostNLRequestException(error)
+        if timing:
+            timing.mark('parse')
 
         # Convert result to Pythonic formats
-        result = self._to_python(result)
+        if self.lazy_results:
+            result = self._to_lazy_python(result, method_name)
+        else:
+            result = self._to_python(
+                result, method_name, self.record_results
+            )
+
+        if timing:
+            timing.mark('convert')
 
         return result
 
@@ -248,10 +1198,7 @@ class PostNLCheckoutClient(object):
         # Add webshop before executing request
         self._add_webshop(kwargs)
 
-        if __debug__:
-            self._assert_required_attributes(
-                kwargs, ('Webshop', 'Order')
-            )
+        self._validate_request('PrepareOrder', kwargs)
 
         # Execute API call
         return self._api_call('PrepareOrder', **kwargs)
@@ -262,13 +1209,40 @@ class PostNLCheckoutClient(object):
         # Add webshop before executing request
         self._add_webshop(kwargs)
 
-        if __debug__:
-            self._assert_required_attributes(
-                kwargs, ('Webshop', 'Checkout')
-            )
+        self._validate_request('ReadOrder', kwargs)
 
-        # Execute API call
-        return self._api_call('ReadOrder', **kwargs)
+        cache = self.result_cache
+        token = self._get_argument(kwargs, 'Checkout', 'OrderToken')
+
+        if cache is None or token is None:
+            # Execute API call; without order token, as unvalidated
+            # arguments may lack it, PostNL replies with a fault
+            return self._api_call('ReadOrder', **kwargs)
+
+        key = self._get_result_cache_key(token)
+
+        result = cache.get(key)
+        if result is None:
+            # Results read while the order is confirmed or updated are
+            # discarded
+            since = time.time()
+
+            result, shared = self._coalesced_api_call('ReadOrder', kwargs)
+
+            if shared:
+                # Cached by the caller performing the call, which may have
+                # started before an invalidation
+                return result
+
+            # UpdateOrder refers to orders by ExtRef
+            order = result.get('Order')
+            ext_ref = order and order.get('ExtRef')
+
+            cache.set(key, result, aliases=(
+                (self._get_result_cache_key(ext_ref), ) if ext_ref else ()
+            ), since=since)
+
+        return result
 
     def confirm_order(self, **kwargs):
         """ Wrapper around ConfirmOrder API call. """
@@ -276,13 +1250,18 @@ class PostNLCheckoutClient(object):
         # Add webshop before executing request
         self._add_webshop(kwargs)
 
-        if __debug__:
-            self._assert_required_attributes(
-                kwargs, ('Webshop', 'Checkout', 'Order')
-            )
+        self._validate_request('ConfirmOrder', kwargs)
 
-        # Execute API call
-        result = self._api_call('ConfirmOrder', **kwargs)
+        try:
+            # Execute API call
+            result = self._api_call('ConfirmOrder', **kwargs)
+        finally:
+            token = self._get_argument(kwargs, 'Checkout', 'OrderToken')
+
+            if self.result_cache is not None and token is not None:
+                self.result_cache.invalidate(
+                    self._get_result_cache_key(token)
+                )
 
         # Make sure the response is sensible
         if not 'Order' in result and 'ExtRef' in result['Order']:
@@ -297,13 +1276,19 @@ class PostNLCheckoutClient(object):
         # Add webshop before executing request
         self._add_webshop(kwargs)
 
-        if __debug__:
-            self._assert_required_attributes(
-                kwargs, ('Webshop', 'Order')
-            )
+        self._validate_request('UpdateOrder', kwargs)
 
-        # Execute API call
-        result = self._api_call('UpdateOrder', **kwargs)
+        try:
+            # Execute API call
+            result = self._api_call('UpdateOrder', **kwargs)
+        finally:
+            if self.result_cache is not None:
+                ext_ref = self._get_argument(kwargs, 'Order', 'ExtRef')
+
+                if ext_ref:
+                    self.result_cache.invalidate(
+                        alias=self._get_result_cache_key(ext_ref)
+                    )
 
         # Return the result
         assert result in ('true', 'false')
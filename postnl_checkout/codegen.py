@@ -0,0 +1,159 @@
+"""
+Generate the record classes in `records_generated` from the bundled XSD's.
+
+A class is generated for every complex type in the replies of the web
+service, with the elements of the type as `__slots__`. Values of elements
+restricted to an enumeration, or named in `INTERNED_ELEMENTS`, are interned.
+
+Run after updating the bundled XSD's::
+
+    python -m postnl_checkout.codegen
+"""
+
+import os
+import sys
+import textwrap
+
+from .client import PostNLCheckoutClient
+
+
+# Elements with few distinct values across orders
+INTERNED_ELEMENTS = (
+    'Code', 'Eind', 'Geslacht', 'IntRef', 'Land', 'Optie', 'ProductCode',
+    'Start', 'Status', 'Succes'
+)
+
+OUTPUT_PATH = os.path.join(os.path.dirname(__file__), 'records_generated.py')
+
+HEADER = '''"""
+Record classes for the replies of the web service.
+
+Generated from the bundled XSD's by `python -m postnl_checkout.codegen`;
+do not edit.
+"""
+
+from .records import Record
+'''
+
+
+def _format_names(prefix, names, suffix, indent=4):
+    """ Return source for a sequence of names, wrapped to 79 columns. """
+
+    items = ', '.join(repr(str(name)) for name in names)
+
+    if len(names) == 1:
+        # Single item tuple
+        items += ','
+
+    line = ' ' * indent + prefix + items + suffix
+    if len(line) <= 79:
+        return line
+
+    lines = textwrap.wrap(
+        items, 79 - indent - 4, break_on_hyphens=False
+    )
+
+    return '\n'.join(
+        [' ' * indent + prefix] +
+        [' ' * (indent + 4) + line for line in lines] +
+        [' ' * indent + suffix]
+    )
+
+
+def _format_item(key, value, indent):
+    """ Return source for a dictionary item, wrapped to 79 columns. """
+
+    line = "%s'%s': %s," % (' ' * indent, key, value)
+    if len(line) <= 79:
+        return line
+
+    return "%s'%s':\n%s%s," % (' ' * indent, key, ' ' * (indent + 4), value)
+
+
+def get_record_types(schema):
+    """
+    Return names of complex types in replies, each after the types of its
+    elements.
+    """
+
+    types = []
+
+    def visit(type_name):
+        if type_name in types:
+            return
+
+        for child in schema.complex_types[type_name]:
+            if schema.is_complex(child.type):
+                visit(child.type)
+
+        types.append(type_name)
+
+    for name in sorted(schema.elements):
+        if name.endswith('Response') and schema.is_complex(
+            schema.elements[name]
+        ):
+            visit(schema.elements[name])
+
+    return types
+
+
+def generate_records(schema):
+    """ Return source of the record classes module for schema. """
+
+    out = [HEADER]
+
+    types = get_record_types(schema)
+
+    for type_name in types:
+        children = schema.complex_types[type_name]
+
+        out.append('\nclass %s(Record):' % type_name)
+        out.append(_format_names(
+            '__slots__ = (', [child.name for child in children], ')'
+        ))
+        out.append('    _fields = __slots__')
+
+        complex_children = [
+            child for child in children if schema.is_complex(child.type)
+        ]
+        if complex_children:
+            out.append('    _children = {')
+            out.extend(
+                _format_item(child.name, child.type, 8)
+                for child in complex_children
+            )
+            out.append('    }')
+
+        interned = [
+            child.name for child in children
+            if not schema.is_complex(child.type) and (
+                child.name in INTERNED_ELEMENTS or
+                schema.simple_types.get(child.type) and
+                schema.simple_types[child.type].enumeration
+            )
+        ]
+        if interned:
+            out.append(
+                _format_names('_interned = frozenset((', interned, '))')
+            )
+
+        out.append('')
+
+    out.append('\nRECORD_CLASSES = {')
+    out.extend(_format_item(name, name, 4) for name in sorted(types))
+    out.append('}\n')
+
+    return '\n'.join(out)
+
+
+def main():
+    source = generate_records(PostNLCheckoutClient._get_schema())
+
+    with open(OUTPUT_PATH, 'w') as f:
+        f.write(source)
+
+    sys.stdout.write('Wrote %s\n' % OUTPUT_PATH)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+""" Compatibility between Python 2 and 3. """
+
+import sys
+
+
+PY2 = sys.version_info[0] == 2
+
+if PY2:
+    text_type = unicode
+    string_types = (basestring, )
+
+    import Queue as queue
+
+    from collections import Mapping
+    from cStringIO import StringIO as BytesIO
+    from urlparse import urlparse
+    from xml.etree import cElementTree as ElementTree
+
+else:
+    text_type = str
+    string_types = (str, )
+
+    import queue
+
+    from collections.abc import Mapping
+    from io import BytesIO
+    from urllib.parse import urlparse
+    from xml.etree import ElementTree
+
+
+# Imported on use, as urllib.request pulls in http.client, email and ssl
+
+def pathname2url(path):
+    """ Return URL path for local file path. """
+
+    if PY2:
+        from urllib import pathname2url
+    else:
+        from urllib.request import pathname2url
+
+    return pathname2url(path)
+
+
+def url2pathname(path):
+    """ Return local file path for URL path. """
+
+    if PY2:
+        from urllib import url2pathname
+    else:
+        from urllib.request import url2pathname
+
+    return url2pathname(path)
@@ -0,0 +1,3 @@
+default_app_config = (
+    'postnl_checkout.contrib.django_postnl_checkout.apps.PostNLCheckoutConfig'
+)
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class PostNLCheckoutConfig(AppConfig):
+    name = 'postnl_checkout.contrib.django_postnl_checkout'
+
+    def ready(self):
+        from .settings import postnl_checkout_settings
+
+        if postnl_checkout_settings.WARMUP_ON_READY:
+            from .warmup import warm_up_process
+
+            warm_up_process()
@@ -0,0 +1,226 @@
+"""
+suds cache using Django caching, apart from `utils` so suds is only
+imported when a client is instantiated.
+
+Parsed WSDL's are kept in two tiers; a size-limited LRU in the process,
+in front of the Django cache shared between processes. Values in the
+shared tier are pickled and compressed, under keys versioned by the value
+format, the suds and Python versions and a digest of the WSDL contents.
+"""
+
+import collections
+import datetime
+import pickle
+import sys
+import threading
+import time
+import zlib
+
+from django.core.cache import cache
+
+import suds
+from suds.cache import Cache
+
+
+class SudsDjangoCache(Cache):
+    """
+    Implement the suds cache interface using Django caching.
+    Source: https://github.com/dpoirier/basket/blob/master/news/backends/exacttarget.py
+
+    The local tier holds at most `max_entries` objects, of at most
+    `max_size` bytes pickled, returning the same object to each client.
+    Entries expire after the given duration as accepted by suds' caches,
+    i.e. `days=1` or `hours=6`; a duration of zero never expires. Keys
+    include `digest`, identifying the contents of the WSDL.
+    """
+
+    # Format of values in the shared tier; bump when changing it
+    FORMAT_VERSION = 1
+
+    TIERS = ('local', 'shared')
+
+    def __init__(
+        self, days=None, digest='', max_entries=16,
+        max_size=4 * 1024 * 1024, key_prefix='suds', **duration
+    ):
+        if days is not None:
+            duration['days'] = days
+
+        if not duration:
+            # Default of suds' caches
+            duration = {'days': 1}
+
+        seconds = int(datetime.timedelta(**duration).total_seconds())
+
+        # Django's cache keeps entries without timeout forever
+        self.timeout = seconds or None
+
+        self.digest = digest
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.key_prefix = key_prefix
+
+        self._lock = threading.Lock()
+
+        # id -> (expiry time or None, size, value), least recent first
+        self._entries = collections.OrderedDict()
+        self._size = 0
+
+        self.reset_stats()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _cache_key(self, id):
+        return '%s:%d:%s:py%d%d:%s:%s' % (
+            self.key_prefix, self.FORMAT_VERSION, suds.__version__,
+            sys.version_info[0], sys.version_info[1], self.digest, id
+        )
+
+    def _count(self, tier, hit, seconds):
+        with self._lock:
+            counts = self._counts[tier]
+
+            counts['hits' if hit else 'misses'] += 1
+            counts['seconds'] += seconds
+
+    def _load_local(self, id):
+        with self._lock:
+            entry = self._entries.get(id)
+
+            if entry is None:
+                return None
+
+            expires, size, value = entry
+
+            if expires is not None and expires <= time.time():
+                self._remove_local(id)
+                return None
+
+            # Most recently used
+            del self._entries[id]
+            self._entries[id] = entry
+
+            return value
+
+    def _store_local(self, id, value, size):
+        if size > self.max_size:
+            return
+
+        expires = time.time() + self.timeout if self.timeout else None
+
+        with self._lock:
+            self._remove_local(id)
+
+            entries = self._entries
+
+            while entries and (
+                len(entries) >= self.max_entries or
+                self._size + size > self.max_size
+            ):
+                self._remove_local(next(iter(entries)))
+
+            entries[id] = (expires, size, value)
+            self._size += size
+
+    def _remove_local(self, id):
+        """ Remove entry, with the lock held. """
+
+        entry = self._entries.pop(id, None)
+
+        if entry is not None:
+            self._size -= entry[1]
+
+    def get(self, id):
+        start = time.time()
+        value = self._load_local(id)
+        self._count('local', value is not None, time.time() - start)
+
+        if value is not None:
+            return value
+
+        start = time.time()
+        data = cache.get(self._cache_key(id))
+
+        if data is not None:
+            pickled = zlib.decompress(data)
+            value = pickle.loads(pickled)
+
+        self._count('shared', value is not None, time.time() - start)
+
+        if value is not None:
+            self._store_local(id, value, len(pickled))
+
+        return value
+
+    def put(self, id, value):
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+        cache.set(self._cache_key(id), zlib.compress(pickled), self.timeout)
+
+        self._store_local(id, value, len(pickled))
+
+    def purge(self, id):
+        with self._lock:
+            self._remove_local(id)
+
+        cache.delete(self._cache_key(id))
+
+    def clear(self):
+        """
+        Remove all entries from the local tier; the Django cache is shared
+        with other applications and is left alone.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """
+        Return dictionary of hits, misses, seconds spent on lookups and hit
+        ratio, by tier.
+        """
+
+        with self._lock:
+            stats = {}
+
+            for tier, counts in self._counts.items():
+                lookups = counts['hits'] + counts['misses']
+
+                stats[tier] = dict(
+                    counts,
+                    hit_ratio=(
+                        float(counts['hits']) / lookups if lookups else None
+                    )
+                )
+
+            return stats
+
+    def reset_stats(self):
+        """ Reset counts to zero. """
+
+        with self._lock:
+            self._counts = dict(
+                (tier, {'hits': 0, 'misses': 0, 'seconds': 0.0})
+                for tier in self.TIERS
+            )
+
+
+_suds_caches = {}
+_suds_caches_lock = threading.Lock()
+
+
+def get_suds_cache(digest='', **kwargs):
+    """
+    Return SudsDjangoCache shared by clients in this process, so they share
+    its local tier, by digest and arguments.
+    """
+
+    key = (digest, tuple(sorted(kwargs.items())))
+
+    with _suds_caches_lock:
+        if key not in _suds_caches:
+            _suds_caches[key] = SudsDjangoCache(digest=digest, **kwargs)
+
+        return _suds_caches[key]
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill the cache with the parsed WSDL for each environment and check '
+        'connectivity with PingStatus, reporting timings.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--environment', action='append', dest='environments',
+            choices=('sandbox', 'production'),
+            help='Environment to warm up, instead of the configured ones.'
+        )
+        parser.add_argument(
+            '--no-ping', action='store_false', dest='ping', default=True,
+            help='Do not call PingStatus.'
+        )
+
+    def handle(self, *args, **options):
+        errors = []
+
+        for step in warm_up(options['environments'], options['ping']):
+            self.stdout.write('%-12s %-8s %10.1f ms %s' % (
+                step.environment, step.step, step.seconds * 1e3,
+                step.error or 'OK'
+            ))
+
+            if step.error:
+                errors.append('%s %s: %s' % (
+                    step.environment, step.step, step.error
+                ))
+
+        if errors:
+            raise CommandError('Warm-up failed; %s' % '; '.join(errors))
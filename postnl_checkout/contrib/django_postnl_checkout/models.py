@@ -2,15 +2,17 @@ import json
 
 from django.db import models
 from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
 from django.utils.functional import SimpleLazyObject
 
 from jsonfield import JSONField
 from jsonfield.utils import default as encoder_default
 
+from postnl_checkout.breaker import CircuitBreaker
 from postnl_checkout.exceptions import PostNLResponseException
 
 from .settings import postnl_checkout_settings as settings
-from .utils import get_client
+from .utils import get_client, get_client_pool, get_client_registry
 
 
 class PostNLJSONEncoder(json.JSONEncoder):
@@ -22,6 +24,39 @@ class PostNLJSONEncoder(json.JSONEncoder):
 # Lazily instantiate a client (so we don't make a request on startup)
 postnl_client = SimpleLazyObject(get_client)
 
+# Pool of clones of the client, for use by concurrent threads
+postnl_client_pool = SimpleLazyObject(
+    lambda: get_client_pool(postnl_client)
+)
+
+# Pools of clients for other webshops, cloned from the client
+postnl_client_registry = SimpleLazyObject(
+    lambda: get_client_registry(postnl_client)
+)
+
+
+def get_webshop_client_pool(webshop_id=None):
+    """
+    Return pool of clients for webshop, by default the configured one, or
+    else one from WEBSHOPS.
+    """
+
+    if not webshop_id or webshop_id == settings.WEBSHOP_ID:
+        return postnl_client_pool
+
+    try:
+        webshop = settings.WEBSHOPS[webshop_id]
+    except KeyError:
+        raise ImproperlyConfigured(
+            'No credentials for webshop %s in POSTNL_CHECKOUT_WEBSHOPS.' %
+            webshop_id
+        )
+
+    return postnl_client_registry.get_pool(
+        webshop.get('ENVIRONMENT', settings.ENVIRONMENT),
+        webshop['USERNAME'], webshop['PASSWORD'], webshop_id
+    )
+
 
 class Order(models.Model):
     """ Django model representing the result of the ReadOrder call. """
@@ -34,6 +69,11 @@ class Order(models.Model):
     order_date = models.DateField(db_index=True)
     customer_ext_ref = models.CharField(db_index=True, max_length=255)
 
+    # Webshop the order was placed with, blank for the configured one
+    webshop_id = models.CharField(
+        db_index=True, max_length=255, blank=True, default=''
+    )
+
     # Raw data
     prepare_order_request = JSONField(encoder_class=PostNLJSONEncoder)
     prepare_order_response = JSONField(encoder_class=PostNLJSONEncoder)
@@ -43,8 +83,11 @@ class Order(models.Model):
     update_order_request = JSONField(encoder_class=PostNLJSONEncoder)
 
     @classmethod
-    def prepare_order(cls, **kwargs):
-        """ Call PrepareOrder and create Order using resulting token. """
+    def prepare_order(cls, webshop_id=None, **kwargs):
+        """
+        Call PrepareOrder and create Order using resulting token, for the
+        webshop with `webshop_id` unless the configured one.
+        """
 
         # Assert required attributes
         assert 'Order' in kwargs
@@ -55,7 +98,10 @@ class Order(models.Model):
         assert 'OrderDatum' in order_data
 
         # Call API
-        response = postnl_client.prepare_order(**kwargs)
+        pool = get_webshop_client_pool(webshop_id)
+
+        with pool.get_client() as client:
+            response = client.prepare_order(**kwargs)
 
         assert 'Checkout' in response
         assert 'OrderToken' in response['Checkout']
@@ -66,6 +112,7 @@ class Order(models.Model):
             order_token=order_token,
             order_ext_ref=order_data['ExtRef'],
             order_date=order_data['OrderDatum'],
+            webshop_id=webshop_id or '',
             prepare_order_request=kwargs,
             prepare_order_response=response
         )
@@ -77,24 +124,44 @@ class Order(models.Model):
         return order
 
     @classmethod
-    def ping_status(cls):
+    def ping_status(cls, webshop_id=None):
         """ Wrap PingStatus for ease of accesibility. """
 
+        pool = get_webshop_client_pool(webshop_id)
+
+        breaker = pool.client.circuit_breaker
+
+        if breaker and breaker.state == CircuitBreaker.OPEN:
+            # Service is down, don't wait for it
+            return False
+
         if settings.SERVICE_STATUS_CACHE_TIMEOUT:
-            status = cache.get(settings.SERVICE_STATUS_CACHE_KEY, None)
+            cache_key = settings.SERVICE_STATUS_CACHE_KEY
+
+            if pool is not postnl_client_pool:
+                # Other webshops may use another environment
+                cache_key = '%s:%s' % (cache_key, webshop_id)
+
+            status = cache.get(cache_key, None)
             if status is None:
-                status = postnl_client.ping_status()
+                with pool.get_client() as client:
+                    status = client.ping_status()
 
                 cache.set(
-                    settings.SERVICE_STATUS_CACHE_KEY, status,
-                    settings.SERVICE_STATUS_CACHE_TIMEOUT
+                    cache_key, status, settings.SERVICE_STATUS_CACHE_TIMEOUT
                 )
         else:
             # No timeout, don't cache
-            status = postnl_client.ping_status()
+            with pool.get_client() as client:
+                status = client.ping_status()
 
         return status
 
+    def get_client_pool(self):
+        """ Return pool of clients for the order's webshop. """
+
+        return get_webshop_client_pool(self.webshop_id)
+
     def read_order(self):
         """ Call ReadOrder and store results. """
         assert self.order_token
@@ -107,7 +174,8 @@ class Order(models.Model):
         }
 
         # Call API
-        response = postnl_client.read_order(**kwargs)
+        with self.get_client_pool().get_client() as client:
+            response = client.read_order(**kwargs)
 
         # Store response
         self.read_order_response = response
@@ -128,7 +196,8 @@ class Order(models.Model):
         }
 
         # Call API
-        result = postnl_client.confirm_order(**kwargs)
+        with self.get_client_pool().get_client() as client:
+            result = client.confirm_order(**kwargs)
 
         # Make sure the result is sensible
         if result['Order']['ExtRef'] != self.order_ext_ref:
@@ -145,7 +214,8 @@ class Order(models.Model):
         }
 
         # Call API
-        response = postnl_client.update_order(**kwargs)
+        with self.get_client_pool().get_client() as client:
+            response = client.update_order(**kwargs)
 
         assert response in (True, False)
 
@@ -5,9 +5,99 @@ class PostNLCheckoutSettings(SettingsBase):
     """ Settings for PostNL checkout. """
     settings_prefix = 'POSTNL_CHECKOUT'
 
-    DEFAULT_TIMEOUT = None
+    # (connect, read) timeout in seconds for fetching the WSDL and
+    # operations without an operation timeout
+    DEFAULT_TIMEOUT = (3.05, 30)
+
+    # Timeouts by operation name, i.e. {'ReadOrder': (3.05, 60)}, updating
+    # the client's defaults
+    DEFAULT_OPERATION_TIMEOUTS = None
+
+    # Connections kept alive; size to the number of worker threads
+    DEFAULT_POOL_SIZE = 10
+
+    # Wait for a pooled connection rather than opening a new one
+    DEFAULT_POOL_BLOCK = False
+
+    # Clients available to concurrent threads and seconds to wait for one
+    DEFAULT_CLIENT_POOL_SIZE = 10
+    DEFAULT_CLIENT_POOL_TIMEOUT = 30
+
+    # Retries of ReadOrder and PingStatus on transient errors, with an
+    # initial backoff in seconds; none by default
+    DEFAULT_RETRIES = 0
+    DEFAULT_RETRY_BACKOFF = 0.1
+
+    # Consecutive failures after which calls fail fast, for the given number
+    # of seconds; None, the default, disables the circuit breaker
+    DEFAULT_CIRCUIT_BREAKER_THRESHOLD = None
+    DEFAULT_CIRCUIT_BREAKER_RESET_TIMEOUT = 30
+
+    # Paths of callables receiving the timing of each API call, i.e.
+    # 'postnl_checkout.contrib.django_postnl_checkout.timing.log_timing'
+    DEFAULT_TIMING_HOOKS = ()
+
+    # Record exchanges with PostNL to this path, or reply from a recording
+    # without network access, optionally with the recorded latencies
+    DEFAULT_RECORD_PATH = None
+    DEFAULT_REPLAY_PATH = None
+    DEFAULT_REPLAY_LATENCY = False
+
+    # Seconds ReadOrder results are cached by order token in the Django
+    # cache, until confirmed or updated; None disables caching
+    DEFAULT_READ_ORDER_CACHE_TTL = None
+
+    # Share a single request among concurrent identical ReadOrder and
+    # PingStatus calls within the process, or with 'cache' across processes
+    # through a lock in the Django cache
+    DEFAULT_COALESCE_CALLS = False
+
+    # Validate request arguments against the bundled XSD's before calling
+    DEFAULT_VALIDATE_REQUESTS = True
+
     DEFAULT_ENVIRONMENT = 'sandbox'
 
+    # Credentials of other webshops by webshop ID, for orders of several
+    # storefronts, i.e. {'<webshop id>': {'USERNAME': .., 'PASSWORD': ..}},
+    # optionally with an ENVIRONMENT other than the default
+    DEFAULT_WEBSHOPS = {}
+
+    # Estimated bytes the clients of other webshops may take, beyond which
+    # those least recently used are discarded
+    DEFAULT_WEBSHOP_CLIENTS_MAX_MEMORY = 16 * 1024 * 1024
+
+    # Days the parsed WSDL is kept in the Django cache, or 0 for ever, and
+    # objects and pickled bytes kept in front of it by each process
+    DEFAULT_WSDL_CACHE_DAYS = 1
+    DEFAULT_WSDL_CACHE_MAX_ENTRIES = 16
+    DEFAULT_WSDL_CACHE_MAX_SIZE = 4 * 1024 * 1024
+
+    # Environments loaded by the postnl_checkout_warmup command; by default
+    # ENVIRONMENT only
+    DEFAULT_WARMUP_ENVIRONMENTS = None
+
+    # Load and warm up the client when Django starts, rather than on the
+    # first call; without pinging PostNL
+    DEFAULT_WARMUP_ON_READY = False
+
+    # Use WSDL shipped with the package instead of fetching it from PostNL
+    DEFAULT_BUNDLED_WSDL = False
+
+    # SOAP library; 'suds' or 'zeep', which requires the zeep extra
+    DEFAULT_SOAP_BACKEND = 'suds'
+
+    # Parse replies directly instead of having suds unmarshal them
+    DEFAULT_FAST_PARSER = False
+
+    # Render requests from pre-compiled envelopes instead of using suds
+    DEFAULT_ENVELOPE_TEMPLATES = False
+
+    # Return results converting values on access, not with the fast parser
+    DEFAULT_LAZY_RESULTS = False
+
+    # Return results as compact records generated from the XSD's
+    DEFAULT_RECORD_RESULTS = False
+
     DEFAULT_REDIRECT_URL = 'wishlist'
 
     DEFAULT_SERVICE_STATUS_CACHE_KEY = 'postnl_checkout_service_status'
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+
+# Sent after each API call by the send_timing_signal timing hook, with the
+# CallTiming of the call
+api_call_timed = Signal(providing_args=['timing'])
@@ -0,0 +1,33 @@
+"""
+Timing hooks forwarding API call timings to Django; enable them by listing
+their paths in the `POSTNL_CHECKOUT_TIMING_HOOKS` setting.
+"""
+
+import logging
+
+from postnl_checkout.client import PostNLCheckoutClient
+
+from .signals import api_call_timed
+
+
+logger = logging.getLogger('postnl_checkout.timing')
+
+
+def log_timing(timing):
+    """ Log timing to the `postnl_checkout.timing` logger. """
+
+    logger.info(
+        '%s %s in %.1f ms (convert %.1f, serialize %.1f, network %.1f, '
+        'parse %.1f ms), %s bytes sent, %s received',
+        timing.operation, timing.outcome, timing.total * 1e3,
+        timing.phases['convert'] * 1e3, timing.phases['serialize'] * 1e3,
+        timing.phases['network'] * 1e3, timing.phases['parse'] * 1e3,
+        timing.request_size, timing.response_size,
+        extra={'timing': timing.as_dict()}
+    )
+
+
+def send_timing_signal(timing):
+    """ Send the `api_call_timed` signal. """
+
+    api_call_timed.send(sender=PostNLCheckoutClient, timing=timing)
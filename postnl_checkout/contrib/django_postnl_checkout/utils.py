@@ -1,11 +1,20 @@
+import logging
+logger = logging.getLogger(__name__)
+
+import time
+
 from importlib import import_module
 
 from django.conf import settings as django_settings
 from django.core.cache import cache
 
-from suds.cache import Cache
-
+from postnl_checkout.breaker import CircuitBreaker
+from postnl_checkout.cache import BaseResultCache
 from postnl_checkout.client import PostNLCheckoutClient
+from postnl_checkout.exceptions import PostNLUnavailableException
+from postnl_checkout.pool import ClientPool
+from postnl_checkout.registry import ClientRegistry
+from postnl_checkout.singleflight import SingleFlight, get_key_digest
 
 
 class Singleton(type):
@@ -87,44 +96,291 @@ def import_object(from_path):
     return getattr(mod, attr)
 
 
-class SudsDjangoCache(Cache):
+class DjangoResultCache(BaseResultCache):
     """
-    Implement the suds cache interface using Django caching.
-    Source: https://github.com/dpoirier/basket/blob/master/news/backends/exacttarget.py
+    Result cache using Django caching, shared between processes. Hit and
+    miss counts are kept per process.
     """
-    def __init__(self, days=None, *args, **kwargs):
-        if days:
-            self.timeout = 24 * 60 * 60 * days
-        else:
-            self.timeout = None
 
-    def _cache_key(self, id):
-        return "suds-%s" % id
+    def __init__(self, ttl=60, key_prefix='postnl_checkout_result'):
+        super(DjangoResultCache, self).__init__(ttl)
+
+        self.key_prefix = key_prefix
+
+    def _cache_key(self, key):
+        return '%s:%s' % (self.key_prefix, key)
+
+    def _load(self, key):
+        return cache.get(self._cache_key(key))
+
+    def _store(self, key, value):
+        cache.set(self._cache_key(key), value, self.ttl)
+
+    def _remove(self, key):
+        cache.delete(self._cache_key(key))
+
+
+class DjangoSingleFlight(SingleFlight):
+    """
+    Coalescing of calls across processes, using a lock in the Django cache.
+
+    Calls are coalesced within the process first. The process acquiring
+    the lock makes the call and briefly stores its outcome in the cache,
+    where other processes poll for it every `poll_interval` seconds.
+    Failures are shared as well, raising the exception to the waiting
+    processes rather than having them call one by one. Should the caller
+    get lost, the next process to find the lock released makes the call;
+    processes waiting longer than `timeout` make the call themselves.
+    """
+
+    def __init__(
+        self, timeout=30, poll_interval=0.05,
+        key_prefix='postnl_checkout_flight'
+    ):
+        super(DjangoSingleFlight, self).__init__()
+
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.key_prefix = key_prefix
+
+    def _get_shared(self, result_key):
+        """
+        Return (result, True) of the call stored under result_key, raising
+        its exception if it failed, or None when not stored.
+        """
+
+        outcome = cache.get(result_key)
+
+        if outcome is None:
+            return None
+
+        succeeded, value = outcome
+
+        if not succeeded:
+            raise value
+
+        return value, True
+
+    def _set_shared(self, result_key, succeeded, value):
+        """ Store outcome of the call for processes polling. """
+
+        timeout = max(1, 10 * self.poll_interval)
+
+        try:
+            cache.set(result_key, (succeeded, value), timeout)
+        except Exception:
+            if succeeded:
+                raise
+
+            # Exception cannot be pickled
+            cache.set(result_key, (False, PostNLUnavailableException(
+                'Coalesced call failed: %s' % value
+            )), timeout)
+
+    def _call(self, key, function):
+        digest = get_key_digest(key)
+
+        lock_key = '%s:lock:%s' % (self.key_prefix, digest)
+        result_key = '%s:result:%s' % (self.key_prefix, digest)
+
+        deadline = time.time() + self.timeout
+
+        while not cache.add(lock_key, True, self.timeout):
+            time.sleep(self.poll_interval)
+
+            shared = self._get_shared(result_key)
+            if shared is not None:
+                return shared
+
+            if time.time() > deadline:
+                return function(), False
+
+        try:
+            # Stored by the caller releasing the lock just now
+            shared = self._get_shared(result_key)
+            if shared is not None:
+                return shared
+
+            try:
+                result = function()
+            except Exception as e:
+                self._set_shared(result_key, False, e)
+                raise
+
+            self._set_shared(result_key, True, result)
+        finally:
+            cache.delete(lock_key)
+
+        return result, False
+
+
+def get_transport():
+    """
+    Return recording or replay transport when configured, otherwise None.
+    """
+
+    from postnl_checkout.recording import RecordingTransport, \
+        ReplayTransport
+
+    from .settings import postnl_checkout_settings
+
+    if postnl_checkout_settings.REPLAY_PATH:
+        return ReplayTransport(
+            postnl_checkout_settings.REPLAY_PATH,
+            latency=postnl_checkout_settings.REPLAY_LATENCY
+        )
+
+    if postnl_checkout_settings.RECORD_PATH:
+        return RecordingTransport(
+            postnl_checkout_settings.RECORD_PATH,
+            session=PostNLCheckoutClient._get_session(
+                postnl_checkout_settings.POOL_SIZE,
+                postnl_checkout_settings.POOL_BLOCK
+            ),
+            timeout=postnl_checkout_settings.TIMEOUT,
+            operation_timeouts=PostNLCheckoutClient._get_operation_timeouts(
+                postnl_checkout_settings.OPERATION_TIMEOUTS
+            )
+        )
+
+    return None
+
+
+def get_remote_digest(environment):
+    """
+    Return digest of the WSDL of PostNL for environment, keying its parsed
+    definitions in the Django cache. Should it fail to be fetched, parsed
+    definitions cached without digest are used, if any.
+    """
 
-    def get(self, id):
-        return cache.get(self._cache_key(id))
+    from .settings import postnl_checkout_settings
 
-    def put(self, id, value):
-        cache.set(self._cache_key(id), value, self.timeout)
+    try:
+        return PostNLCheckoutClient._get_remote_digest(
+            environment, postnl_checkout_settings.TIMEOUT
+        )
+    except Exception:
+        logger.warning(
+            'Could not fetch WSDL for %s, using cache without digest.',
+            environment, exc_info=True
+        )
 
-    def purge(self, id):
-        cache.delete(self._cache_key(id))
+        return ''
 
 
-def get_client():
-    """ Instantiate and return PostNLCheckoutClient for use with Django. """
+def get_client(environment=None):
+    """
+    Instantiate and return PostNLCheckoutClient for use with Django, for
+    the configured environment unless given.
+    """
 
+    from .cache import get_suds_cache
     from .settings import postnl_checkout_settings
 
-    suds_cache = SudsDjangoCache()
+    environment = environment or postnl_checkout_settings.ENVIRONMENT
+
+    if postnl_checkout_settings.BUNDLED_WSDL:
+        digest = PostNLCheckoutClient._get_bundle_digest()
+    else:
+        digest = get_remote_digest(environment)
+
+    suds_cache = get_suds_cache(
+        digest,
+        days=postnl_checkout_settings.WSDL_CACHE_DAYS,
+        max_entries=postnl_checkout_settings.WSDL_CACHE_MAX_ENTRIES,
+        max_size=postnl_checkout_settings.WSDL_CACHE_MAX_SIZE
+    )
+
+    if postnl_checkout_settings.CIRCUIT_BREAKER_THRESHOLD:
+        circuit_breaker = CircuitBreaker(
+            postnl_checkout_settings.CIRCUIT_BREAKER_THRESHOLD,
+            postnl_checkout_settings.CIRCUIT_BREAKER_RESET_TIMEOUT
+        )
+    else:
+        circuit_breaker = None
+
+    if postnl_checkout_settings.READ_ORDER_CACHE_TTL:
+        result_cache = DjangoResultCache(
+            postnl_checkout_settings.READ_ORDER_CACHE_TTL
+        )
+    else:
+        result_cache = None
+
+    if postnl_checkout_settings.COALESCE_CALLS == 'cache':
+        single_flight = DjangoSingleFlight()
+    elif postnl_checkout_settings.COALESCE_CALLS:
+        single_flight = SingleFlight()
+    else:
+        single_flight = None
 
     client = PostNLCheckoutClient(
         username=postnl_checkout_settings.USERNAME,
         password=postnl_checkout_settings.PASSWORD,
         webshop_id=postnl_checkout_settings.WEBSHOP_ID,
-        environment=postnl_checkout_settings.ENVIRONMENT,
+        environment=environment,
         timeout=postnl_checkout_settings.TIMEOUT,
-        cache=suds_cache
+        operation_timeouts=postnl_checkout_settings.OPERATION_TIMEOUTS,
+        pool_size=postnl_checkout_settings.POOL_SIZE,
+        pool_block=postnl_checkout_settings.POOL_BLOCK,
+        retries=postnl_checkout_settings.RETRIES,
+        retry_backoff=postnl_checkout_settings.RETRY_BACKOFF,
+        circuit_breaker=circuit_breaker,
+        transport=get_transport(),
+        cache=suds_cache,
+        bundled_wsdl=postnl_checkout_settings.BUNDLED_WSDL,
+        fast_parser=postnl_checkout_settings.FAST_PARSER,
+        envelope_templates=postnl_checkout_settings.ENVELOPE_TEMPLATES,
+        lazy_results=postnl_checkout_settings.LAZY_RESULTS,
+        record_results=postnl_checkout_settings.RECORD_RESULTS,
+        result_cache=result_cache,
+        single_flight=single_flight,
+        validate_requests=postnl_checkout_settings.VALIDATE_REQUESTS,
+        backend=postnl_checkout_settings.SOAP_BACKEND
     )
 
+    for path in postnl_checkout_settings.TIMING_HOOKS:
+        client.add_timing_hook(import_object(path))
+
     return client
+
+
+def get_client_pool(client=None):
+    """
+    Return ClientPool of clones of client, instantiated by get_client when
+    not given.
+    """
+
+    from .settings import postnl_checkout_settings
+
+    if client is None:
+        client = get_client()
+
+    return ClientPool(
+        client,
+        size=postnl_checkout_settings.CLIENT_POOL_SIZE,
+        timeout=postnl_checkout_settings.CLIENT_POOL_TIMEOUT
+    )
+
+
+def get_client_registry(client=None):
+    """
+    Return ClientRegistry for the webshops in WEBSHOPS, cloning client for
+    the configured environment, or else clients instantiated by get_client.
+    """
+
+    from .settings import postnl_checkout_settings
+
+    def factory(environment):
+        default = environment == postnl_checkout_settings.ENVIRONMENT
+
+        if client is not None and default:
+            return client
+
+        return get_client(environment)
+
+    return ClientRegistry(
+        factory,
+        pool_size=postnl_checkout_settings.CLIENT_POOL_SIZE,
+        pool_timeout=postnl_checkout_settings.CLIENT_POOL_TIMEOUT,
+        max_memory=postnl_checkout_settings.WEBSHOP_CLIENTS_MAX_MEMORY
+    )
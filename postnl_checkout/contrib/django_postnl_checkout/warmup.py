@@ -0,0 +1,110 @@
+"""
+Warming up before serving traffic, so the first checkout after a deploy or
+cache flush does not pay for fetching and parsing the WSDL.
+
+`warm_up()` is run by the `postnl_checkout_warmup` management command and
+`warm_up_process()`, with the `POSTNL_CHECKOUT_WARMUP_ON_READY` setting,
+when Django starts.
+"""
+
+import collections
+import logging
+import time
+
+from .settings import postnl_checkout_settings
+from .utils import get_client
+
+
+logger = logging.getLogger(__name__)
+
+
+# Outcome of a step for an environment; `error` is a message or None
+WarmupStep = collections.namedtuple(
+    'WarmupStep', ('environment', 'step', 'seconds', 'error')
+)
+
+
+def get_environments():
+    """ Return environments to warm up. """
+
+    return (
+        postnl_checkout_settings.WARMUP_ENVIRONMENTS or
+        (postnl_checkout_settings.ENVIRONMENT, )
+    )
+
+
+def _get_error(client, exception):
+    """ Return short message for exception raised by a call. """
+
+    status = client.backend.get_error_status(exception)
+
+    if status is None:
+        return str(exception)
+
+    if not status:
+        # Error messages of the transport include a traceback
+        return 'No reply, connection failed or timed out.'
+
+    return 'Reply with HTTP status %d.' % status
+
+
+def warm_up(environments=None, ping=True):
+    """
+    Warm up each environment, yielding a WarmupStep as each step finishes:
+
+    * `load`: instantiate a client, filling the Django cache with the
+      parsed WSDL and XSD's, unless already cached
+    * `prepare`: build converter plans, validators, parsers and templates
+    * `ping`: call PingStatus, failing unless the service reports OK
+
+    Environments failing to load are not prepared or pinged.
+    """
+
+    for environment in environments or get_environments():
+        start = time.time()
+
+        try:
+            client = get_client(environment)
+        except Exception as e:
+            yield WarmupStep(environment, 'load', time.time() - start, str(e))
+            continue
+
+        yield WarmupStep(environment, 'load', time.time() - start, None)
+
+        start = time.time()
+        client.warm_up()
+
+        yield WarmupStep(environment, 'prepare', time.time() - start, None)
+
+        if not ping:
+            continue
+
+        start = time.time()
+
+        try:
+            error = None if client.ping_status() else 'Service not OK.'
+        except Exception as e:
+            error = _get_error(client, e)
+
+        yield WarmupStep(environment, 'ping', time.time() - start, error)
+
+
+def warm_up_process():
+    """
+    Load and warm up the client shared by this process, logging rather than
+    raising errors so the process starts regardless.
+    """
+
+    from .models import postnl_client
+
+    start = time.time()
+
+    try:
+        postnl_client.warm_up()
+    except Exception:
+        logger.exception('Warming up the PostNL checkout client failed.')
+    else:
+        logger.info(
+            'Warmed up the PostNL checkout client in %.1f ms.',
+            (time.time() - start) * 1e3
+        )
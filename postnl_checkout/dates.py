@@ -0,0 +1,117 @@
+"""
+Parsing and formatting of PostNL's fixed-width datetime format,
+`DD-MM-YYYY HH:MM:SS`, without `strptime()` and `strftime()`.
+
+`strptime()` is slow and serializes threads on a module lock. As values
+come in exactly this format, they are parsed by a plain regular
+expression and integer conversion instead, falling back to `strptime()`
+for anything else, such as dates without zero padding. Results are
+memoized, as many values in an order history share the same dates.
+"""
+
+import datetime
+import re
+
+
+DATETIME_FORMAT = '%d-%m-%Y %H:%M:%S'
+
+_datetime = datetime.datetime
+_strptime = datetime.datetime.strptime
+
+# Zero padded values
+_DATETIME = re.compile(
+    r'([0-9]{2})-([0-9]{2})-([0-9]{4}) ([0-9]{2}):([0-9]{2}):([0-9]{2})\Z'
+)
+
+
+class Memo(object):
+    """
+    Bounded memo of function results, evicting the least recently used
+    values approximately.
+
+    Values are kept in two generations: lookups go to the current one and
+    then to the previous one, from which hits are promoted. When the
+    current generation holds `size / 2` values, it becomes the previous
+    one, dropping the values not used since the last swap.
+    """
+
+    __slots__ = ('function', 'size', '_current', '_previous')
+
+    def __init__(self, function, size=4096):
+        self.function = function
+        self.size = size
+
+        self._current = {}
+        self._previous = {}
+
+    def __call__(self, value):
+        try:
+            return self._current[value]
+        except KeyError:
+            pass
+
+        try:
+            result = self._previous[value]
+        except KeyError:
+            result = self.function(value)
+
+        current = self._current
+
+        if len(current) >= self.size // 2:
+            self._previous = current
+            self._current = current = {}
+
+        current[value] = result
+
+        return result
+
+    def __len__(self):
+        return len(self._current) + len(self._previous)
+
+    def clear(self):
+        """ Forget all values. """
+
+        self._current = {}
+        self._previous = {}
+
+
+def _parse_datetime(value):
+    """ Parse datetime in PostNL format. """
+
+    match = _DATETIME.match(value)
+
+    if match:
+        day, month, year, hour, minute, second = match.groups()
+
+        return _datetime(
+            int(year), int(month), int(day),
+            int(hour), int(minute), int(second)
+        )
+
+    # Not zero padded or invalid
+    return _strptime(value, DATETIME_FORMAT)
+
+
+def _format_datetime(value):
+    """ Format naive datetime in PostNL format. """
+
+    return '%02d-%02d-%04d %02d:%02d:%02d' % (
+        value.day, value.month, value.year,
+        value.hour, value.minute, value.second
+    )
+
+
+parse_datetime = Memo(_parse_datetime)
+
+_format_memo = Memo(_format_datetime)
+
+
+def format_datetime(value):
+    """ Format datetime in PostNL format. """
+
+    if type(value) is _datetime and value.tzinfo is None:
+        return _format_memo(value)
+
+    # Dates, subclasses and aware datetimes, which compare equal to those
+    # in other timezones, are not memoized
+    return value.strftime(DATETIME_FORMAT)
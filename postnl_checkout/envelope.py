@@ -0,0 +1,252 @@
+"""
+Pre-compiled SOAP envelopes for outgoing requests.
+
+Requests are rendered from templates compiled once per operation from the
+bundled XSD's, producing exactly the bytes suds would send. Values which
+suds would handle differently from what the schema allows, such as
+elements not in the schema, raise `UnsupportedValue` so the caller can fall
+back to suds marshalling.
+"""
+
+import re
+
+from .compat import string_types, text_type
+
+
+ENVELOPE_NAMESPACE = 'http://schemas.xmlsoap.org/soap/envelope/'
+SERVICE_NAMESPACE = 'http://postnl.nl/cif/services/WebshopCheckoutWebService/'
+DOMAIN_NAMESPACE = (
+    'http://schemas.datacontract.org/2004/07/'
+    'Tpp.Cif.Services.Domain.WebshopCheckoutWebService'
+)
+WSSE_NAMESPACE = (
+    'http://docs.oasis-open.org/wss/2004/01/'
+    'oasis-200401-wss-wssecurity-secext-1.0.xsd'
+)
+XSI_NAMESPACE = 'http://www.w3.org/2001/XMLSchema-instance'
+
+XML_DECLARATION = u'<?xml version="1.0" encoding="UTF-8"?>'
+
+# Namespace declarations in the order suds writes them; depending on
+# whether the body contains domain elements, only the operation element
+# or nothing at all.
+FULL_NAMESPACES = (
+    ('wsse', WSSE_NAMESPACE),
+    ('ns0', SERVICE_NAMESPACE),
+    ('ns1', DOMAIN_NAMESPACE),
+    ('ns2', ENVELOPE_NAMESPACE),
+    ('xsi', XSI_NAMESPACE),
+    ('SOAP-ENV', ENVELOPE_NAMESPACE)
+)
+
+EMPTY_NAMESPACES = (
+    ('ns0', SERVICE_NAMESPACE),
+    ('ns1', ENVELOPE_NAMESPACE),
+    ('wsse', WSSE_NAMESPACE),
+    ('xsi', XSI_NAMESPACE),
+    ('SOAP-ENV', ENVELOPE_NAMESPACE)
+)
+
+NO_BODY_NAMESPACES = (
+    ('ns0', ENVELOPE_NAMESPACE),
+    ('wsse', WSSE_NAMESPACE),
+    ('xsi', XSI_NAMESPACE),
+    ('SOAP-ENV', ENVELOPE_NAMESPACE)
+)
+
+# Ampersands not starting an entity, as escaped by suds
+_AMPERSAND = re.compile('&(?!(amp|lt|gt|quot|apos);)')
+
+
+class UnsupportedValue(Exception):
+    """ Raised for values which cannot be rendered from the template. """
+    pass
+
+
+def escape(value):
+    """ Escape XML special characters the way suds does. """
+
+    if '&' in value:
+        value = _AMPERSAND.sub('&amp;', value)
+
+    return value.replace(
+        '<', '&lt;'
+    ).replace(
+        '>', '&gt;'
+    ).replace(
+        '"', '&quot;'
+    ).replace(
+        "'", '&apos;'
+    )
+
+
+def render_security_header(username, password_digest):
+    """ Return WS-Security header with username token. """
+
+    return (
+        u'<wsse:Security mustUnderstand="true"><wsse:UsernameToken>'
+        u'<wsse:Username>%s</wsse:Username>'
+        u'<wsse:Password>%s</wsse:Password>'
+        u'</wsse:UsernameToken></wsse:Security>'
+    ) % (escape(text_type(username)), escape(text_type(password_digest)))
+
+
+def _footprint(values):
+    """
+    Return number of significant values, by which suds decides whether to
+    omit an optional complex element. Like suds, nested values only count
+    when non-empty, without looking into them.
+    """
+
+    count = 0
+
+    for value in values.values():
+        if value is None:
+            continue
+
+        if hasattr(value, '__len__') and not len(value):
+            continue
+
+        count += 1
+
+    return count
+
+
+def _envelope_start(namespaces):
+    """ Return XML declaration and opening envelope tag. """
+
+    return XML_DECLARATION + u'<SOAP-ENV:Envelope %s><SOAP-ENV:Header>' % (
+        u' '.join(
+            u'xmlns:%s="%s"' % namespace for namespace in namespaces
+        )
+    )
+
+
+class EnvelopeTemplate(object):
+    """ Compiled request envelope for a single operation. """
+
+    def __init__(self, schema, operation):
+        """ Compile template for operation from schema. """
+
+        self.operation = operation
+
+        if operation in schema.elements:
+            self.plan = self._compile(
+                schema, schema.get_children(operation)
+            )
+        else:
+            # Operation without input message
+            self.plan = None
+
+        self.start = _envelope_start(FULL_NAMESPACES)
+        self.body_start = u'</SOAP-ENV:Header><ns2:Body><ns0:%s>' % operation
+        self.end = u'</ns0:%s></ns2:Body></SOAP-ENV:Envelope>' % operation
+
+        self.empty_start = _envelope_start(EMPTY_NAMESPACES)
+        self.empty_end = (
+            u'</SOAP-ENV:Header><ns1:Body><ns0:%s/></ns1:Body>'
+            u'</SOAP-ENV:Envelope>'
+        ) % operation
+
+        self.no_body_start = _envelope_start(NO_BODY_NAMESPACES)
+        self.no_body_end = (
+            u'</SOAP-ENV:Header><ns0:Body/></SOAP-ENV:Envelope>'
+        )
+
+    def _compile(self, schema, children):
+        """
+        Return list of (name, opening tag, closing tag, empty tag, children)
+        for elements in schema order, where children is None for leaves.
+        """
+
+        plan = []
+
+        for child in children:
+            if schema.is_complex(child.type):
+                grandchildren = self._compile(
+                    schema, schema.complex_types[child.type]
+                )
+            else:
+                grandchildren = None
+
+            plan.append((
+                child.name,
+                u'<ns1:%s>' % child.name,
+                u'</ns1:%s>' % child.name,
+                u'<ns1:%s/>' % child.name,
+                grandchildren
+            ))
+
+        return plan
+
+    def _render(self, plan, values, out):
+        """ Append rendered values to out, in schema order. """
+
+        count = 0
+
+        for name, start, end, empty, children in plan:
+            value = values.get(name)
+
+            if value is None:
+                continue
+
+            count += 1
+
+            if not isinstance(value, list):
+                value = (value, )
+
+            for item in value:
+                if children is None:
+                    if not isinstance(item, string_types):
+                        raise UnsupportedValue(item)
+
+                    out.extend((start, escape(item), end))
+
+                else:
+                    if not isinstance(item, dict):
+                        raise UnsupportedValue(item)
+
+                    if not _footprint(item):
+                        continue
+
+                    mark = len(out)
+                    out.append(start)
+
+                    self._render(children, item, out)
+
+                    if len(out) == mark + 1:
+                        out[mark] = empty
+                    else:
+                        out.append(end)
+
+        if count != len(values):
+            names = set(element[0] for element in plan)
+
+            for key, value in values.items():
+                if value is not None and key not in names:
+                    raise UnsupportedValue(key)
+
+    def render(self, values, header):
+        """ Return UTF-8 encoded envelope for values and security header. """
+
+        if self.plan is None:
+            if values:
+                raise UnsupportedValue(values)
+
+            out = [self.no_body_start, header, self.no_body_end]
+
+        else:
+            if not isinstance(values, dict):
+                raise UnsupportedValue(values)
+
+            body = []
+            self._render(self.plan, values, body)
+
+            if body:
+                out = [self.start, header, self.body_start]
+                out.extend(body)
+                out.append(self.end)
+            else:
+                out = [self.empty_start, header, self.empty_end]
+
+        return u''.join(out).encode('utf-8')
@@ -15,3 +15,13 @@ class PostNLRequestException(PostNLException):
 class PostNLResponseException(PostNLException):
     """ Exceptions due to values in the response. """
     pass
+
+
+class PostNLPoolTimeoutException(PostNLException):
+    """ No client became available in the pool within the wait timeout. """
+    pass
+
+
+class PostNLUnavailableException(PostNLException):
+    """ Call refused as the circuit breaker considers the service down. """
+    pass
@@ -0,0 +1,116 @@
+"""
+Read-only mappings over (suds) result objects, converting values to
+Pythonic format the first time they are accessed.
+
+For callers reading only a few fields of a large reply, this saves parsing
+every datetime and Decimal in it. Converted values are memoized, so every
+value is converted at most once; nested objects become nested mappings.
+"""
+
+from .compat import Mapping
+
+
+class LazyResult(Mapping):
+    """
+    Mapping over the items of a dict-ish object, converted on access
+    according to a converter plan or, without a plan, by the wrapper
+    function on key names; the same conversions `_to_python` applies.
+
+    Compares equal to the dictionary `_to_python` returns. Copies, pickles
+    and `to_json()` yield plain dictionaries.
+    """
+
+    __slots__ = ('_items', '_values', '_plan', '_get_items', '_wrapper')
+
+    def __init__(self, items, plan, get_items, wrapper):
+        """
+        Initialize from (key, value) pairs and the plan for them, or None.
+        `get_items` returns the items of a value or None for plain values,
+        as `PostNLCheckoutClient._get_items()`.
+        """
+
+        self._items = dict(items)
+        self._values = {}
+
+        self._plan = plan
+        self._get_items = get_items
+        self._wrapper = wrapper
+
+    def __getitem__(self, key):
+        values = self._values
+
+        if key in values:
+            return values[key]
+
+        value = self._items[key]
+
+        if self._plan is None:
+            node = None
+        else:
+            node = self._plan.get(key)
+
+        if isinstance(value, list):
+            value = [self._convert(key, item, node) for item in value]
+        else:
+            value = self._convert(key, value, node)
+
+        values[key] = value
+
+        return value
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return '<LazyResult %r>' % sorted(self._items)
+
+    def __reduce__(self):
+        """ Pickle and copy as a dictionary. """
+        return (dict, (self.to_dict(), ))
+
+    def _convert(self, key, value, node):
+        """ Convert value according to plan node. """
+
+        if node is not None and not isinstance(node, dict):
+            # Leaf element; node is the converter
+            if value is None:
+                return None
+
+            return node(value)
+
+        iterator = self._get_items(value)
+
+        if iterator is None:
+            # Plain value where none or a complex type was expected
+            return self._wrapper(key, value)
+
+        return LazyResult(iterator, node, self._get_items, self._wrapper)
+
+    def to_dict(self):
+        """ Return fully converted dictionary. """
+
+        result = {}
+
+        for key in self._items:
+            value = self[key]
+
+            if isinstance(value, LazyResult):
+                value = value.to_dict()
+            elif isinstance(value, list):
+                value = [
+                    item.to_dict() if isinstance(item, LazyResult) else item
+                    for item in value
+                ]
+
+            result[key] = value
+
+        return result
+
+    # Used by the encoder of jsonfield, hence `Order` model fields
+    to_json = to_dict
@@ -0,0 +1,174 @@
+"""
+Single pass parser for PostNL SOAP replies.
+
+Parses the raw reply straight into the Pythonic dictionaries which suds
+unmarshalling followed by `PostNLCheckoutClient._to_python` would produce,
+converting values while parsing. Faults are not handled; `FaultResponse` is
+raised instead so the caller can fall back to suds.
+
+Unlike suds, elements which are not in the schema are accepted and
+converted by name.
+"""
+
+from .compat import BytesIO, ElementTree
+
+
+SOAP_ENV_NAMESPACE = 'http://schemas.xmlsoap.org/soap/envelope/'
+XSI_NAMESPACE = 'http://www.w3.org/2001/XMLSchema-instance'
+
+BODY_TAG = '{%s}Body' % SOAP_ENV_NAMESPACE
+FAULT_TAG = '{%s}Fault' % SOAP_ENV_NAMESPACE
+NIL_ATTRIBUTE = '{%s}nil' % XSI_NAMESPACE
+
+
+class FaultResponse(Exception):
+    """ Raised when the reply body contains a SOAP fault. """
+    pass
+
+
+def _local_name(tag):
+    """ Strip namespace from ElementTree tag or attribute name. """
+    return tag.rsplit('}', 1)[-1]
+
+
+class ResponseParser(object):
+    """
+    Parser for the replies of a single operation.
+
+    The parse plan maps element names to (many, node) tuples, where node is
+    either the converter for a leaf element or the parse plan of a complex
+    element.
+    """
+
+    def __init__(self, schema, element, converters, wrapper):
+        """
+        Build parse plan for response element from schema, using the
+        converter plan for its children and falling back to wrapper for
+        elements not in the schema.
+        """
+
+        self.wrapper = wrapper
+
+        children = schema.get_children(element)
+
+        # Like suds, return the value of a lone child rather than a dict
+        if len(children) == 1 and not children[0].many:
+            self.single = children[0].name
+            converters = {
+                self.single: lambda value: wrapper('', value)
+            }
+        else:
+            self.single = None
+
+        def build(children, converters):
+            plan = {}
+
+            for child in children:
+                node = converters[child.name]
+
+                if isinstance(node, dict):
+                    node = build(schema.complex_types[child.type], node)
+
+                plan[child.name] = (child.many, node)
+
+            return plan
+
+        self.plan = build(children, converters)
+
+    def _get_value(self, key, node, values, elem):
+        """ Return value of element which has been parsed completely. """
+
+        wrapper = self.wrapper
+
+        if elem.get(NIL_ATTRIBUTE) == 'true':
+            return None
+
+        if values:
+            # Attributes are added to complex elements, prefixed with _
+            for name, value in elem.items():
+                if not name.startswith('{%s}' % XSI_NAMESPACE):
+                    attribute = '_' + _local_name(name)
+                    values[attribute] = wrapper(attribute, value)
+
+            return values
+
+        text = elem.text
+
+        if isinstance(node, dict):
+            # Complex element without children
+            return wrapper(key, text or u'')
+
+        if not text:
+            return None
+
+        if node is None:
+            # Not in schema
+            return wrapper(key, text)
+
+        return node(text)
+
+    def parse(self, reply):
+        """ Parse reply into Pythonic format. """
+
+        # Frames of elements being parsed; [key, many, node, values]
+        stack = []
+        in_body = False
+
+        for event, elem in ElementTree.iterparse(
+            BytesIO(reply), ('start', 'end')
+        ):
+            if event == 'start':
+                if stack:
+                    plan = stack[-1][2]
+                    key = _local_name(elem.tag)
+
+                    if isinstance(plan, dict) and key in plan:
+                        many, node = plan[key]
+                    else:
+                        many, node = False, None
+
+                    stack.append([key, many, node, {}])
+
+                elif in_body:
+                    if elem.tag == FAULT_TAG:
+                        raise FaultResponse()
+
+                    # Response element
+                    stack.append([None, False, self.plan, {}])
+
+                elif elem.tag == BODY_TAG:
+                    in_body = True
+
+                continue
+
+            if not stack:
+                continue
+
+            key, many, node, values = stack.pop()
+
+            if not stack:
+                # Response element parsed
+                if self.single:
+                    return values.get(self.single)
+
+                return values
+
+            value = self._get_value(key, node, values, elem)
+            parent = stack[-1][3]
+
+            if many:
+                parent.setdefault(key, []).append(value)
+            elif key in parent:
+                # Repeated element, make it a list
+                existing = parent[key]
+                if isinstance(existing, list):
+                    existing.append(value)
+                else:
+                    parent[key] = [existing, value]
+            else:
+                parent[key] = value
+
+            elem.clear()
+
+        # Empty body
+        return None
@@ -0,0 +1,136 @@
+"""
+Bounded pool of clients for concurrent use by threads.
+
+suds clients keep per-call state and cannot be shared between threads. The
+pool hands out clones of a prototype client, which share its parsed WSDL
+and connection pool, creating them on demand up to the pool size.
+"""
+
+import threading
+import time
+
+from contextlib import contextmanager
+
+from .compat import queue
+from .exceptions import PostNLPoolTimeoutException
+
+
+class ClientPool(object):
+    """ Pool of clones of a PostNLCheckoutClient, with checkout/checkin. """
+
+    def __init__(self, client, size=10, timeout=None):
+        """
+        Initialize pool of at most `size` clones of `client`, waiting up to
+        `timeout` seconds (or indefinitely when None) for a client to be
+        checked in when all are in use.
+        """
+
+        self.client = client
+        self.size = size
+        self.timeout = timeout
+
+        # Idle clients, most recently used first
+        self._idle = queue.LifoQueue()
+
+        self._lock = threading.Lock()
+
+        self._created = 0
+        self._in_use = 0
+        self._max_in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_time = 0.0
+
+    def _get(self, timeout):
+        """ Return idle client, new clone or wait for a checkin. """
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            create = self._created < self.size
+
+            if create:
+                self._created += 1
+
+        if create:
+            try:
+                return self.client.clone()
+            except:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        start = time.time()
+
+        try:
+            client = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            with self._lock:
+                self._timeouts += 1
+
+            raise PostNLPoolTimeoutException(
+                'No client available within %s seconds.' % timeout
+            )
+        finally:
+            with self._lock:
+                self._waits += 1
+                self._wait_time += time.time() - start
+
+        return client
+
+    def checkout(self, timeout=-1):
+        """
+        Return client for exclusive use until checked in, waiting at most
+        `timeout` seconds, by default the pool's timeout.
+        """
+
+        if timeout == -1:
+            timeout = self.timeout
+
+        client = self._get(timeout)
+
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+            self._max_in_use = max(self._max_in_use, self._in_use)
+
+        return client
+
+    def checkin(self, client):
+        """ Return client to the pool. """
+
+        with self._lock:
+            self._in_use -= 1
+
+        self._idle.put(client)
+
+    @contextmanager
+    def get_client(self, timeout=-1):
+        """ Context manager checking out a client and checking it in. """
+
+        client = self.checkout(timeout)
+
+        try:
+            yield client
+        finally:
+            self.checkin(client)
+
+    def stats(self):
+        """ Return dictionary with usage statistics. """
+
+        with self._lock:
+            return {
+                'size': self.size,
+                'created': self._created,
+                'idle': self._created - self._in_use,
+                'in_use': self._in_use,
+                'max_in_use': self._max_in_use,
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'wait_time': self._wait_time
+            }
@@ -0,0 +1,333 @@
+"""
+Transports recording exchanges with the web service to disk and replaying
+them, for load testing without reaching PostNL.
+
+A recording consists of two files: a data file of zlib-compressed records
+and an index file `<path>.idx` of fixed size entries pointing into it.
+Records are keyed by a SHA-1 hash of the SOAP action and request envelope,
+less its header; so neither recordings nor keys contain credentials.
+
+Data file, after the magic number::
+
+    status (H), latency (d), sizes of the operation, content type,
+    compressed request and compressed reply (HHII), followed by these
+
+Index file::
+
+    key (20s), offset of record in data file (Q)
+"""
+
+import hashlib
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+
+import suds.transport
+
+from .compat import BytesIO
+from .transport import DEFAULT_TIMEOUT, PostNLTransport
+
+
+MAGIC = b'PNLR\x01'
+
+RECORD_HEADER = struct.Struct('!HdHHII')
+INDEX_ENTRY = struct.Struct('!20sQ')
+
+# SOAP header, containing the security token
+_SOAP_HEADER = re.compile(br'<([\w.-]+:)?Header\b.*?</\1Header>', re.S)
+
+
+def strip_header(envelope):
+    """ Return envelope less its SOAP header. """
+    return _SOAP_HEADER.sub(b'', envelope, 1)
+
+
+def get_key(operation, envelope):
+    """ Return key of request envelope for operation. """
+
+    return hashlib.sha1(
+        (operation or '').encode('ascii') + b'\n' + strip_header(envelope)
+    ).digest()
+
+
+class RecordedExchange(object):
+    """ Request and reply recorded for an operation. """
+
+    __slots__ = (
+        'operation', 'status', 'content_type', 'latency', 'request', 'reply'
+    )
+
+    def __init__(
+        self, operation, status, content_type, latency, request, reply
+    ):
+        self.operation = operation
+        self.status = status
+        self.content_type = content_type
+        self.latency = latency
+        self.request = request
+        self.reply = reply
+
+
+class Recording(object):
+    """
+    Exchanges in a recording at `path`, shared by the transports of
+    clones of a client.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + '.idx'
+
+        self._lock = threading.Lock()
+
+        self._data = None
+        self._index = None
+
+    def append(self, key, exchange):
+        """ Append exchange to the recording. """
+
+        operation = (exchange.operation or '').encode('ascii')
+        content_type = (exchange.content_type or '').encode('ascii')
+        request = zlib.compress(exchange.request)
+        reply = zlib.compress(exchange.reply)
+
+        record = b''.join((
+            RECORD_HEADER.pack(
+                exchange.status, exchange.latency, len(operation),
+                len(content_type), len(request), len(reply)
+            ),
+            operation, content_type, request, reply
+        ))
+
+        with self._lock:
+            if self._data is None:
+                self._data = open(self.path, 'ab')
+                self._index = open(self.index_path, 'ab')
+
+                if not self._data.tell():
+                    self._data.write(MAGIC)
+
+            offset = self._data.tell()
+
+            self._data.write(record)
+            self._data.flush()
+
+            self._index.write(INDEX_ENTRY.pack(key, offset))
+            self._index.flush()
+
+    def close(self):
+        """ Close files opened for appending. """
+
+        with self._lock:
+            if self._data is not None:
+                self._data.close()
+                self._index.close()
+
+                self._data = self._index = None
+
+    def load(self):
+        """
+        Return dictionary of exchanges by key, the last recorded one for
+        duplicate keys.
+        """
+
+        with open(self.index_path, 'rb') as f:
+            index = f.read()
+
+        exchanges = {}
+
+        with open(self.path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError('Not a recording: %s' % self.path)
+
+            for position in range(0, len(index), INDEX_ENTRY.size):
+                key, offset = INDEX_ENTRY.unpack_from(index, position)
+
+                f.seek(offset)
+
+                (
+                    status, latency, operation_size, content_type_size,
+                    request_size, reply_size
+                ) = RECORD_HEADER.unpack(f.read(RECORD_HEADER.size))
+
+                exchanges[key] = RecordedExchange(
+                    f.read(operation_size).decode('ascii'),
+                    status,
+                    f.read(content_type_size).decode('ascii'),
+                    latency,
+                    zlib.decompress(f.read(request_size)),
+                    zlib.decompress(f.read(reply_size))
+                )
+
+        return exchanges
+
+
+class RecordingTransport(PostNLTransport):
+    """
+    Transport sending requests to the web service, recording exchanges to
+    `path`, appending to existing recordings.
+    """
+
+    def __init__(
+        self, path, session=None, timeout=DEFAULT_TIMEOUT,
+        operation_timeouts=None, recording=None
+    ):
+        PostNLTransport.__init__(self, session, timeout, operation_timeouts)
+
+        self.recording = recording or Recording(path)
+
+    def __deepcopy__(self, memo):
+        """ Copy, sharing session and recording. """
+
+        return self.__class__(
+            self.recording.path, self._session, self.timeout,
+            dict(self.operation_timeouts), self.recording
+        )
+
+    def _record(self, request, status, content_type, reply):
+        """ Record the last exchange. """
+
+        start, end, request_size, reply_size = self.last_exchange
+        operation = self.get_operation(request)
+
+        self.recording.append(
+            get_key(operation, request.message),
+            RecordedExchange(
+                operation, status, content_type, end - start,
+                strip_header(request.message), reply
+            )
+        )
+
+    def send(self, request):
+        """ Send request and record the exchange, including errors. """
+
+        try:
+            reply = PostNLTransport.send(self, request)
+        except suds.transport.TransportError as e:
+            if not e.httpcode:
+                # No reply to record
+                raise
+
+            # Error status with a content type other than plain XML, i.e.
+            # faults as sent by PostNL; replayed as TransportError
+            body = e.fp.read()
+            e.fp = BytesIO(body)
+
+            self._record(request, e.httpcode, '', body)
+
+            raise
+
+        self._record(
+            request, reply.code, reply.headers.get('content-type'),
+            reply.message
+        )
+
+        return reply
+
+    def close(self):
+        """ Close the recording. """
+        self.recording.close()
+
+
+class ReplayTransport(PostNLTransport):
+    """
+    Transport replying to requests from a recording at `path`, without
+    network access; documents can only be opened from `file://` URL's.
+
+    Requests which were not recorded are answered with a reply recorded for
+    the same operation, unless `strict` is set, in which case they raise a
+    TransportError. With `latency` set, replies are delayed by a latency
+    picked from those recorded for the operation.
+    """
+
+    def __init__(self, path, latency=False, strict=False, exchanges=None):
+        PostNLTransport.__init__(self)
+
+        self.path = path
+        self.latency = latency
+        self.strict = strict
+
+        if exchanges is None:
+            exchanges = Recording(path).load()
+
+        self.exchanges = exchanges
+
+        # Recorded exchanges and latencies by operation
+        self._operations = {}
+        self._latencies = {}
+
+        for exchange in exchanges.values():
+            self._operations.setdefault(exchange.operation, []).append(
+                exchange
+            )
+            self._latencies.setdefault(exchange.operation, []).append(
+                exchange.latency
+            )
+
+        self._counter = 0
+
+    def __deepcopy__(self, memo):
+        """ Copy, sharing the loaded exchanges. """
+
+        return self.__class__(
+            self.path, self.latency, self.strict, self.exchanges
+        )
+
+    def _get(self, request):
+        """ Refuse fetching remote documents. """
+
+        raise suds.transport.TransportError(
+            'Cannot fetch %s while replaying.' % request.url, 0,
+            BytesIO(b'')
+        )
+
+    def get_exchange(self, operation, envelope):
+        """ Return recorded exchange for request, or None. """
+
+        exchange = self.exchanges.get(get_key(operation, envelope))
+
+        if exchange is None and not self.strict:
+            exchanges = self._operations.get(operation)
+
+            if exchanges:
+                # Cycle through replies for operation
+                self._counter += 1
+                exchange = exchanges[self._counter % len(exchanges)]
+
+        return exchange
+
+    def send(self, request):
+        """ Reply from recording. """
+
+        start = time.time()
+
+        operation = self.get_operation(request)
+        exchange = self.get_exchange(operation, request.message)
+
+        if exchange is None:
+            raise suds.transport.TransportError(
+                'No recorded reply for %s.' % operation, 0, BytesIO(b'')
+            )
+
+        if self.latency:
+            time.sleep(random.choice(self._latencies[operation]))
+
+        self.last_exchange = (
+            start, time.time(), len(request.message), len(exchange.reply)
+        )
+
+        if exchange.content_type not in ('text/xml', 'application/soap+xml'):
+            if exchange.status >= 400:
+                # As raised by requests transport
+                raise suds.transport.TransportError(
+                    'Recorded error %d' % exchange.status, exchange.status,
+                    BytesIO(exchange.reply)
+                )
+
+        return suds.transport.Reply(
+            exchange.status, {'content-type': exchange.content_type},
+            exchange.reply
+        )
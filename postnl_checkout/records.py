@@ -0,0 +1,254 @@
+"""
+Compact records for results kept in memory in large numbers.
+
+Record classes are generated from the bundled XSD's, one per complex type
+in the replies, into `records_generated` by `postnl_checkout.codegen`.
+Records store their elements in `__slots__` rather than in a dictionary
+per object, and values of low-cardinality elements, such as country codes,
+are interned so all records share a single copy of each.
+
+Records offer attribute access to elements, returning None for elements
+absent from the reply, as well as read-only mapping access to the elements
+present, so they can be used in place of the dictionaries otherwise
+returned.
+"""
+
+from .compat import Mapping
+
+
+# Interned values; value -> value
+_interned = {}
+
+# Maximum number of values interned, guarding against elements turning out
+# to have many distinct values
+MAX_INTERNED = 10000
+
+
+def intern_value(value):
+    """ Return shared copy of (string) value. """
+
+    try:
+        return _interned[value]
+    except KeyError:
+        if len(_interned) < MAX_INTERNED:
+            _interned[value] = value
+
+        return value
+
+
+class Record(object):
+    """ Base class of generated records. """
+
+    # Elements not in the schema are kept by name in `_extra`
+    __slots__ = ('_extra', )
+
+    # Names of elements in schema order
+    _fields = ()
+
+    # Record classes of complex elements; name -> class
+    _children = {}
+
+    # Names of elements with interned values
+    _interned = frozenset()
+
+    __hash__ = None
+
+    def __init__(self, **kwargs):
+        self._extra = None
+
+        for key, value in kwargs.items():
+            self._set(key, value)
+
+    def __getattr__(self, name):
+        """ Return None for elements absent from the reply. """
+
+        if name in self._fields:
+            return None
+
+        raise AttributeError(name)
+
+    def _set(self, key, value):
+        """ Set element, keeping elements not in the schema separately. """
+
+        if key in self._fields:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+
+            self._extra[key] = value
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            try:
+                return object.__getattribute__(self, key)
+            except AttributeError:
+                raise KeyError(key)
+
+        if self._extra is not None:
+            return self._extra[key]
+
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+
+        return True
+
+    def __iter__(self):
+        for key in self._fields:
+            try:
+                object.__getattribute__(self, key)
+            except AttributeError:
+                continue
+
+            yield key
+
+        if self._extra is not None:
+            for key in self._extra:
+                yield key
+
+    def __len__(self):
+        return sum(1 for key in self)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def __eq__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+
+        return dict(self.items()) == dict(other.items())
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+
+        if result is NotImplemented:
+            return result
+
+        return not result
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, ', '.join(
+            '%s=%r' % item for item in self.items()
+        ))
+
+    def __getstate__(self):
+        return self.to_dict(deep=False)
+
+    def __setstate__(self, state):
+        self._extra = None
+
+        for key, value in state.items():
+            self._set(key, value)
+
+    def to_dict(self, deep=True):
+        """ Return dictionary of elements, by default converting records. """
+
+        result = dict(self.items())
+
+        if deep:
+            for key, value in result.items():
+                if isinstance(value, Record):
+                    result[key] = value.to_dict()
+                elif isinstance(value, list):
+                    result[key] = [
+                        item.to_dict() if isinstance(item, Record) else item
+                        for item in value
+                    ]
+
+        return result
+
+    # Used by the encoder of jsonfield, hence `Order` model fields
+    to_json = to_dict
+
+
+Mapping.register(Record)
+
+
+def get_record_class(type_name):
+    """ Return generated record class for a complex type, or None. """
+
+    from .records_generated import RECORD_CLASSES
+
+    return RECORD_CLASSES.get(type_name)
+
+
+def convert_to_records(obj, plan, record_class, get_items, to_dict, wrapper):
+    """
+    Convert a (suds) dict-ish object to records according to a converter
+    plan, as `PostNLCheckoutClient._convert_with_plan()` converts to
+    dictionaries. Elements not in the plan are converted by `to_dict`.
+    """
+
+    iterator = get_items(obj)
+    if iterator is None:
+        return wrapper('', obj)
+
+    out = record_class()
+
+    # Records to fill, with their items and plan
+    stack = [(out, iterator, plan)]
+    push = stack.append
+
+    def convert(key, value, node, record_class):
+        """ Convert value or schedule conversion of dict-ish value. """
+        if value is None:
+            return None
+
+        if not isinstance(node, dict):
+            # Leaf element; node is the converter
+            return node(value)
+
+        iterator = get_items(value)
+
+        if iterator is None:
+            # Unexpected value where complex type was expected
+            return wrapper(key, value)
+
+        child = record_class()
+        push((child, iterator, node))
+
+        return child
+
+    while stack:
+        target, iterator, plan = stack.pop()
+
+        children = target._children
+        interned = target._interned
+
+        for key, value in iterator:
+            node = plan.get(key)
+
+            if node is None:
+                # Not in schema, use wrapper
+                value = to_dict(value, wrapper, key)
+            elif isinstance(value, list):
+                value = [
+                    convert(key, item, node, children.get(key))
+                    for item in value
+                ]
+            else:
+                value = convert(key, value, node, children.get(key))
+
+                if key in interned and value is not None:
+                    value = intern_value(value)
+
+            target._set(key, value)
+
+    return out
@@ -0,0 +1,211 @@
+"""
+Record classes for the replies of the web service.
+
+Generated from the bundled XSD's by `python -m postnl_checkout.codegen`;
+do not edit.
+"""
+
+from .records import Record
+
+
+class ConfirmOrderResponseOrder(Record):
+    __slots__ = ('ExtRef',)
+    _fields = __slots__
+
+
+class ConfirmOrderResponseWebshop(Record):
+    __slots__ = ('IntRef',)
+    _fields = __slots__
+    _interned = frozenset(('IntRef',))
+
+
+class ConfirmOrderResponse(Record):
+    __slots__ = ('Order', 'Webshop')
+    _fields = __slots__
+    _children = {
+        'Order': ConfirmOrderResponseOrder,
+        'Webshop': ConfirmOrderResponseWebshop,
+    }
+
+
+class PingStatusResponse(Record):
+    __slots__ = ('Status',)
+    _fields = __slots__
+    _interned = frozenset(('Status',))
+
+
+class PrepareOrderResponseCheckout(Record):
+    __slots__ = ('OrderToken', 'Url')
+    _fields = __slots__
+
+
+class PrepareOrderResponseWebshop(Record):
+    __slots__ = ('IntRef',)
+    _fields = __slots__
+    _interned = frozenset(('IntRef',))
+
+
+class PrepareOrderResponse(Record):
+    __slots__ = ('Checkout', 'Webshop')
+    _fields = __slots__
+    _children = {
+        'Checkout': PrepareOrderResponseCheckout,
+        'Webshop': PrepareOrderResponseWebshop,
+    }
+
+
+class ReadOrderResponseBetaalMethode(Record):
+    __slots__ = ('Code', 'Optie', 'Prijs')
+    _fields = __slots__
+    _interned = frozenset(('Code', 'Optie'))
+
+
+class AdresType(Record):
+    __slots__ = (
+        'Achternaam', 'Afdeling', 'Bedrijf', 'Deurcode', 'Gebouw', 'Gebruik',
+        'Geslacht', 'Huisnummer', 'HuisnummerExt', 'Initialen', 'Land',
+        'Plaats', 'Postcode', 'Regio', 'Straat', 'Tussenvoegsel', 'Verdieping',
+        'Voornaam', 'Wijk'
+    )
+    _fields = __slots__
+    _interned = frozenset(('Gebruik', 'Geslacht', 'Land'))
+
+
+class ReadOrderResponseBezorging(Record):
+    __slots__ = ('Geadresseerde', 'ProductCode', 'ServicePunt')
+    _fields = __slots__
+    _children = {
+        'Geadresseerde': AdresType,
+        'ServicePunt': AdresType,
+    }
+    _interned = frozenset(('ProductCode',))
+
+
+class ReadOrderResponseCommunicatieOptie(Record):
+    __slots__ = ('Code', 'Text')
+    _fields = __slots__
+    _interned = frozenset(('Code',))
+
+
+class ArrayOfReadOrderResponseCommunicatieOptie(Record):
+    __slots__ = ('ReadOrderResponseCommunicatieOptie',)
+    _fields = __slots__
+    _children = {
+        'ReadOrderResponseCommunicatieOptie':
+            ReadOrderResponseCommunicatieOptie,
+    }
+
+
+class ReadOrderResponseConsument(Record):
+    __slots__ = ('Email', 'ExtRef', 'TelefoonNummer', 'GeboorteDatum')
+    _fields = __slots__
+
+
+class ReadOrderResponseFacturatie(Record):
+    __slots__ = ('Adres',)
+    _fields = __slots__
+    _children = {
+        'Adres': AdresType,
+    }
+
+
+class ReadOrderResponseOpties(Record):
+    __slots__ = ('Code', 'Prijs', 'Text')
+    _fields = __slots__
+    _interned = frozenset(('Code',))
+
+
+class ArrayOfReadOrderResponseOpties(Record):
+    __slots__ = ('ReadOrderResponseOpties',)
+    _fields = __slots__
+    _children = {
+        'ReadOrderResponseOpties': ReadOrderResponseOpties,
+    }
+
+
+class ReadOrderResponseOrder(Record):
+    __slots__ = ('ExtRef',)
+    _fields = __slots__
+
+
+class ReadOrderResponseVoorkeurenBezorgingTijdvak(Record):
+    __slots__ = ('Eind', 'Start')
+    _fields = __slots__
+    _interned = frozenset(('Eind', 'Start'))
+
+
+class ReadOrderResponseVoorkeurenBezorging(Record):
+    __slots__ = ('Datum', 'Tijdvak', 'VerzendDatum')
+    _fields = __slots__
+    _children = {
+        'Tijdvak': ReadOrderResponseVoorkeurenBezorgingTijdvak,
+    }
+
+
+class ReadOrderResponseVoorkeuren(Record):
+    __slots__ = ('Bezorging',)
+    _fields = __slots__
+    _children = {
+        'Bezorging': ReadOrderResponseVoorkeurenBezorging,
+    }
+
+
+class ReadOrderResponseWebshop(Record):
+    __slots__ = ('IntRef',)
+    _fields = __slots__
+    _interned = frozenset(('IntRef',))
+
+
+class ReadOrderResponse(Record):
+    __slots__ = (
+        'BetaalMethode', 'Bezorging', 'CommunicatieOpties', 'Consument',
+        'Facturatie', 'Opties', 'Order', 'Voorkeuren', 'Webshop'
+    )
+    _fields = __slots__
+    _children = {
+        'BetaalMethode': ReadOrderResponseBetaalMethode,
+        'Bezorging': ReadOrderResponseBezorging,
+        'CommunicatieOpties': ArrayOfReadOrderResponseCommunicatieOptie,
+        'Consument': ReadOrderResponseConsument,
+        'Facturatie': ReadOrderResponseFacturatie,
+        'Opties': ArrayOfReadOrderResponseOpties,
+        'Order': ReadOrderResponseOrder,
+        'Voorkeuren': ReadOrderResponseVoorkeuren,
+        'Webshop': ReadOrderResponseWebshop,
+    }
+
+
+class UpdateOrderResponse(Record):
+    __slots__ = ('Succes',)
+    _fields = __slots__
+    _interned = frozenset(('Succes',))
+
+
+RECORD_CLASSES = {
+    'AdresType': AdresType,
+    'ArrayOfReadOrderResponseCommunicatieOptie':
+        ArrayOfReadOrderResponseCommunicatieOptie,
+    'ArrayOfReadOrderResponseOpties': ArrayOfReadOrderResponseOpties,
+    'ConfirmOrderResponse': ConfirmOrderResponse,
+    'ConfirmOrderResponseOrder': ConfirmOrderResponseOrder,
+    'ConfirmOrderResponseWebshop': ConfirmOrderResponseWebshop,
+    'PingStatusResponse': PingStatusResponse,
+    'PrepareOrderResponse': PrepareOrderResponse,
+    'PrepareOrderResponseCheckout': PrepareOrderResponseCheckout,
+    'PrepareOrderResponseWebshop': PrepareOrderResponseWebshop,
+    'ReadOrderResponse': ReadOrderResponse,
+    'ReadOrderResponseBetaalMethode': ReadOrderResponseBetaalMethode,
+    'ReadOrderResponseBezorging': ReadOrderResponseBezorging,
+    'ReadOrderResponseCommunicatieOptie': ReadOrderResponseCommunicatieOptie,
+    'ReadOrderResponseConsument': ReadOrderResponseConsument,
+    'ReadOrderResponseFacturatie': ReadOrderResponseFacturatie,
+    'ReadOrderResponseOpties': ReadOrderResponseOpties,
+    'ReadOrderResponseOrder': ReadOrderResponseOrder,
+    'ReadOrderResponseVoorkeuren': ReadOrderResponseVoorkeuren,
+    'ReadOrderResponseVoorkeurenBezorging':
+        ReadOrderResponseVoorkeurenBezorging,
+    'ReadOrderResponseVoorkeurenBezorgingTijdvak':
+        ReadOrderResponseVoorkeurenBezorgingTijdvak,
+    'ReadOrderResponseWebshop': ReadOrderResponseWebshop,
+    'UpdateOrderResponse': UpdateOrderResponse,
+}
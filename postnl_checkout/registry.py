@@ -0,0 +1,132 @@
+"""
+Registry of clients for several webshops, each with its own credentials.
+
+Pools of clients are kept by (environment, username, webshop_id). Clients
+for the same environment are clones of a single client, sharing its parsed
+WSDL, connection pool and circuit breaker, so another webshop costs a few
+copies of suds' options rather than a parsed WSDL. Pools least recently
+used are evicted while the estimated memory of their clients exceeds the
+registry's cap.
+"""
+
+import collections
+import threading
+
+from contextlib import contextmanager
+
+from .pool import ClientPool
+
+
+class ClientRegistry(object):
+    """ Thread-safe LRU of ClientPool's by environment and webshop. """
+
+    # Estimated bytes taken by a clone; the parsed WSDL being shared, about
+    # 18 KB with suds
+    client_memory = 20 * 1024
+
+    def __init__(
+        self, factory, pool_size=10, pool_timeout=None,
+        max_memory=16 * 1024 * 1024
+    ):
+        """
+        Initialize registry of pools of at most `pool_size` clients, waiting
+        up to `pool_timeout` seconds for a client (see ClientPool).
+
+        `factory(environment)` returns the client those for the environment
+        are cloned from, which loads the WSDL and is kept for the lifetime
+        of the registry.
+        """
+
+        self.factory = factory
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.max_memory = max_memory
+
+        self._lock = threading.Lock()
+
+        # environment -> client
+        self._clients = {}
+
+        # (environment, username, webshop_id) -> pool, least recent first
+        self._pools = collections.OrderedDict()
+
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._pools)
+
+    def _get_memory(self):
+        """ Return estimated bytes taken by the pools' clients. """
+
+        # Pools keep the clone they are created with besides their clients
+        return sum(
+            (pool.stats()['created'] + 1) * self.client_memory
+            for pool in self._pools.values()
+        )
+
+    def _evict(self):
+        """ Remove pools least recently used while over the memory cap. """
+
+        while len(self._pools) > 1 and self._get_memory() > self.max_memory:
+            self._pools.popitem(last=False)
+            self._evictions += 1
+
+    def get_pool(self, environment, username, password, webshop_id):
+        """
+        Return pool of clients calling on behalf of webshop `webshop_id`,
+        creating it with the credentials unless present.
+
+        As pools are looked up by username, a changed password only takes
+        effect once the pool was removed or evicted.
+        """
+
+        key = (environment, username, webshop_id)
+
+        with self._lock:
+            pool = self._pools.pop(key, None)
+
+            if pool is None:
+                if environment not in self._clients:
+                    self._clients[environment] = self.factory(environment)
+
+                client = self._clients[environment].clone(
+                    username, password, webshop_id
+                )
+
+                pool = ClientPool(client, self.pool_size, self.pool_timeout)
+
+            # Most recently used
+            self._pools[key] = pool
+
+            self._evict()
+
+        return pool
+
+    @contextmanager
+    def get_client(
+        self, environment, username, password, webshop_id, timeout=-1
+    ):
+        """ Context manager checking out a client for the webshop. """
+
+        pool = self.get_pool(environment, username, password, webshop_id)
+
+        with pool.get_client(timeout) as client:
+            yield client
+
+    def remove(self, environment, username, webshop_id):
+        """ Remove pool for webshop, if any. """
+
+        with self._lock:
+            self._pools.pop((environment, username, webshop_id), None)
+
+    def stats(self):
+        """ Return dictionary with usage statistics. """
+
+        with self._lock:
+            return {
+                'environments': len(self._clients),
+                'pools': len(self._pools),
+                'memory': self._get_memory(),
+                'max_memory': self.max_memory,
+                'evictions': self._evictions
+            }
@@ -0,0 +1,152 @@
+"""
+Minimal model of the XSD's bundled with the package.
+
+Only the parts of XML Schema actually used by PostNL are supported: global
+elements, complex types consisting of a sequence of elements and simple
+types restricting a builtin type. Type references are resolved by local
+name, which are unique within the bundle.
+"""
+
+import os
+import glob
+import collections
+
+from .compat import ElementTree
+
+
+XSD_NAMESPACE = 'http://www.w3.org/2001/XMLSchema'
+
+# Prefix used for builtin types in the bundled XSD's
+XSD_PREFIX = 'xs'
+
+
+def _xsd(tag):
+    """ Return ElementTree tag name in the XSD namespace. """
+    return '{%s}%s' % (XSD_NAMESPACE, tag)
+
+
+def _local_name(qname):
+    """ Strip the prefix from a type reference. """
+    return qname.rsplit(':', 1)[-1]
+
+
+class SchemaElement(collections.namedtuple(
+    'SchemaElement', ('name', 'type', 'min_occurs', 'max_occurs')
+)):
+    """ Element within a complex type. """
+
+    __slots__ = ()
+
+    @property
+    def many(self):
+        """ Whether the element may occur more than once. """
+        return self.max_occurs != 1
+
+
+SimpleType = collections.namedtuple(
+    'SimpleType', ('name', 'base', 'enumeration', 'max_length')
+)
+
+
+class Schema(object):
+    """
+    Types and global elements parsed from a directory of XSD files.
+
+    Builtin types are represented with their prefix, i.e. `xs:string`.
+    """
+
+    def __init__(self, directory):
+        # Global elements; name -> type name
+        self.elements = {}
+
+        # Complex types; name -> list of SchemaElement's
+        self.complex_types = {}
+
+        # Simple types; name -> SimpleType
+        self.simple_types = {}
+
+        for filename in sorted(glob.glob(os.path.join(directory, '*.xsd'))):
+            self._parse(filename)
+
+    def _get_type(self, qname):
+        """ Return builtin type with prefix or local name of declared type. """
+
+        if qname.startswith(XSD_PREFIX + ':'):
+            return qname
+
+        return _local_name(qname)
+
+    def _parse(self, filename):
+        """ Add declarations from XSD file. """
+
+        root = ElementTree.parse(filename).getroot()
+
+        for node in root:
+            name = node.get('name')
+
+            if node.tag == _xsd('element'):
+                self.elements[name] = self._get_type(node.get('type'))
+
+            elif node.tag == _xsd('complexType'):
+                self.complex_types[name] = [
+                    self._get_element(child)
+                    for child in node.iter(_xsd('element'))
+                ]
+
+            elif node.tag == _xsd('simpleType'):
+                restriction = node.find(_xsd('restriction'))
+                max_length = restriction.find(_xsd('maxLength'))
+
+                self.simple_types[name] = SimpleType(
+                    name=name,
+                    base=self._get_type(restriction.get('base')),
+                    enumeration=tuple(
+                        enum.get('value') for enum in
+                        restriction.findall(_xsd('enumeration'))
+                    ),
+                    max_length=(
+                        int(max_length.get('value'))
+                        if max_length is not None else None
+                    )
+                )
+
+    def _get_element(self, node):
+        """ Return SchemaElement for element node within complex type. """
+
+        max_occurs = node.get('maxOccurs', '1')
+
+        return SchemaElement(
+            name=node.get('name'),
+            type=self._get_type(node.get('type')),
+            min_occurs=int(node.get('minOccurs', 1)),
+            max_occurs=None if max_occurs == 'unbounded' else int(max_occurs)
+        )
+
+    def is_complex(self, type_name):
+        """ Whether type_name refers to a complex type. """
+        return type_name in self.complex_types
+
+    def get_builtin(self, type_name):
+        """ Return builtin (base) type for a simple type. """
+
+        if type_name in self.simple_types:
+            return self.simple_types[type_name].base
+
+        return type_name
+
+    def get_children(self, element_name):
+        """ Return child elements of the given global element. """
+
+        return self.complex_types[self.elements[element_name]]
+
+
+_schemas = {}
+
+
+def get_schema(directory):
+    """ Return (cached) Schema for directory of XSD files. """
+
+    if directory not in _schemas:
+        _schemas[directory] = Schema(directory)
+
+    return _schemas[directory]
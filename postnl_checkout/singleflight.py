@@ -0,0 +1,118 @@
+"""
+Coalescing of concurrent identical calls, so that threads making a call
+already in flight wait for its result instead of repeating the request.
+
+Used by the client for idempotent operations, with the operation and its
+arguments as key.
+"""
+
+import hashlib
+import threading
+
+from .compat import text_type
+
+
+def freeze(value):
+    """
+    Return hashable, canonical version of (nested) dictionaries and lists
+    of arguments.
+    """
+
+    if isinstance(value, dict):
+        return tuple(sorted(
+            (key, freeze(item)) for key, item in value.items()
+        ))
+
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+
+    return value
+
+
+def make_key(operation, kwargs):
+    """ Return key for a call of operation with arguments. """
+    return (operation, freeze(kwargs))
+
+
+def get_key_digest(key):
+    """ Return hex digest of key, for use across processes. """
+    return hashlib.sha1(text_type(repr(key)).encode('utf-8')).hexdigest()
+
+
+class _Call(object):
+    """ Call in flight, with its outcome once finished. """
+
+    __slots__ = ('finished', 'result', 'exception')
+
+    def __init__(self):
+        self.finished = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight(object):
+    """
+    Thread-safe coalescing of calls by key, shared by clones of a client.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        # Calls in flight; key -> _Call
+        self._calls = {}
+
+        # Calls made and calls answered with the result of another
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key, function):
+        """
+        Return (result, shared) of calling function, or of the call in
+        flight for key, in which case shared is True. Exceptions are
+        raised to all callers.
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+
+                self.calls += 1
+            else:
+                leader = False
+
+                self.coalesced += 1
+
+        if not leader:
+            call.finished.wait()
+
+            if call.exception is not None:
+                raise call.exception
+
+            return call.result, True
+
+        try:
+            call.result, shared = self._call(key, function)
+        except Exception as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call.finished.set()
+
+        return call.result, shared
+
+    def _call(self, key, function):
+        """ Return (result, shared) of calling function for key. """
+        return function(), False
+
+    def stats(self):
+        """ Return dictionary of calls made and calls coalesced. """
+
+        with self._lock:
+            return {'calls': self.calls, 'coalesced': self.coalesced}
+
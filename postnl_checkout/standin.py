@@ -0,0 +1,560 @@
+"""
+Stand-in for the PostNL WebshopCheckoutService, to benchmark connection
+pooling, retries and concurrent clients locally under realistic conditions.
+
+`StandinApp` is a WSGI application serving the bundled WSDL and XSD's and
+answering all operations with replies generated from the request, with
+knobs for latency, transient errors, CifException faults and replies
+dripping in slowly. `StandinServer` runs it on a threaded HTTP/1.1 server
+keeping connections alive, as PostNL does. From the command line::
+
+    python -m postnl_checkout.standin --port 8000 --latency 0.05
+
+Order tokens starting with 'unknown' always get an 'Unknown order token.'
+fault.
+"""
+
+import argparse
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+
+from xml.sax.saxutils import escape
+
+from .compat import PY2, BytesIO, ElementTree
+
+# Not in compat, to keep the HTTP server out of the client's imports
+if PY2:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+else:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+
+WSDL_DIR = os.path.join(os.path.dirname(__file__), 'wsdl', '2_2')
+WSDL_FILE = 'WebshopCheckoutWebService_1.wsdl'
+
+SERVICE_PATH = (
+    '/CIF_SB/WebshopCheckoutWebService/2_2/WebshopCheckoutService.svc'
+)
+
+OPERATIONS = (
+    'PrepareOrder', 'ReadOrder', 'ConfirmOrder', 'UpdateOrder', 'PingStatus'
+)
+
+_SOAP_ADDRESS = re.compile(br'(<soap:address location=")[^"]*(")')
+
+ENVELOPE = (
+    u'<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" '
+    u'xmlns:tpp="http://schemas.datacontract.org/2004/07/'
+    u'Tpp.Cif.Services.Domain.WebshopCheckoutWebService" '
+    u'xmlns:web="http://postnl.nl/cif/services/WebshopCheckoutWebService/">'
+    u'<s:Header/><s:Body>%s</s:Body></s:Envelope>'
+)
+
+REPLIES = {
+    'PrepareOrder': (
+        u'<web:PrepareOrderResponse>'
+        u'<tpp:Checkout>'
+        u'<tpp:OrderToken>%(token)s</tpp:OrderToken>'
+        u'<tpp:Url>%(url)sOrders/OrderCheckout?token=%(token)s</tpp:Url>'
+        u'</tpp:Checkout>'
+        u'<tpp:Webshop><tpp:IntRef>%(webshop)s</tpp:IntRef></tpp:Webshop>'
+        u'</web:PrepareOrderResponse>'
+    ),
+    'ReadOrder': (
+        u'<web:ReadOrderResponse>'
+        u'<tpp:BetaalMethode>'
+        u'<tpp:Code>IDEAL</tpp:Code><tpp:Optie>0021</tpp:Optie>'
+        u'<tpp:Prijs>0.00</tpp:Prijs>'
+        u'</tpp:BetaalMethode>'
+        u'<tpp:Bezorging><tpp:Geadresseerde>'
+        u'<tpp:Achternaam>Janssen</tpp:Achternaam><tpp:Afdeling/>'
+        u'<tpp:Bedrijf>E-ID</tpp:Bedrijf><tpp:Gebruik>Z</tpp:Gebruik>'
+        u'<tpp:Geslacht>Meneer</tpp:Geslacht>'
+        u'<tpp:Huisnummer>1</tpp:Huisnummer><tpp:HuisnummerExt/>'
+        u'<tpp:Initialen>J</tpp:Initialen><tpp:Land>NL</tpp:Land>'
+        u'<tpp:Plaats>Vianen</tpp:Plaats><tpp:Postcode>4131LV</tpp:Postcode>'
+        u'<tpp:Straat>Lage Biezenweg</tpp:Straat>'
+        u'<tpp:Voornaam>Jan</tpp:Voornaam>'
+        u'</tpp:Geadresseerde></tpp:Bezorging>'
+        u'<tpp:CommunicatieOpties>'
+        u'<tpp:ReadOrderResponseCommunicatieOptie>'
+        u'<tpp:Code>REMARK</tpp:Code>'
+        u'<tpp:Text>Do not deliver to neighbours</tpp:Text>'
+        u'</tpp:ReadOrderResponseCommunicatieOptie>'
+        u'</tpp:CommunicatieOpties>'
+        u'<tpp:Consument>'
+        u'<tpp:ExtRef>jjansen</tpp:ExtRef>'
+        u'<tpp:Email>j.jansen@e-id.nl</tpp:Email>'
+        u'<tpp:TelefoonNummer>06-12345678</tpp:TelefoonNummer>'
+        u'<tpp:GeboorteDatum>15-06-1977 00:00:00</tpp:GeboorteDatum>'
+        u'</tpp:Consument>'
+        u'<tpp:Facturatie><tpp:Adres>'
+        u'<tpp:Achternaam>Jansen</tpp:Achternaam>'
+        u'<tpp:Gebruik>P</tpp:Gebruik><tpp:Geslacht>Meneer</tpp:Geslacht>'
+        u'<tpp:Huisnummer>1</tpp:Huisnummer>'
+        u'<tpp:Initialen>J</tpp:Initialen><tpp:Land>NL</tpp:Land>'
+        u'<tpp:Plaats>Vianen</tpp:Plaats><tpp:Postcode>4131LV</tpp:Postcode>'
+        u'<tpp:Straat>Lage Biezenweg</tpp:Straat>'
+        u'<tpp:Voornaam>Jan</tpp:Voornaam>'
+        u'</tpp:Adres></tpp:Facturatie>'
+        u'<tpp:Opties><tpp:ReadOrderResponseOpties>'
+        u'<tpp:Code>CARD</tpp:Code><tpp:Prijs>2.00</tpp:Prijs>'
+        u'<tpp:Text>Congratulations with your new foobar!</tpp:Text>'
+        u'</tpp:ReadOrderResponseOpties></tpp:Opties>'
+        u'<tpp:Order><tpp:ExtRef>%(order)s</tpp:ExtRef></tpp:Order>'
+        u'<tpp:Voorkeuren><tpp:Bezorging>'
+        u'<tpp:Datum>26-04-2012 00:00:00</tpp:Datum>'
+        u'<tpp:Tijdvak><tpp:Eind>10:30</tpp:Eind>'
+        u'<tpp:Start>08:30</tpp:Start></tpp:Tijdvak>'
+        u'</tpp:Bezorging></tpp:Voorkeuren>'
+        u'<tpp:Webshop><tpp:IntRef>%(webshop)s</tpp:IntRef></tpp:Webshop>'
+        u'</web:ReadOrderResponse>'
+    ),
+    'ConfirmOrder': (
+        u'<web:ConfirmOrderResponse>'
+        u'<tpp:Order><tpp:ExtRef>%(order)s</tpp:ExtRef></tpp:Order>'
+        u'<tpp:Webshop><tpp:IntRef>%(webshop)s</tpp:IntRef></tpp:Webshop>'
+        u'</web:ConfirmOrderResponse>'
+    ),
+    'UpdateOrder': (
+        u'<web:UpdateOrderResponse>'
+        u'<tpp:Succes>true</tpp:Succes>'
+        u'</web:UpdateOrderResponse>'
+    ),
+    'PingStatus': (
+        u'<web:PingStatusResponse>'
+        u'<tpp:Status>OK</tpp:Status>'
+        u'</web:PingStatusResponse>'
+    ),
+}
+
+FAULT = (
+    u'<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">'
+    u'<s:Body><s:Fault>'
+    u'<faultcode>s:Client</faultcode>'
+    u'<faultstring xml:lang="en-US">'
+    u'Check CifException in the detail section</faultstring>'
+    u'<detail><CifException xmlns="http://schemas.datacontract.org/2004/07/'
+    u'Tpp.Cif.WebServices.WebServices" '
+    u'xmlns:i="http://www.w3.org/2001/XMLSchema-instance">'
+    u'<Errors xmlns:a="http://schemas.datacontract.org/2004/07/'
+    u'Tpp.Cif.Services.Services.Exception">'
+    u'<a:ExceptionData><a:Description i:nil="true"/>'
+    u'<a:ErrorMsg>%(message)s</a:ErrorMsg>'
+    u'<a:ErrorNumber>%(number)d</a:ErrorNumber>'
+    u'</a:ExceptionData></Errors></CifException></detail>'
+    u'</s:Fault></s:Body></s:Envelope>'
+)
+
+
+def lognormal(median, sigma):
+    """
+    Return latency distribution, log-normal around median seconds with
+    shape sigma; realistic for web service latencies.
+    """
+
+    mu = math.log(median)
+
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def uniform(low, high):
+    """ Return latency distribution, uniform between low and high seconds. """
+    return lambda rng: rng.uniform(low, high)
+
+
+def _local_name(tag):
+    """ Return tag without namespace. """
+    return tag.rsplit('}', 1)[-1]
+
+
+def get_request_values(body):
+    """
+    Return dictionary of leaf values in request body by path of local names
+    below the operation element, i.e. 'Checkout/OrderToken'.
+    """
+
+    values = {}
+
+    root = ElementTree.fromstring(body)
+
+    for element in root:
+        if _local_name(element.tag) != 'Body':
+            continue
+
+        stack = [
+            (child, '') for operation in element for child in operation
+        ]
+
+        while stack:
+            element, prefix = stack.pop()
+            path = prefix + _local_name(element.tag)
+
+            if len(element):
+                stack.extend((child, path + '/') for child in element)
+            else:
+                values.setdefault(path, element.text or '')
+
+    return values
+
+
+class StandinApp(object):
+    """ WSGI application standing in for the web service. """
+
+    def __init__(
+        self, latency=0, error_rate=0, fault_rate=0, drip_interval=0,
+        drip_size=512, seed=None
+    ):
+        """
+        Replies are delayed by `latency`; seconds, or a distribution such
+        as returned by `lognormal()`. A fraction `error_rate` of requests
+        gets a 503 error and a fraction `fault_rate` a CifException fault.
+
+        With `drip_interval` set, replies are sent in chunks of `drip_size`
+        bytes, waiting `drip_interval` seconds before each chunk.
+        """
+
+        self.latency = latency
+        self.error_rate = error_rate
+        self.fault_rate = fault_rate
+        self.drip_interval = drip_interval
+        self.drip_size = drip_size
+
+        self.random = random.Random(seed)
+
+        self._lock = threading.Lock()
+
+        # Requests by (operation, outcome)
+        self.stats = {}
+
+        self._documents = {}
+
+    def _count(self, operation, outcome):
+        with self._lock:
+            key = (operation, outcome)
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def get_latency(self):
+        """ Return seconds to delay the next reply. """
+
+        if callable(self.latency):
+            return max(0, self.latency(self.random))
+
+        return self.latency
+
+    def get_document(self, filename, location):
+        """
+        Return contents of bundled WSDL or XSD, with service location in
+        the WSDL set to location; None for unknown documents.
+        """
+
+        if filename not in self._documents:
+            path = os.path.join(WSDL_DIR, filename)
+
+            if not filename or not os.path.isfile(path):
+                return None
+
+            with open(path, 'rb') as f:
+                self._documents[filename] = f.read()
+
+        document = self._documents[filename]
+
+        if filename == WSDL_FILE:
+            document = _SOAP_ADDRESS.sub(
+                br'\g<1>' + location.encode('ascii') + br'\g<2>', document
+            )
+
+        return document
+
+    def get_reply(self, operation, values, url):
+        """ Return (status, reply) for operation with request values. """
+
+        token = values.get('Checkout/OrderToken', '')
+
+        if token.startswith('unknown'):
+            return 500, FAULT % {
+                'message': 'Unknown order token.', 'number': 8
+            }
+
+        if self.fault_rate and self.random.random() < self.fault_rate:
+            return 500, FAULT % {
+                'message': 'Fault injected by stand-in.', 'number': 1
+            }
+
+        if operation == 'PrepareOrder':
+            token = str(uuid.uuid4())
+
+        reply = REPLIES[operation] % {
+            'token': escape(token),
+            'url': escape(url),
+            'order': escape(
+                values.get('Order/ExtRef') or 'STANDIN-%s' % token[:8]
+            ),
+            'webshop': escape(values.get('Webshop/IntRef', ''))
+        }
+
+        return 200, ENVELOPE % reply
+
+    def _drip(self, reply):
+        """ Generate reply in chunks, waiting before each. """
+
+        for offset in range(0, len(reply), self.drip_size):
+            time.sleep(self.drip_interval)
+            yield reply[offset:offset + self.drip_size]
+
+    def __call__(self, environ, start_response):
+        url = '%s://%s/' % (
+            environ.get('wsgi.url_scheme', 'http'),
+            environ.get('HTTP_HOST') or '%s:%s' % (
+                environ['SERVER_NAME'], environ['SERVER_PORT']
+            )
+        )
+
+        if environ['REQUEST_METHOD'] == 'GET':
+            path = environ.get('PATH_INFO', '')
+
+            if 'wsdl' in environ.get('QUERY_STRING', '').lower():
+                filename = WSDL_FILE
+            else:
+                filename = path.rsplit('/', 1)[-1]
+
+            document = self.get_document(
+                filename, url.rstrip('/') + (path or SERVICE_PATH)
+            )
+
+            if document is None:
+                start_response('404 Not Found', [
+                    ('Content-Type', 'text/plain'), ('Content-Length', '9')
+                ])
+                return [b'Not found']
+
+            start_response('200 OK', [
+                ('Content-Type', 'text/xml'),
+                ('Content-Length', str(len(document)))
+            ])
+            return [document]
+
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+        body = environ['wsgi.input'].read(length)
+
+        operation = environ.get('HTTP_SOAPACTION', '').strip('"').rsplit(
+            '/', 1
+        )[-1]
+
+        if operation not in OPERATIONS:
+            self._count(operation, 'invalid')
+
+            start_response('400 Bad Request', [
+                ('Content-Type', 'text/plain'), ('Content-Length', '11')
+            ])
+            return [b'Bad request']
+
+        latency = self.get_latency()
+        if latency:
+            time.sleep(latency)
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            self._count(operation, 'error')
+
+            start_response('503 Service Unavailable', [
+                ('Content-Type', 'text/html'), ('Content-Length', '19')
+            ])
+            return [b'Service Unavailable']
+
+        status, reply = self.get_reply(
+            operation, get_request_values(body), url
+        )
+        reply = reply.encode('utf-8')
+
+        self._count(operation, 'success' if status == 200 else 'fault')
+
+        start_response(
+            '200 OK' if status == 200 else '500 Internal Server Error', [
+                ('Content-Type', 'text/xml'),
+                ('Content-Length', str(len(reply)))
+            ]
+        )
+
+        if self.drip_interval:
+            return self._drip(reply)
+
+        return [reply]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """ HTTP/1.1 handler passing requests to the server's WSGI app. """
+
+    protocol_version = 'HTTP/1.1'
+
+    # Send headers and body at once, flushing explicitly
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.handle_wsgi()
+
+    do_POST = do_GET
+
+    def handle_wsgi(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+
+        path, _, query = self.path.partition('?')
+
+        environ = {
+            'REQUEST_METHOD': self.command,
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'CONTENT_LENGTH': str(length),
+            'CONTENT_TYPE': self.headers.get('Content-Type', ''),
+            'SERVER_NAME': self.server.server_address[0],
+            'SERVER_PORT': str(self.server.server_address[1]),
+            'SERVER_PROTOCOL': self.request_version,
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+
+        for name, value in self.headers.items():
+            environ['HTTP_' + name.upper().replace('-', '_')] = value
+
+        response = []
+
+        def start_response(status, headers, exc_info=None):
+            response[:] = [status, headers]
+
+        result = self.server.app(environ, start_response)
+
+        try:
+            status, headers = response
+            code, reason = status.split(' ', 1)
+
+            self.send_response(int(code), reason)
+            for header in headers:
+                self.send_header(*header)
+            self.end_headers()
+
+            for chunk in result:
+                self.wfile.write(chunk)
+                self.wfile.flush()
+
+            self.wfile.flush()
+
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+    def log_message(self, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, *args)
+
+
+class StandinServer(ThreadingMixIn, HTTPServer):
+    """
+    Threaded server for a WSGI application, by default a StandinApp. The
+    service is at `location`, its WSDL at `location + '?wsdl'`.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, app=None, host='127.0.0.1', port=0, verbose=False):
+        HTTPServer.__init__(self, (host, port), _Handler)
+
+        self.app = app or StandinApp()
+        self.verbose = verbose
+
+        self.url = 'http://%s:%d/' % self.server_address[:2]
+        self.location = self.url.rstrip('/') + SERVICE_PATH
+
+    def start(self):
+        """ Serve from a daemon thread, returning the server. """
+
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        return self
+
+    def stop(self):
+        """ Stop serving and close the socket. """
+
+        self.shutdown()
+        self.server_close()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Stand-in for the PostNL WebshopCheckoutService.'
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument(
+        '--latency', type=float, default=0,
+        help='median seconds before replying'
+    )
+    parser.add_argument(
+        '--jitter', type=float, default=0,
+        help='sigma of log-normal latency distribution'
+    )
+    parser.add_argument(
+        '--error-rate', type=float, default=0,
+        help='fraction of requests answered with a 503 error'
+    )
+    parser.add_argument(
+        '--fault-rate', type=float, default=0,
+        help='fraction of requests answered with a CifException fault'
+    )
+    parser.add_argument(
+        '--drip-interval', type=float, default=0,
+        help='seconds between chunks of the reply'
+    )
+    parser.add_argument('--drip-size', type=int, default=512)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--verbose', action='store_true')
+
+    options = parser.parse_args(args)
+
+    if options.latency and options.jitter:
+        latency = lognormal(options.latency, options.jitter)
+    else:
+        latency = options.latency
+
+    app = StandinApp(
+        latency=latency,
+        error_rate=options.error_rate,
+        fault_rate=options.fault_rate,
+        drip_interval=options.drip_interval,
+        drip_size=options.drip_size,
+        seed=options.seed
+    )
+
+    server = StandinServer(
+        app, options.host, options.port, verbose=options.verbose
+    )
+
+    print('Serving PostNL stand-in at %s' % server.location)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
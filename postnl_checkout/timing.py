@@ -0,0 +1,108 @@
+"""
+Per-phase timing of API calls, as passed to hooks registered with
+`PostNLCheckoutClient.add_timing_hook()`.
+
+Phases, in seconds:
+
+* `convert`: conversion of arguments from and results to Pythonic formats
+* `serialize`: rendering or marshalling the request envelope
+* `network`: HTTP round trips, as measured by the transport
+* `parse`: parsing the reply; with the fast parser this includes conversion
+* `backoff`: waiting before retries
+"""
+
+import time
+
+
+PHASES = ('convert', 'serialize', 'network', 'parse', 'backoff')
+
+
+class CallTiming(object):
+    """ Timings, sizes and outcome of a single API call. """
+
+    __slots__ = (
+        'operation', 'phases', 'request_size', 'response_size', 'attempts',
+        'outcome', 'exception', 'start', 'end', '_last'
+    )
+
+    SUCCESS = 'success'
+
+    # PostNLRequestException, the service replied with a fault
+    FAULT = 'fault'
+
+    # Any other exception
+    ERROR = 'error'
+
+    def __init__(self, operation):
+        self.operation = operation
+        self.phases = dict.fromkeys(PHASES, 0.0)
+
+        # Bytes of the last request and reply, when sent or received
+        self.request_size = None
+        self.response_size = None
+
+        self.attempts = 0
+
+        self.outcome = None
+        self.exception = None
+
+        self.start = self._last = time.time()
+        self.end = None
+
+    def __repr__(self):
+        return '<CallTiming %s %s %.1f ms>' % (
+            self.operation, self.outcome, self.total * 1e3
+        )
+
+    @property
+    def total(self):
+        """ Seconds from start to end of the call. """
+        return (self.end or time.time()) - self.start
+
+    def mark(self, phase):
+        """ Attribute time since the previous mark to phase. """
+
+        now = time.time()
+
+        self.phases[phase] += now - self._last
+        self._last = now
+
+    def exchange(self, exchange):
+        """
+        Attribute time up to the start of an exchange recorded by the
+        transport to serialization and the exchange itself to the network.
+        """
+
+        if exchange is None:
+            return
+
+        start, end, request_size, response_size = exchange
+
+        self.phases['serialize'] += start - self._last
+        self.phases['network'] += end - start
+        self._last = end
+
+        self.request_size = request_size
+        self.response_size = response_size
+
+    def finish(self, outcome, exception=None):
+        """ Record outcome and end of the call. """
+
+        self.end = time.time()
+        self.outcome = outcome
+        self.exception = exception
+
+    def as_dict(self):
+        """ Return dictionary of timings, sizes and outcome. """
+
+        result = dict(self.phases)
+        result.update({
+            'operation': self.operation,
+            'outcome': self.outcome,
+            'total': self.total,
+            'attempts': self.attempts,
+            'request_size': self.request_size,
+            'response_size': self.response_size
+        })
+
+        return result
@@ -0,0 +1,118 @@
+import time
+
+import suds.transport
+import suds_requests
+
+from .compat import BytesIO, url2pathname, urlparse
+
+
+# Default (connect, read) timeout in seconds
+DEFAULT_TIMEOUT = (3.05, 30)
+
+
+class PostNLTransport(suds_requests.RequestsTransport):
+    """
+    Requests based suds transport, which additionally opens documents from
+    local `file://` URL's, as used for the bundled WSDL.
+
+    Requests are sent with the timeout for their operation, as determined
+    from the SOAPAction header. Timeouts are either a number of seconds or
+    a (connect, read) tuple, as accepted by requests.
+
+    The last request sent is recorded as `last_exchange`; a tuple of start
+    and end time, request size and reply size (None when failed).
+    """
+
+    def __init__(
+        self, session=None, timeout=DEFAULT_TIMEOUT, operation_timeouts=None
+    ):
+        suds_requests.RequestsTransport.__init__(self, session)
+
+        # Default timeout
+        self.timeout = timeout
+
+        # Timeouts by operation name
+        self.operation_timeouts = operation_timeouts or {}
+
+        self.last_exchange = None
+
+    def __deepcopy__(self, memo):
+        """
+        Copy timeouts, sharing the session and thereby its connection pool;
+        as done by suds when cloning clients.
+        """
+
+        return self.__class__(
+            self._session, self.timeout, dict(self.operation_timeouts)
+        )
+
+    @classmethod
+    def get_operation(cls, request):
+        """ Return operation name from SOAPAction header of request. """
+
+        action = request.headers.get('SOAPAction')
+
+        if not action:
+            return None
+
+        if isinstance(action, bytes):
+            # As set by suds-community
+            action = action.decode('ascii')
+
+        return action.strip('"').rsplit('/', 1)[-1]
+
+    def get_timeout(self, operation):
+        """ Return timeout for operation. """
+
+        return self.operation_timeouts.get(operation, self.timeout)
+
+    def open(self, request):
+        """ Open local files directly, delegate others to requests. """
+
+        url = urlparse(request.url)
+
+        if url.scheme == 'file':
+            return open(url2pathname(url.path), 'rb')
+
+        return self._get(request)
+
+    @suds_requests.handle_errors
+    def _get(self, request):
+        """ Fetch document with the default timeout. """
+
+        resp = self._session.get(request.url, timeout=self.timeout)
+        resp.raise_for_status()
+
+        return BytesIO(resp.content)
+
+    @suds_requests.handle_errors
+    def send(self, request):
+        """ Send request with the timeout for its operation. """
+
+        start = time.time()
+
+        try:
+            resp = self._session.post(
+                request.url,
+                data=request.message,
+                headers=request.headers,
+                timeout=self.get_timeout(self.get_operation(request))
+            )
+        except:
+            self.last_exchange = (
+                start, time.time(), len(request.message), None
+            )
+            raise
+
+        self.last_exchange = (
+            start, time.time(), len(request.message), len(resp.content)
+        )
+
+        if resp.headers.get('content-type') not in (
+            'text/xml', 'application/soap+xml'
+        ):
+            resp.raise_for_status()
+
+        return suds.transport.Reply(
+            resp.status_code, resp.headers, resp.content
+        )
@@ -0,0 +1,251 @@
+"""
+Validation of request arguments against the bundled XSD's.
+
+Validators are compiled once per operation from the schema of its input
+message, and check required elements, the shape of values (dictionaries
+for complex elements, lists only for repeated elements), maximum lengths
+and enumerations. Invalid arguments raise `PostNLRequestException` naming
+the offending element, before anything is sent.
+
+Elements not in the schema are refused, except for arguments at the top
+level, which suds ignores. Values of complex elements other than
+dictionaries, i.e. suds objects, are left to suds.
+"""
+
+import datetime
+import numbers
+
+from .compat import string_types, text_type
+from .exceptions import PostNLRequestException
+
+
+# Values of leaf elements
+SCALAR_TYPES = string_types + (numbers.Number, datetime.date)
+
+
+class _Node(object):
+    """ Compiled element within the input message. """
+
+    __slots__ = (
+        'name', 'many', 'children', 'required', 'enumeration', 'max_length',
+        'restricted'
+    )
+
+    def __init__(self, name, many, children=None, required=(),
+                 enumeration=None, max_length=None):
+        self.name = name
+        self.many = many
+
+        # Child nodes by name, or None for leaves
+        self.children = children
+
+        # Names of required children
+        self.required = required
+
+        # Restrictions of leaves
+        self.enumeration = enumeration
+        self.max_length = max_length
+
+        self.restricted = enumeration is not None or max_length is not None
+
+
+class _Invalid(Exception):
+    """
+    Raised for an invalid value, collecting the path of the element while
+    propagating, so paths are only built for invalid arguments.
+    """
+
+    def __init__(self, message, name=None):
+        super(_Invalid, self).__init__(message)
+
+        # Names from the element up
+        self.path = [name] if name else []
+        self.message = message
+
+    def get_path(self):
+        """ Return dotted path of the element, with indexes of items. """
+
+        return ''.join(
+            name if name.startswith('[') else '.' + name
+            for name in reversed(self.path)
+        )[1:]
+
+
+class RequestValidator(object):
+    """ Validator of the arguments for a single operation. """
+
+    def __init__(self, schema, operation, required=()):
+        """
+        Compile validator for operation from schema, requiring elements
+        with a minimal occurrence as well as the dotted paths in required,
+        i.e. `Checkout.OrderToken`.
+        """
+
+        self.operation = operation
+
+        if operation in schema.elements:
+            self.root = self._compile(
+                schema, operation, False, schema.get_children(operation),
+                required
+            )
+        else:
+            # Operation without input message
+            self.root = None
+
+    def _compile(self, schema, name, many, children, required):
+        """ Return _Node for complex element name with its children. """
+
+        # Paths within required children, by name of the child
+        paths = {}
+        for path in required:
+            head, _, tail = path.partition('.')
+            paths.setdefault(head, [])
+
+            if tail:
+                paths[head].append(tail)
+
+        names = set(paths)
+
+        nodes = {}
+
+        for child in children:
+            child_paths = paths.pop(child.name, ())
+
+            if child.min_occurs:
+                names.add(child.name)
+
+            if schema.is_complex(child.type):
+                nodes[child.name] = self._compile(
+                    schema, child.name, child.many,
+                    schema.complex_types[child.type], child_paths
+                )
+                continue
+
+            if child_paths:
+                raise ValueError('Element %s has no children.' % child.name)
+
+            simple_type = schema.simple_types.get(child.type)
+
+            if simple_type is None:
+                # Builtin type
+                nodes[child.name] = _Node(child.name, child.many)
+            else:
+                nodes[child.name] = _Node(
+                    child.name, child.many,
+                    enumeration=frozenset(simple_type.enumeration) or None,
+                    max_length=simple_type.max_length
+                )
+
+        if paths:
+            raise ValueError(
+                'Required elements not in schema: %s' % ', '.join(
+                    sorted(paths)
+                )
+            )
+
+        return _Node(name, many, nodes, tuple(sorted(names)))
+
+    def _validate(self, node, values, top=False):
+        """
+        Validate dictionary of values for complex node, ignoring unknown
+        elements at the top level.
+        """
+
+        for name in node.required:
+            if values.get(name) is None:
+                raise _Invalid('is required.', name)
+
+        children = node.children
+
+        for name, value in values.items():
+            if value is None:
+                continue
+
+            child = children.get(name)
+
+            if child is None:
+                if top:
+                    # Arguments outside the schema are ignored by suds
+                    continue
+
+                raise _Invalid('is not in the schema.', name)
+
+            if child.children is None and not isinstance(value, (dict, list)):
+                # Plain leaf value, the common case
+                if child.restricted:
+                    try:
+                        self._validate_restrictions(child, value)
+                    except _Invalid as e:
+                        e.path.append(name)
+                        raise
+
+                continue
+
+            try:
+                if isinstance(value, list):
+                    if not child.many:
+                        raise _Invalid('occurs at most once.')
+
+                    for index, item in enumerate(value):
+                        try:
+                            self._validate_value(child, item)
+                        except _Invalid as e:
+                            e.path.append('[%d]' % index)
+                            raise
+                else:
+                    self._validate_value(child, value)
+
+            except _Invalid as e:
+                e.path.append(name)
+                raise
+
+    def _validate_value(self, node, value):
+        """ Validate single value for node. """
+
+        if node.children is not None:
+            if isinstance(value, dict):
+                self._validate(node, value)
+
+            elif isinstance(value, SCALAR_TYPES + (list, )):
+                raise _Invalid('should be a dictionary.')
+
+            return
+
+        if isinstance(value, (dict, list)):
+            raise _Invalid('should be a single value.')
+
+        if node.restricted:
+            self._validate_restrictions(node, value)
+
+    def _validate_restrictions(self, node, value):
+        """ Validate leaf value against enumeration and maximum length. """
+
+        if node.enumeration is not None:
+            if text_type(value) not in node.enumeration:
+                raise _Invalid('should be one of %s.' % ', '.join(
+                    sorted(node.enumeration)
+                ))
+
+        if node.max_length is not None and isinstance(value, string_types):
+            if len(value) > node.max_length:
+                raise _Invalid(
+                    'exceeds the maximum length of %d.' % node.max_length
+                )
+
+    def validate(self, kwargs):
+        """
+        Raise PostNLRequestException when the arguments do not conform to
+        the schema.
+        """
+
+        try:
+            if self.root is None:
+                for name in kwargs:
+                    raise _Invalid('is not expected without input.', name)
+            else:
+                self._validate(self.root, kwargs, top=True)
+
+        except _Invalid as e:
+            raise PostNLRequestException('Invalid %s request: %s %s' % (
+                self.operation, e.get_path(), e.message
+            ))
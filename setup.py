@@ -46,6 +46,12 @@ except:
     warnings.warn('Could not read requirements_django.txt')
     DJANGO_REQUIREMENTS = None
 
+try:
+    ZEEP_REQUIREMENTS = open('requirements_zeep.txt').read()
+except:
+    warnings.warn('Could not read requirements_zeep.txt')
+    ZEEP_REQUIREMENTS = None
+
 
 setup(
     name='python-postnl-checkout',
@@ -54,7 +60,8 @@ setup(
     long_description=README,
     install_requires=REQUIREMENTS,
     extras_require={
-        'Django': DJANGO_REQUIREMENTS
+        'Django': DJANGO_REQUIREMENTS,
+        'zeep': ZEEP_REQUIREMENTS
     },
     license='AGPL',
     author='Mathijs de Bruin',
@@ -6,7 +6,35 @@ from .utils import compare_xml
 
 
 class PostNLTestMixin(object):
-    """ Mixin supplying XML equality test, backported from Django > 1.5. """
+    """
+    Mixin supplying XML equality test, backported from Django > 1.5, and
+    clients of the test webshop.
+    """
+
+    def get_client(self, client_class=None, **kwargs):
+        """
+        Return client of the test webshop in the sandbox, by default a
+        PostNLCheckoutClient loading the bundled WSDL, with other arguments
+        as given.
+        """
+
+        if client_class is None:
+            from postnl_checkout.client import PostNLCheckoutClient
+
+            client_class = PostNLCheckoutClient
+            kwargs.setdefault('bundled_wsdl', True)
+
+        options = {
+            'username': 'klant1',
+            # Note: sha1 hashed password:
+            # dd7b7b74ea160e049dd128478e074ce47254bde8
+            'password': 'xx',
+            'webshop_id': 'a0713e4083a049a996c302f48bb3f535',
+            'environment': 'sandbox'
+        }
+        options.update(kwargs)
+
+        return client_class(**options)
 
     def assertXMLEqual(self, xml1, xml2, msg=None):
         """
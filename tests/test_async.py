@@ -0,0 +1,273 @@
+import threading
+import unittest
+
+try:
+    import asyncio
+except ImportError:
+    # Python 2
+    asyncio = None
+
+from postnl_checkout.breaker import CircuitBreaker
+from postnl_checkout.cache import ResultCache
+from postnl_checkout.exceptions import PostNLRequestException, \
+    PostNLUnavailableException
+from postnl_checkout.singleflight import SingleFlight
+
+from .base import PostNLTestMixin
+
+if asyncio:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+    from postnl_checkout.async_client import (
+        AsyncPostNLCheckoutClient, PooledTransport
+    )
+
+
+def start_standin_server(test, responses):
+    """
+    Start HTTP server in a thread, replying to SOAP actions with
+    (status, filename) from responses and recording requests on test.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers['Content-Length']))
+            action = self.headers['SOAPAction'].strip('"').rsplit('/', 1)[1]
+
+            test.requests.append((self.client_address, action, body))
+
+            if getattr(test, 'drop_next', False):
+                # Close the connection without replying
+                test.drop_next = False
+                self.close_connection = True
+                return
+
+            status, filename = responses[action]
+            reply = test.read_file(filename).encode('utf-8')
+
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/xml; charset=utf-8')
+            self.send_header('Content-Length', str(len(reply)))
+            self.end_headers()
+            self.wfile.write(reply)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+    server = Server(('127.0.0.1', 0), Handler)
+
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    test.addCleanup(server.server_close)
+    test.addCleanup(server.shutdown)
+
+    return 'http://127.0.0.1:%d/' % server.server_address[1]
+
+
+@unittest.skipIf(asyncio is None, 'Requires Python 3.5+.')
+class AsyncClientTests(PostNLTestMixin, unittest.TestCase):
+    """ Test asyncio client against a local stand-in server. """
+
+    responses = {
+        'ReadOrder': (200, 'read_order_response.xml'),
+        'UpdateOrder': (200, 'update_order_response_success.xml'),
+        'PingStatus': (200, 'ping_status_response_ok.xml'),
+        'ConfirmOrder': (500, 'read_order_response_fault.xml'),
+    }
+
+    def setUp(self):
+        self.requests = []
+
+        self.location = start_standin_server(self, self.responses)
+
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+        self.addCleanup(self.loop.close)
+        self.addCleanup(asyncio.set_event_loop, None)
+
+        self.client = self.get_async_client()
+
+    def get_async_client(self, **kwargs):
+        """ Return client of the stand-in server, closed on cleanup. """
+
+        client = self.get_client(
+            AsyncPostNLCheckoutClient, timeout=10,
+            transport=PooledTransport(pool_size=2), **kwargs
+        )
+        client.suds_client.set_options(location=self.location)
+
+        self.addCleanup(self.run_async, client.close())
+
+        return client
+
+    def run_async(self, coroutine):
+        """ Run coroutine to completion on the test loop. """
+        return self.loop.run_until_complete(coroutine)
+
+    def read_order(self):
+        return self.client.read_order(
+            Checkout={'OrderToken': '0cfb4be2-47cf-4eac-865c-d66657953d5c'}
+        )
+
+    def test_read_order(self):
+        """ Requests are sent and replies parsed to Pythonic format. """
+
+        result = self.run_async(self.read_order())
+
+        self.assertEquals(
+            result['Webshop']['IntRef'], 'a0713e4083a049a996c302f48bb3f535'
+        )
+
+        address, action, body = self.requests[0]
+        self.assertXMLEqual(
+            body.decode('utf-8'), self.read_file('read_order_request.xml')
+        )
+
+    def test_timing_hooks(self):
+        """ Hooks receive timings of calls. """
+
+        timings = []
+        self.client.add_timing_hook(timings.append)
+
+        self.run_async(self.read_order())
+
+        timing, = timings
+
+        self.assertEquals(timing.operation, 'ReadOrder')
+        self.assertEquals(timing.outcome, 'success')
+        self.assertEquals(timing.request_size, len(self.requests[0][2]))
+        self.assertGreater(timing.phases['network'], 0)
+
+    def test_update_order(self):
+        """ Results are post-processed like the synchronous client. """
+
+        result = self.run_async(self.client.update_order(
+            Order={'ExtRef': 'FDK004'}
+        ))
+
+        self.assertIs(result, True)
+        self.assertIs(self.run_async(self.client.ping_status()), True)
+
+    def test_fault(self):
+        """ CifException faults raise PostNLRequestException. """
+
+        with self.assertRaises(PostNLRequestException) as cm:
+            self.run_async(self.client.confirm_order(
+                Checkout={'OrderToken': 'x'},
+                Order={'PaymentTotal': '183.25'}
+            ))
+
+        self.assertEquals(cm.exception.args[0], 'Unknown order token.')
+
+    def test_connection_pool(self):
+        """ Concurrent calls share at most pool_size connections. """
+
+        results = self.run_async(asyncio.gather(
+            *[self.read_order() for index in range(10)]
+        ))
+
+        self.assertEquals(len(results), 10)
+        self.assertEquals(len(self.requests), 10)
+
+        connections = set(address for address, action, body in self.requests)
+        self.assertLessEqual(len(connections), 2)
+
+        # Sequential calls reuse an idle connection
+        self.run_async(self.read_order())
+        self.assertIn(self.requests[-1][0], connections)
+
+    def test_stale_connection(self):
+        """
+        Only idempotent requests are sent again when a reused connection is
+        closed without a reply.
+        """
+
+        self.run_async(self.read_order())
+
+        # Connection closed after receiving the request
+        self.drop_next = True
+        self.run_async(self.read_order())
+
+        self.assertEquals(
+            [action for address, action, body in self.requests],
+            ['ReadOrder'] * 3
+        )
+
+        self.drop_next = True
+        with self.assertRaises(ConnectionError):
+            self.run_async(
+                self.client.update_order(Order={'ExtRef': '15200_001'})
+            )
+
+        self.assertEquals(self.requests[-1][1], 'UpdateOrder')
+        self.assertEquals(len(self.requests), 4)
+
+    def test_retries(self):
+        """ Idempotent operations are retried on transient errors. """
+
+        self.client = self.get_async_client(retries=1, retry_backoff=0)
+
+        self.drop_next = True
+        self.run_async(self.read_order())
+
+        self.assertEquals(
+            [action for address, action, body in self.requests],
+            ['ReadOrder'] * 2
+        )
+
+    def test_circuit_breaker(self):
+        """ Calls fail fast once the service is considered down. """
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        self.client = self.get_async_client(circuit_breaker=breaker)
+
+        self.drop_next = True
+        with self.assertRaises(ConnectionError):
+            self.run_async(self.read_order())
+
+        with self.assertRaises(PostNLUnavailableException):
+            self.run_async(self.read_order())
+
+        self.assertEquals(len(self.requests), 1)
+
+    def test_result_cache(self):
+        """ ReadOrder results are cached until the order is updated. """
+
+        self.client = self.get_async_client(result_cache=ResultCache())
+
+        first = self.run_async(self.read_order())
+        self.assertEquals(self.run_async(self.read_order()), first)
+        self.assertEquals(len(self.requests), 1)
+
+        # Invalidated by ExtRef of the order
+        self.run_async(
+            self.client.update_order(Order={'ExtRef': '15200_001'})
+        )
+        self.run_async(self.read_order())
+
+        self.assertEquals(
+            [action for address, action, body in self.requests],
+            ['ReadOrder', 'UpdateOrder', 'ReadOrder']
+        )
+
+    def test_unsupported(self):
+        """ Features relying on threads raise rather than being ignored. """
+
+        with self.assertRaises(NotImplementedError):
+            self.client.map('read_order', [])
+
+        self.client.single_flight = SingleFlight()
+
+        with self.assertRaises(TypeError):
+            self.run_async(self.read_order())
+
+        self.assertEquals(self.requests, [])
@@ -0,0 +1,111 @@
+import threading
+import time
+import unittest
+
+from httmock import HTTMock
+
+from postnl_checkout.exceptions import PostNLRequestException
+
+from .base import PostNLTestMixin
+
+
+class BulkMapTests(PostNLTestMixin, unittest.TestCase):
+    """ Tests for PostNLCheckoutClient.map(). """
+
+    def setUp(self):
+        self.client = self.get_client()
+
+        self.lock = threading.Lock()
+        self.tokens = []
+
+    def response(self, url, request):
+        """
+        Reply to ReadOrder, with a fault for odd tokens; later tokens are
+        answered sooner, so calls complete out of order.
+        """
+
+        body = request.body
+        if not isinstance(body, str):
+            body = body.decode('utf-8')
+
+        token = int(body.split('token-', 1)[1].split('<', 1)[0])
+
+        with self.lock:
+            self.tokens.append(token)
+
+        time.sleep(0.002 * (10 - token % 10))
+
+        if token % 2:
+            return {
+                'status_code': 500,
+                'content': self.read_file('read_order_response_fault.xml')
+            }
+
+        return self.read_file('read_order_response.xml')
+
+    def get_kwargs(self, count):
+        """ Return generator of ReadOrder arguments with numbered tokens. """
+
+        for index in range(count):
+            yield {'Checkout': {'OrderToken': 'token-%d' % index}}
+
+    def test_map(self):
+        """ Each call yields either its result or its exception. """
+
+        with HTTMock(self.response):
+            results = list(
+                self.client.map('read_order', self.get_kwargs(10), 4)
+            )
+
+        self.assertEquals(
+            sorted(result.index for result in results), list(range(10))
+        )
+
+        for result in results:
+            self.assertEquals(
+                result.kwargs['Checkout']['OrderToken'],
+                'token-%d' % result.index
+            )
+
+            if result.index % 2:
+                self.assertIsNone(result.result)
+                self.assertIsInstance(
+                    result.exception, PostNLRequestException
+                )
+            else:
+                self.assertIsNone(result.exception)
+                self.assertIn('Order', result.result)
+
+    def test_ordered(self):
+        """ Ordered results are yielded in order of input. """
+
+        with HTTMock(self.response):
+            results = list(self.client.map(
+                'read_order', self.get_kwargs(20), 4, ordered=True
+            ))
+
+        self.assertEquals(
+            [result.index for result in results], list(range(20))
+        )
+
+    def test_close(self):
+        """ Closing the generator discards calls not yet started. """
+
+        with HTTMock(self.response):
+            results = self.client.map('read_order', self.get_kwargs(100), 2)
+
+            next(results)
+            results.close()
+
+            # Let workers finish calls in progress
+            time.sleep(0.1)
+
+        self.assertLess(len(self.tokens), 10)
+
+    def test_invalid(self):
+        """ Invalid arguments raise ValueError immediately. """
+
+        self.assertRaises(
+            ValueError, self.client.map, 'read_order', [], max_workers=0
+        )
+        self.assertRaises(ValueError, self.client.map, 'ReadOrder', [])
@@ -0,0 +1,103 @@
+import time
+import unittest
+
+from postnl_checkout.cache import ResultCache
+
+
+class ResultCacheTests(unittest.TestCase):
+    """ Tests for the in-process result cache. """
+
+    def test_get(self):
+        """ Values are cached until they expire. """
+
+        cache = ResultCache(ttl=60)
+
+        self.assertEquals(cache.get('a'), None)
+
+        cache.set('a', {'Order': {'ExtRef': 'x'}})
+        self.assertEquals(cache.get('a'), {'Order': {'ExtRef': 'x'}})
+
+        self.assertEquals(cache.stats(), {
+            'hits': 1, 'misses': 1, 'invalidations': 0, 'hit_ratio': 0.5
+        })
+
+        cache.ttl = 0
+        cache.set('a', {})
+        self.assertEquals(cache.get('a'), None)
+        self.assertEquals(len(cache), 0)
+
+        cache.reset_stats()
+        self.assertEquals(cache.stats()['hit_ratio'], None)
+
+    def test_copy(self):
+        """ Callers cannot change cached values. """
+
+        cache = ResultCache()
+
+        value = {'Order': {'ExtRef': 'x'}}
+        cache.set('a', value)
+
+        value['Order']['ExtRef'] = 'y'
+        cache.get('a')['Order']['ExtRef'] = 'z'
+
+        self.assertEquals(cache.get('a'), {'Order': {'ExtRef': 'x'}})
+
+    def test_invalidate(self):
+        """ Values are invalidated by key or alias. """
+
+        cache = ResultCache()
+
+        cache.set('a', 1, aliases=('x', ))
+        cache.set('b', 2, aliases=('y', ))
+
+        cache.invalidate('a')
+        cache.invalidate(alias='y')
+
+        # Unknown alias
+        cache.invalidate(alias='z')
+
+        self.assertEquals(cache.get('a'), None)
+        self.assertEquals(cache.get('b'), None)
+        self.assertEquals(cache.stats()['invalidations'], 3)
+
+    def test_invalidated_since(self):
+        """ Values read before an invalidation are not stored after it. """
+
+        cache = ResultCache()
+
+        since = time.time()
+
+        cache.invalidate('a')
+        cache.set('a', 1, since=since)
+
+        # Invalidated through an alias before it was stored
+        cache.invalidate(alias='y')
+        cache.set('b', 2, aliases=('y', ), since=since)
+
+        self.assertEquals(cache.get('a'), None)
+        self.assertEquals(cache.get('b'), None)
+
+        # Read after the invalidations
+        since = time.time()
+
+        cache.set('a', 1, since=since)
+        cache.set('b', 2, aliases=('y', ), since=since)
+
+        self.assertEquals(cache.get('a'), 1)
+        self.assertEquals(cache.get('b'), 2)
+
+    def test_max_size(self):
+        """ Entries expiring first are evicted beyond the maximum size. """
+
+        cache = ResultCache(max_size=2)
+
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.set('c', 3)
+
+        self.assertEquals(len(cache), 2)
+        self.assertEquals(cache.get('a'), None)
+        self.assertEquals(cache.get('c'), 3)
+
+        cache.clear()
+        self.assertEquals(len(cache), 0)
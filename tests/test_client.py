@@ -1,10 +1,34 @@
+import copy
 import datetime
 import decimal
+import os
+import pickle
+import sys
+import threading
+import time
 import unittest
 
+import requests
+
 from httmock import HTTMock
 
+try:
+    import zeep
+    from lxml import etree
+except ImportError:
+    zeep = None
+
+from suds.sudsobject import Factory
+
+from postnl_checkout.breaker import CircuitBreaker
+from postnl_checkout.cache import ResultCache
 from postnl_checkout.client import PostNLCheckoutClient
+from postnl_checkout.exceptions import PostNLRequestException, \
+    PostNLUnavailableException
+from postnl_checkout.lazy import LazyResult
+from postnl_checkout.records import Record
+from postnl_checkout.singleflight import SingleFlight
+from postnl_checkout.timing import CallTiming
 
 from .base import PostNLTestMixin
 
@@ -32,14 +56,7 @@ class ClientTests(PostNLTestMixin, unittest.TestCase):
             return self.read_file('wsdl/WebshopCheckoutWebService_1.wsdl')
 
         with HTTMock(response):
-            self.client = PostNLCheckoutClient(
-                username='klant1',
-                # Note: sha1 hashed password:
-                # dd7b7b74ea160e049dd128478e074ce47254bde8
-                password='xx',
-                webshop_id='a0713e4083a049a996c302f48bb3f535',
-                environment='sandbox'
-            )
+            self.client = self.get_client(bundled_wsdl=False)
 
     def assertWebshop(self, result):
         """ Assert webshop and id in result. """
@@ -94,6 +111,35 @@ class ClientTests(PostNLTestMixin, unittest.TestCase):
 
         self.assertEquals(output, data)
 
+    def test_sudsobject_to_dict_nested(self):
+        """ Test _sudsobject_to_dict() with nested suds objects. """
+
+        lines = [
+            Factory.object('Optie', {'Code': u'CARD%d' % i, 'Prijs': None})
+            for i in range(3)
+        ]
+        obj = Factory.object('Response', {
+            'Opties': Factory.object('Opties', {'Optie': lines}),
+            'Order': {'ExtRef': u'1105_900', 'Nested': [[1, 2], {'a': 3}]},
+        })
+
+        output = self.client._sudsobject_to_dict(
+            obj, lambda key, value: (key, value)
+        )
+
+        self.assertEquals(output, {
+            'Opties': {
+                'Optie': [
+                    {'Code': ('Code', u'CARD%d' % i), 'Prijs': ('Prijs', None)}
+                    for i in range(3)
+                ]
+            },
+            'Order': {
+                'ExtRef': ('ExtRef', u'1105_900'),
+                'Nested': [('Nested', [1, 2]), {'a': ('a', 3)}]
+            }
+        })
+
     def test_parse_datetime(self):
         """ Test parsing datetimes """
         output = self.client._parse_datetime('15-06-1977 00:00:00')
@@ -171,6 +217,66 @@ class ClientTests(PostNLTestMixin, unittest.TestCase):
             }
         })
 
+    def test_converter_plan(self):
+        """ Test _get_converter_plan() for output and input. """
+
+        plan = self.client._get_converter_plan('ReadOrder')
+
+        self.assertEquals(
+            plan['Voorkeuren']['Bezorging']['Datum'],
+            self.client._parse_datetime
+        )
+        self.assertEquals(
+            plan['Opties']['ReadOrderResponseOpties']['Prijs'],
+            decimal.Decimal
+        )
+        self.assertEquals(plan['Order']['ExtRef'], unicode)
+
+        plan = self.client._get_converter_plan('PrepareOrder', output=False)
+        self.assertEquals(
+            plan['Order']['OrderDatum'](datetime.datetime(1977, 6, 15)),
+            u'15-06-1977 00:00:00'
+        )
+
+        # PingStatus has no input message
+        self.assertEquals(
+            self.client._get_converter_plan('PingStatus', output=False), None
+        )
+
+    def test_to_python_plan(self):
+        """ Test _to_python() with converter plan for operation. """
+
+        data = {
+            'Consument': {
+                'GeboorteDatum': u'15-06-1977 00:00:00',
+                'Email': u'j.jansen@e-id.nl',
+            },
+            'Opties': {
+                'ReadOrderResponseOpties': [
+                    {'Code': u'CARD', 'Prijs': u'2.00'}
+                ]
+            },
+            'Order': None,
+            # Not in schema, converted by name
+            'Onbekend': {'VerzendDatum': u'15-06-1977 00:00:00'}
+        }
+
+        output = self.client._to_python(data, 'ReadOrder')
+
+        self.assertEquals(output, self.client._to_python(data))
+        self.assertEquals(
+            output['Consument']['GeboorteDatum'],
+            datetime.datetime(1977, 6, 15)
+        )
+        self.assertEquals(
+            output['Opties']['ReadOrderResponseOpties'][0]['Prijs'],
+            decimal.Decimal('2.00')
+        )
+        self.assertEquals(
+            output['Onbekend']['VerzendDatum'],
+            datetime.datetime(1977, 6, 15)
+        )
+
     def test_prepare_order(self):
         """ Test PrepareOrder """
 
@@ -254,6 +360,32 @@ class ClientTests(PostNLTestMixin, unittest.TestCase):
 
         self.assertWebshop(result)
 
+    def test_clone_webshop(self):
+        """ Clones can call on behalf of another webshop. """
+
+        def response(url, request):
+            body = request.body
+            if isinstance(body, bytes):
+                body = body.decode('utf-8')
+
+            self.assertIn('klant2', body)
+            self.assertNotIn('klant1', body)
+            self.assertIn('webshop2', body)
+            self.assertIn(
+                PostNLCheckoutClient._get_password_digest('yy'), body
+            )
+
+            return self.read_file('read_order_response.xml')
+
+        clone = self.client.clone('klant2', 'yy', 'webshop2')
+
+        with HTTMock(response):
+            clone.read_order(Checkout={'OrderToken': 'x'})
+
+        self.assertEquals(self.client.webshop_id, self.intref)
+
+        self.assertRaises(ValueError, self.client.clone, username='klant2')
+
     def test_read_order(self):
         """ Test ReadOrder """
 
@@ -304,6 +436,51 @@ class ClientTests(PostNLTestMixin, unittest.TestCase):
         # For now, this has been removed from the mock response for now.
         # Eventually, PostNL should be contacted about this.
 
+    def test_read_order_fault(self):
+        """ CifException faults raise PostNLRequestException. """
+
+        def response(url, request):
+            return {
+                'status_code': 500,
+                'content': self.read_file('read_order_response_fault.xml')
+            }
+
+        kwargs = {
+            'Checkout': {
+                'OrderToken': '0cfb4be2-47cf-4eac-865c-d66657953d5c'
+            }
+        }
+
+        with HTTMock(response):
+            with self.assertRaises(PostNLRequestException) as cm:
+                self.client.read_order(**kwargs)
+
+        self.assertEquals(cm.exception.args[0], 'Unknown order token.')
+
+    def test_invalid_request(self):
+        """ Invalid arguments are refused without calling PostNL. """
+
+        calls = []
+
+        def response(url, request):
+            calls.append(request)
+            return self.read_file('read_order_response.xml')
+
+        with HTTMock(response):
+            with self.assertRaises(PostNLRequestException) as cm:
+                self.client.read_order(Checkout={'OrderToken': None})
+
+            self.assertEquals(
+                cm.exception.args[0],
+                'Invalid ReadOrder request: Checkout.OrderToken is required.'
+            )
+            self.assertEquals(calls, [])
+
+            self.client.validate_requests = False
+            self.client.read_order(Checkout={'OrderToken': None})
+
+        self.assertEquals(len(calls), 1)
+
     def test_confirm_order(self):
         """ Test confirm_order """
 
@@ -411,6 +588,422 @@ class ClientTests(PostNLTestMixin, unittest.TestCase):
             self.assertEquals(self.client.ping_status(), False)
 
 
+    def test_connection_pool(self):
+        """ Session keeps a pool of connections to the service. """
+
+        session = self.client.backend.transport._session
+        adapter = session.get_adapter(PostNLCheckoutClient.SANDBOX_ENDPOINT_URL)
+
+        self.assertEquals(adapter._pool_maxsize, 10)
+        self.assertFalse(adapter._pool_block)
+
+    def test_operation_timeouts(self):
+        """ Requests are sent with the timeout for their operation. """
+
+        transport = self.client.backend.transport
+        transport.timeout = 20
+        transport.operation_timeouts['ReadOrder'] = (1, 60)
+
+        timeouts = []
+
+        def response(url, request):
+            if 'PingStatus' in request.headers['SOAPAction']:
+                return self.read_file('ping_status_response_ok.xml')
+
+            if 'ReadOrder' in request.headers['SOAPAction']:
+                return self.read_file('read_order_response.xml')
+
+            return self.read_file('update_order_response_success.xml')
+
+        with HTTMock(response):
+            send = transport._session.send
+
+            def send_request(request, **kwargs):
+                timeouts.append(kwargs.get('timeout'))
+                return send(request, **kwargs)
+
+            transport._session.send = send_request
+
+            self.client.ping_status()
+            self.client.read_order(Checkout={'OrderToken': 'x'})
+            self.client.update_order(Order={'ExtRef': 'x'})
+
+        self.assertEquals(timeouts, [(3.05, 5), (1, 60), (3.05, 10)])
+
+        # Other requests, i.e. fetching documents, with the general timeout
+        self.assertEquals(transport.get_timeout(None), 20)
+
+    def test_default_timeouts(self):
+        """ Every operation and the WSDL fetch time out by default. """
+
+        transport = self.client.backend.transport
+
+        self.assertEquals(transport.timeout, (3.05, 30))
+
+        for operation in PostNLCheckoutClient.operations:
+            self.assertLessEqual(transport.get_timeout(operation)[1], 30)
+
+        self.assertGreater(
+            transport.get_timeout('ReadOrder')[1],
+            transport.get_timeout('UpdateOrder')[1]
+        )
+
+    def test_retries(self):
+        """ Idempotent operations are retried on transient errors. """
+
+        self.client.retries = 2
+        self.client.retry_backoff = 0
+
+        errors = [
+            requests.ConnectionError('Connection refused'),
+            {'status_code': 503, 'content': 'Service Unavailable'}
+        ]
+        calls = []
+
+        def response(url, request):
+            calls.append(request.headers['SOAPAction'])
+
+            if errors:
+                error = errors.pop(0)
+
+                if isinstance(error, Exception):
+                    raise error
+
+                return error
+
+            return self.read_file('ping_status_response_ok.xml')
+
+        with HTTMock(response):
+            self.assertEquals(self.client.ping_status(), True)
+
+        self.assertEquals(len(calls), 3)
+
+        # Not retried
+        errors.append({'status_code': 503, 'content': 'Service Unavailable'})
+        del calls[:]
+
+        with HTTMock(response):
+            self.assertRaises(
+                Exception, self.client.update_order, Order={'ExtRef': 'x'}
+            )
+
+        self.assertEquals(len(calls), 1)
+
+    def test_result_cache(self):
+        """ ReadOrder results are cached until confirmed or updated. """
+
+        cache = ResultCache(ttl=60)
+        self.client.result_cache = cache
+
+        calls = []
+
+        def response(url, request):
+            action = request.headers['SOAPAction']
+            calls.append(action)
+
+            if 'ConfirmOrder' in action:
+                return self.read_file('confirm_order_response.xml')
+
+            if 'UpdateOrder' in action:
+                return self.read_file('update_order_response_success.xml')
+
+            return self.read_file('read_order_response.xml')
+
+        kwargs = {'Checkout': {'OrderToken': 'x'}}
+
+        with HTTMock(response):
+            result = self.client.read_order(**kwargs)
+
+            # Shared by clones
+            self.assertEquals(self.client.clone().read_order(**kwargs), result)
+
+            self.assertEquals(len(calls), 1)
+            self.assertEquals(cache.stats(), {
+                'hits': 1, 'misses': 1, 'invalidations': 0, 'hit_ratio': 0.5
+            })
+
+            self.client.confirm_order(
+                Checkout={'OrderToken': 'x'}, Order={'ExtRef': u'15200_001'}
+            )
+            self.client.read_order(**kwargs)
+
+            self.assertEquals(len(calls), 3)
+
+            # UpdateOrder refers to the order by ExtRef
+            self.client.update_order(Order={'ExtRef': u'15200_001'})
+            self.client.read_order(**kwargs)
+
+            self.assertEquals(len(calls), 5)
+
+        self.assertEquals(cache.stats()['invalidations'], 2)
+
+    def test_result_cache_race(self):
+        """ Results read while the order is updated are not cached. """
+
+        cache = ResultCache(ttl=60)
+        self.client.result_cache = cache
+
+        calls = []
+
+        def response(url, request):
+            action = request.headers['SOAPAction']
+            calls.append(action)
+
+            if 'UpdateOrder' in action:
+                return self.read_file('update_order_response_success.xml')
+
+            if len(calls) == 1:
+                # Concurrent update, finishing before the read
+                self.client.clone().update_order(
+                    Order={'ExtRef': u'15200_001'}
+                )
+
+            return self.read_file('read_order_response.xml')
+
+        with HTTMock(response):
+            self.client.read_order(Checkout={'OrderToken': 'x'})
+            self.client.read_order(Checkout={'OrderToken': 'x'})
+            self.client.read_order(Checkout={'OrderToken': 'x'})
+
+        self.assertEquals(len(calls), 3)
+
+    def test_result_cache_webshops(self):
+        """ Webshops sharing the cache do not share orders or ExtRef's. """
+
+        cache = ResultCache(ttl=60)
+        self.client.result_cache = cache
+
+        other_client = self.client.clone('klant2', 'yy', 'webshop2')
+
+        calls = []
+
+        def response(url, request):
+            action = request.headers['SOAPAction']
+            calls.append(action)
+
+            if 'UpdateOrder' in action:
+                return self.read_file('update_order_response_success.xml')
+
+            return self.read_file('read_order_response.xml')
+
+        with HTTMock(response):
+            # Same token, distinct entries
+            self.client.read_order(Checkout={'OrderToken': 'x'})
+            other_client.read_order(Checkout={'OrderToken': 'x'})
+
+            self.assertEquals(len(calls), 2)
+
+            # Orders with the same ExtRef, 15200_001
+            other_client.read_order(Checkout={'OrderToken': 'y'})
+
+            self.client.update_order(Order={'ExtRef': u'15200_001'})
+
+            # Only the first webshop's order is invalidated
+            self.client.read_order(Checkout={'OrderToken': 'x'})
+            other_client.read_order(Checkout={'OrderToken': 'y'})
+
+            self.assertEquals(len(calls), 5)
+
+    def test_result_cache_unvalidated(self):
+        """ Arguments without order token are not cached, nor raise. """
+
+        self.client.result_cache = ResultCache(ttl=60)
+        self.client.validate_requests = False
+
+        def response(url, request):
+            return {
+                'status_code': 500,
+                'content': self.read_file('read_order_response_fault.xml')
+            }
+
+        with HTTMock(response):
+            self.assertRaises(
+                PostNLRequestException, self.client.read_order, Checkout={}
+            )
+            self.assertRaises(
+                PostNLRequestException, self.client.confirm_order
+            )
+
+        self.assertEquals(len(self.client.result_cache), 0)
+
+    def test_single_flight(self):
+        """ Concurrent identical ReadOrder calls share one request. """
+
+        single_flight = SingleFlight()
+        self.client.single_flight = single_flight
+
+        calls = []
+        release = threading.Event()
+
+        def response(url, request):
+            calls.append(request)
+
+            # Hold the request until the other threads are waiting for it
+            release.wait(5)
+
+            return self.read_file('read_order_response.xml')
+
+        results = []
+
+        def read_order():
+            results.append(
+                self.client.clone().read_order(Checkout={'OrderToken': 'x'})
+            )
+
+        threads = [threading.Thread(target=read_order) for index in range(4)]
+
+        with HTTMock(response):
+            for thread in threads:
+                thread.start()
+
+            deadline = time.time() + 5
+            while single_flight.coalesced < 3 and time.time() < deadline:
+                time.sleep(0.01)
+
+            release.set()
+
+            for thread in threads:
+                thread.join()
+
+        self.assertEquals(len(calls), 1)
+        self.assertEquals(single_flight.stats(), {'calls': 1, 'coalesced': 3})
+
+        self.assertEquals(len(results), 4)
+        for result in results[1:]:
+            self.assertEquals(result, results[0])
+
+        # Each caller has its own copy, records and lazy results included
+        self.assertEquals(len(set(id(result) for result in results)), 4)
+
+    def test_circuit_breaker(self):
+        """ Calls fail fast after repeated failures. """
+
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        self.client.circuit_breaker = breaker
+
+        calls = []
+
+        def fail_response(url, request):
+            calls.append(request)
+            return {'status_code': 503, 'content': 'Service Unavailable'}
+
+        def ok_response(url, request):
+            calls.append(request)
+            return self.read_file('ping_status_response_ok.xml')
+
+        with HTTMock(fail_response):
+            self.assertRaises(Exception, self.client.ping_status)
+            self.assertEquals(breaker.state, CircuitBreaker.CLOSED)
+
+            self.assertRaises(Exception, self.client.ping_status)
+            self.assertEquals(breaker.state, CircuitBreaker.OPEN)
+
+            self.assertRaises(
+                PostNLUnavailableException, self.client.ping_status
+            )
+
+        self.assertEquals(len(calls), 2)
+
+        # Shared by clones
+        self.assertIs(self.client.clone().circuit_breaker, breaker)
+
+        # After the reset timeout, a single trial call is let through
+        breaker._opened_at -= 60
+        self.assertEquals(breaker.state, CircuitBreaker.HALF_OPEN)
+
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+
+        breaker._opened_at -= 60
+
+        with HTTMock(ok_response):
+            self.assertEquals(self.client.ping_status(), True)
+
+        self.assertEquals(breaker.state, CircuitBreaker.CLOSED)
+
+        # Faults are replies of an available service
+        def fault_response(url, request):
+            return {
+                'status_code': 500,
+                'content': self.read_file('read_order_response_fault.xml')
+            }
+
+        breaker.record_failure()
+
+        with HTTMock(fault_response):
+            self.assertRaises(
+                PostNLRequestException,
+                self.client.read_order, Checkout={'OrderToken': 'x'}
+            )
+
+        self.assertEquals(breaker._failures, 0)
+
+    def test_timing_hooks(self):
+        """ Hooks receive timings, sizes and outcome of each call. """
+
+        timings = []
+
+        self.client.add_timing_hook(timings.append)
+
+        def response(url, request):
+            if 'ReadOrder' in request.headers['SOAPAction']:
+                return self.read_file('read_order_response.xml')
+
+            return {
+                'status_code': 500,
+                'content': self.read_file('read_order_response_fault.xml')
+            }
+
+        with HTTMock(response):
+            self.client.read_order(Checkout={'OrderToken': 'x'})
+
+            self.assertRaises(
+                PostNLRequestException,
+                self.client.clone().update_order, Order={'ExtRef': 'x'}
+            )
+
+        self.client.remove_timing_hook(timings.append)
+
+        with HTTMock(response):
+            self.client.read_order(Checkout={'OrderToken': 'x'})
+
+        self.assertEquals(len(timings), 2)
+
+        timing = timings[0]
+
+        self.assertEquals(timing.operation, 'ReadOrder')
+        self.assertEquals(timing.outcome, CallTiming.SUCCESS)
+        self.assertEquals(timing.attempts, 1)
+        self.assertGreater(timing.request_size, 0)
+        self.assertEquals(
+            timing.response_size,
+            len(self.read_file('read_order_response.xml'))
+        )
+        self.assertAlmostEqual(
+            sum(timing.phases.values()), timing.total, places=3
+        )
+
+        timing = timings[1]
+
+        self.assertEquals(timing.operation, 'UpdateOrder')
+        self.assertEquals(timing.outcome, CallTiming.FAULT)
+        self.assertIsInstance(timing.exception, PostNLRequestException)
+
+    def test_timing_hook_error(self):
+        """ Exceptions in timing hooks do not affect calls. """
+
+        def hook(timing):
+            raise ValueError()
+
+        self.client.add_timing_hook(hook)
+
+        def response(url, request):
+            return self.read_file('ping_status_response_ok.xml')
+
+        with HTTMock(response):
+            self.assertEquals(self.client.ping_status(), True)
+
+
 class ClientRegressionTests(ClientTests):
     """ Regression tests. """
 
@@ -447,3 +1040,355 @@ class ClientRegressionTests(ClientTests):
                 'VerzendDatum': None
             }
         })
+
+
+class BundledClientTests(ClientTests):
+    """ Run client tests against the WSDL bundled with the package. """
+
+    def setUp(self):
+        """ Instantiate client without fetching any remote documents. """
+
+        def response(url, request):
+            self.fail('Unexpected request for %s' % url.geturl())
+
+        with HTTMock(response):
+            self.client = self.get_client()
+
+    def test_location(self):
+        """ Service location is overridden with environment endpoint. """
+
+        self.assertEquals(
+            self.client.suds_client.options.location,
+            'https://testservice.postnl.com/CIF_SB/'
+            'WebshopCheckoutWebService/2_2/WebshopCheckoutService.svc'
+        )
+
+    def test_snapshot(self):
+        """ Parsed definitions are stored in the snapshot cache. """
+
+        cache = PostNLCheckoutClient._get_snapshot_cache()
+        cache.clear()
+
+        self.get_client()
+
+        url = PostNLCheckoutClient._get_bundled_wsdl_url()
+        snapshot_id = '%s-wsdl' % abs(hash(url))
+
+        self.assertTrue(cache.get(snapshot_id))
+
+    def test_snapshot_location(self):
+        """ Snapshots are kept privately by bundle and Python version. """
+
+        location = PostNLCheckoutClient._get_snapshot_cache().location
+
+        self.assertTrue(location.startswith(
+            os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~')
+        ))
+        self.assertIn(PostNLCheckoutClient._get_bundle_digest(), location)
+        self.assertTrue(location.endswith('-py%d' % sys.version_info[0]))
+
+        if os.name == 'posix':
+            self.assertFalse(os.stat(location).st_mode & 0o077)
+
+    def test_warm_up(self):
+        """ Warming up builds what calls of each operation use. """
+
+        PostNLCheckoutClient._request_validators.clear()
+
+        self.client.warm_up()
+
+        self.assertEquals(
+            sorted(PostNLCheckoutClient._request_validators),
+            sorted(
+                (PostNLCheckoutClient, operation)
+                for operation in PostNLCheckoutClient.operations
+            )
+        )
+
+    def test_unknown_backend(self):
+        """ Unknown SOAP backends are refused. """
+
+        self.assertRaises(
+            ValueError, PostNLCheckoutClient,
+            username='klant1',
+            password='xx',
+            webshop_id='a0713e4083a049a996c302f48bb3f535',
+            environment='sandbox',
+            bundled_wsdl=True,
+            backend='soappy'
+        )
+
+
+class FastParserClientTests(BundledClientTests):
+    """ Run client tests parsing replies without suds unmarshalling. """
+
+    def setUp(self):
+        """ Instantiate client with fast parser. """
+
+        self.client = self.get_client(fast_parser=True)
+
+    def test_fault_ok_status(self):
+        """ Faults in replies with 200 status are unmarshalled by suds. """
+
+        def response(url, request):
+            return self.read_file('read_order_response_fault.xml')
+
+        with HTTMock(response):
+            self.assertRaises(
+                PostNLRequestException, self.client.read_order,
+                Checkout={'OrderToken': 'x'}
+            )
+
+
+class EnvelopeTemplateClientTests(BundledClientTests):
+    """ Run client tests rendering requests from envelope templates. """
+
+    def setUp(self):
+        """ Instantiate client with envelope templates. """
+
+        self.client = self.get_client(envelope_templates=True)
+
+    def test_request_headers(self):
+        """ Rendered envelopes are sent like suds sends them. """
+
+        def response(url, request):
+            self.assertEquals(
+                url.geturl(), self.client.suds_client.options.location
+            )
+            self.assertEquals(
+                request.headers['Content-Type'], 'text/xml; charset=utf-8'
+            )
+            self.assertEquals(
+                request.headers['SOAPAction'],
+                self.client.service.ReadOrder.method.soap.action
+            )
+
+            return self.read_file('read_order_response.xml')
+
+        with HTTMock(response):
+            self.client.read_order(Checkout={'OrderToken': 'x'})
+
+
+class LazyResultClientTests(BundledClientTests):
+    """ Run client tests with results converted on access. """
+
+    def setUp(self):
+        """ Instantiate client with lazy results. """
+
+        self.client = self.get_client(lazy_results=True)
+
+    def test_to_lazy_python(self):
+        """ Values are converted as by _to_python(), once, on access. """
+
+        data = {
+            'Consument': {
+                'GeboorteDatum': u'15-06-1977 00:00:00',
+                'Email': u'j.jansen@e-id.nl',
+            },
+            'Opties': {
+                'ReadOrderResponseOpties': [
+                    {'Code': u'CARD', 'Prijs': u'2.00'}
+                ]
+            },
+            'Order': None,
+            # Not in schema, converted by name
+            'Onbekend': {'VerzendDatum': u'15-06-1977 00:00:00'}
+        }
+
+        output = self.client._to_lazy_python(data, 'ReadOrder')
+
+        self.assertIsInstance(output, LazyResult)
+        self.assertEquals(output, self.client._to_python(data, 'ReadOrder'))
+        self.assertEquals(
+            self.client._to_lazy_python(data), self.client._to_python(data)
+        )
+
+        self.assertEquals(len(output), 4)
+        self.assertIn('Consument', output)
+        self.assertEquals(
+            output['Consument']['GeboorteDatum'],
+            datetime.datetime(1977, 6, 15)
+        )
+
+        # Memoized
+        self.assertIs(output['Consument'], output['Consument'])
+
+        # Read-only
+        def assign():
+            output['Order'] = {}
+
+        self.assertRaises(TypeError, assign)
+
+        # Plain values are converted right away
+        self.assertEquals(
+            self.client._to_lazy_python(u'OK', 'PingStatus'), u'OK'
+        )
+
+    def test_lazy_result_copy(self):
+        """ LazyResult copies, pickles and serializes as dictionary. """
+
+        data = {
+            'Consument': {'GeboorteDatum': u'15-06-1977 00:00:00'},
+            'Opties': {
+                'ReadOrderResponseOpties': [{'Prijs': u'2.00'}]
+            }
+        }
+
+        output = self.client._to_lazy_python(data, 'ReadOrder')
+        expected = self.client._to_python(data, 'ReadOrder')
+
+        self.assertEquals(output.to_json(), expected)
+        self.assertIs(type(output.to_dict()['Consument']), dict)
+
+        self.assertIs(type(copy.deepcopy(output)), dict)
+        self.assertEquals(pickle.loads(pickle.dumps(output)), expected)
+
+
+class RecordResultClientTests(BundledClientTests):
+    """ Run client tests with results converted to records. """
+
+    def setUp(self):
+        """ Instantiate client with record results. """
+
+        self.client = self.get_client(record_results=True)
+
+    def test_record_results(self):
+        """ Results are records, equal to the dictionaries otherwise. """
+
+        def response(url, request):
+            return self.read_file('read_order_response.xml')
+
+        with HTTMock(response):
+            result = self.client.read_order(Checkout={'OrderToken': 'x'})
+
+        self.assertIsInstance(result, Record)
+        self.assertEquals(result.Order.ExtRef, u'15200_001')
+
+        with HTTMock(response):
+            self.client.record_results = False
+            self.assertEquals(
+                result, self.client.read_order(Checkout={'OrderToken': 'x'})
+            )
+
+    def test_lazy_record_results(self):
+        """ Results cannot be both lazy and records. """
+
+        self.assertRaises(
+            ValueError, PostNLCheckoutClient,
+            username='klant1',
+            password='xx',
+            webshop_id='a0713e4083a049a996c302f48bb3f535',
+            environment='sandbox',
+            bundled_wsdl=True,
+            lazy_results=True,
+            record_results=True
+        )
+
+
+@unittest.skipIf(zeep is None, 'zeep not installed')
+class ZeepClientTests(BundledClientTests):
+    """ Run client tests with the zeep backend. """
+
+    def setUp(self):
+        """ Instantiate client with zeep backend. """
+
+        self.client = self.get_client(backend='zeep')
+
+    def assertXMLEqual(self, xml1, xml2, msg=None):
+        """ zeep uses other namespace prefixes; compare canonical XML. """
+
+        def canonicalize(xml):
+            if not isinstance(xml, bytes):
+                xml = xml.encode('utf-8')
+
+            parser = etree.XMLParser(remove_blank_text=True)
+            root = etree.fromstring(xml, parser)
+
+            for element in root.iter():
+                element.tag = etree.QName(element).localname
+
+            etree.cleanup_namespaces(root)
+
+            return etree.tostring(root, method='c14n')
+
+        self.assertEquals(canonicalize(xml1), canonicalize(xml2), msg)
+
+    def test_client(self):
+        """ Service of the zeep client calls the operations. """
+
+        self.assertEquals(self.client.backend.name, 'zeep')
+        self.assertRaises(AttributeError, getattr, self.client, 'suds_client')
+
+        for operation in (
+            'ReadOrder', 'ConfirmOrder', 'UpdateOrder', 'PingStatus'
+        ):
+            self.assertTrue(getattr(self.client.service, operation))
+
+    def test_location(self):
+        """ Service location is overridden with environment endpoint. """
+
+        self.assertEquals(
+            self.client.backend.get_location('ReadOrder'),
+            'https://testservice.postnl.com/CIF_SB/'
+            'WebshopCheckoutWebService/2_2/WebshopCheckoutService.svc'
+        )
+
+    def test_snapshot(self):
+        """ zeep does not use suds' snapshot cache. """
+        pass
+
+    def test_clone(self):
+        """ Clones share the zeep client, but not the transport. """
+
+        clone = self.client.clone()
+
+        backend = self.client.backend
+
+        self.assertIs(clone.backend.zeep_client, backend.zeep_client)
+        self.assertIsNot(clone.backend.transport, backend.transport)
+        self.assertIs(
+            clone.backend.transport._session, backend.transport._session
+        )
+
+    def test_same_results(self):
+        """ Results equal those of suds, except for empty elements. """
+
+        def response(url, request):
+            return self.read_file('read_order_response.xml')
+
+        suds_client = self.get_client()
+
+        def strip_none(value):
+            if isinstance(value, dict):
+                return dict(
+                    (key, strip_none(item)) for key, item in value.items()
+                    if item is not None
+                )
+
+            if isinstance(value, list):
+                return [strip_none(item) for item in value]
+
+            return value
+
+        with HTTMock(response):
+            self.assertEquals(
+                self.client.read_order(Checkout={'OrderToken': 'x'}),
+                strip_none(
+                    suds_client.read_order(Checkout={'OrderToken': 'x'})
+                )
+            )
+
+
+@unittest.skipIf(zeep is None, 'zeep not installed')
+class ZeepFastParserClientTests(FastParserClientTests):
+    """ Run client tests with the fast parser and zeep backend. """
+
+    def setUp(self):
+        """ Instantiate client with fast parser and zeep backend. """
+
+        self.client = self.get_client(fast_parser=True, backend='zeep')
+
+    assertXMLEqual = ZeepClientTests.__dict__['assertXMLEqual']
+    test_client = ZeepClientTests.__dict__['test_client']
+    test_location = ZeepClientTests.__dict__['test_location']
+    test_snapshot = ZeepClientTests.__dict__['test_snapshot']
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+import datetime
+import random
+import unittest
+
+from postnl_checkout.compat import text_type
+from postnl_checkout.dates import DATETIME_FORMAT, Memo, format_datetime, \
+    parse_datetime
+
+
+# Characters substituted in mutated values
+MUTATIONS = u'0123456789 -:+.aZ١'
+
+
+class DatesTests(unittest.TestCase):
+    """
+    Property tests comparing parsing and formatting with strptime() and
+    strftime(), on random values from a seeded generator.
+    """
+
+    samples = 2000
+
+    def setUp(self):
+        self.random = random.Random(1977)
+
+    def random_datetime(self):
+        """ Return random datetime in the years strftime() supports. """
+
+        start = datetime.datetime(1900, 1, 1)
+        end = datetime.datetime(9999, 12, 31, 23, 59, 59)
+
+        return start + datetime.timedelta(
+            seconds=self.random.randint(
+                0, int((end - start).total_seconds())
+            )
+        )
+
+    def strip_padding(self, value):
+        """ Return value with zeros randomly stripped from its fields. """
+
+        date, time = value.split(' ')
+
+        def strip(field):
+            if len(field) == 2 and field[0] == '0':
+                if self.random.random() < 0.5:
+                    return field[1:]
+
+            return field
+
+        day, month, year = date.split('-')
+        hour, minute, second = time.split(':')
+
+        return '%s-%s-%s %s:%s:%s' % (
+            strip(day), strip(month), year,
+            strip(hour), strip(minute), strip(second)
+        )
+
+    def mutate(self, value):
+        """ Return value with a random character replaced or removed. """
+
+        index = self.random.randrange(len(value))
+        replacement = self.random.choice(MUTATIONS + u'\0')
+
+        return value[:index] + replacement.strip(u'\0') + value[index + 1:]
+
+    def assertParsedLikeStrptime(self, value):
+        """ Assert value is parsed, or refused, like strptime() does. """
+
+        try:
+            expected = datetime.datetime.strptime(value, DATETIME_FORMAT)
+        except ValueError:
+            self.assertRaises(ValueError, parse_datetime, value)
+        else:
+            self.assertEquals(parse_datetime(value), expected)
+
+    def test_round_trip(self):
+        """ Formatted datetimes parse to the same datetime. """
+
+        for index in range(self.samples):
+            value = self.random_datetime()
+            formatted = format_datetime(value)
+
+            self.assertEquals(formatted, value.strftime(DATETIME_FORMAT))
+            self.assertEquals(parse_datetime(formatted), value)
+            self.assertEquals(parse_datetime(text_type(formatted)), value)
+
+    def test_not_padded(self):
+        """ Values without zero padding are parsed like strptime(). """
+
+        for index in range(self.samples):
+            self.assertParsedLikeStrptime(
+                self.strip_padding(format_datetime(self.random_datetime()))
+            )
+
+    def test_invalid(self):
+        """ Mutated values are parsed or refused like strptime(). """
+
+        for index in range(self.samples):
+            self.assertParsedLikeStrptime(
+                self.mutate(format_datetime(self.random_datetime()))
+            )
+
+        for value in (u'', u'31-02-2012 00:00:00', u'15-06-1977 24:00:00'):
+            self.assertRaises(ValueError, parse_datetime, value)
+
+    def test_format_other(self):
+        """ Dates and aware datetimes are formatted like strftime(). """
+
+        class UTC(datetime.tzinfo):
+            def utcoffset(self, dt):
+                return datetime.timedelta(0)
+
+            dst = utcoffset
+
+        for value in (
+            datetime.date(1977, 6, 15),
+            datetime.datetime(1977, 6, 15, 12, tzinfo=UTC())
+        ):
+            self.assertEquals(
+                format_datetime(value), value.strftime(DATETIME_FORMAT)
+            )
+
+
+class MemoTests(unittest.TestCase):
+    """ Tests for the bounded memo. """
+
+    def test_memo(self):
+        """ Results are memoized, keeping recently used values. """
+
+        calls = []
+
+        def function(value):
+            calls.append(value)
+            return value * 2
+
+        memo = Memo(function, size=4)
+
+        self.assertEquals(memo(1), 2)
+        self.assertEquals(memo(1), 2)
+        self.assertEquals(calls, [1])
+
+        memo(2)
+        memo(3)
+
+        # Keep using 1
+        memo(1)
+        memo(4)
+        memo(5)
+
+        self.assertLessEqual(len(memo), 4)
+
+        del calls[:]
+        memo(1)
+        memo(2)
+
+        self.assertEquals(calls, [2])
+
+        memo.clear()
+        self.assertEquals(len(memo), 0)
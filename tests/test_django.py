@@ -1,18 +1,43 @@
 import datetime
 import decimal
+import hashlib
+import json
+import threading
+import time
 
-from django.test import TestCase
+from django.apps import apps
 from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils.functional import empty
+from django.utils.six import StringIO
 
 from httmock import HTTMock
 
 from django_dynamic_fixture import G, N
 
-from postnl_checkout.contrib.django_postnl_checkout.models import Order
+from postnl_checkout.breaker import CircuitBreaker
+from postnl_checkout.client import PostNLCheckoutClient
+from postnl_checkout.contrib.django_postnl_checkout.apps import \
+    PostNLCheckoutConfig
+from postnl_checkout.contrib.django_postnl_checkout.cache import \
+    SudsDjangoCache
+from postnl_checkout.contrib.django_postnl_checkout.signals import \
+    api_call_timed
+from postnl_checkout.contrib.django_postnl_checkout.utils import \
+    DjangoResultCache, DjangoSingleFlight, get_client, get_remote_digest
+from postnl_checkout.contrib.django_postnl_checkout.models import (
+    Order, PostNLJSONEncoder, postnl_client, postnl_client_pool,
+    postnl_client_registry
+)
+from postnl_checkout.contrib.django_postnl_checkout.warmup import warm_up
+from postnl_checkout.lazy import LazyResult
 
 from .base import PostNLTestMixin
 
 
+@override_settings(POSTNL_CHECKOUT_BUNDLED_WSDL=True)
 class OrderTests(PostNLTestMixin, TestCase):
     """ Tests for Order model. """
     maxDiff = None
@@ -20,6 +45,13 @@ class OrderTests(PostNLTestMixin, TestCase):
     def setUp(self):
         super(OrderTests, self).setUp()
 
+        # Load the clients with the bundled WSDL, restoring them afterwards
+        lazies = (postnl_client, postnl_client_pool, postnl_client_registry)
+
+        for lazy in lazies:
+            self.addCleanup(setattr, lazy, '_wrapped', lazy._wrapped)
+            lazy._wrapped = empty
+
         self.order_datum = datetime.datetime(
             year=2011, month=7, day=21,
             hour=20, minute=11, second=0
@@ -131,6 +163,42 @@ class OrderTests(PostNLTestMixin, TestCase):
             }
         })
 
+    @override_settings(POSTNL_CHECKOUT_WEBSHOPS={
+        'webshop2': {'USERNAME': 'klant2', 'PASSWORD': 'yy'}
+    })
+    def test_webshops(self):
+        """ Orders of other webshops are handled with their credentials. """
+
+        def response(url, request):
+            self.assertIn('klant2', request.body)
+            self.assertIn('webshop2', request.body)
+
+            if 'ReadOrder' in request.headers['SOAPAction']:
+                return self.read_file('read_order_response.xml')
+
+            return self.read_file('prepare_order_response.xml')
+
+        with HTTMock(response):
+            instance = Order.prepare_order(
+                webshop_id='webshop2',
+                Order={'ExtRef': '1105_900', 'OrderDatum': self.order_datum}
+            )
+
+            instance = Order.objects.get(pk=instance.pk)
+            self.assertEquals(instance.webshop_id, 'webshop2')
+
+            instance.read_order()
+
+        # Cloned from the process' client
+        pool = instance.get_client_pool()
+        self.assertIs(
+            pool.client.suds_client.wsdl, postnl_client.suds_client.wsdl
+        )
+        self.assertEquals(postnl_client_registry.stats()['pools'], 1)
+
+        instance.webshop_id = 'webshop3'
+        self.assertRaises(ImproperlyConfigured, instance.read_order)
+
     def test_read_order(self):
         """ Test read_order method. """
 
@@ -268,6 +336,140 @@ class OrderTests(PostNLTestMixin, TestCase):
             }
         })
 
+    @override_settings(POSTNL_CHECKOUT_LAZY_RESULTS=True)
+    def test_read_order_lazy(self):
+        """ Lazy results are stored like fully converted ones. """
+
+        def response(url, request):
+            return self.read_file('read_order_response.xml')
+
+        kwargs = {'Checkout': {'OrderToken': 'x'}}
+
+        with HTTMock(response):
+            lazy = get_client().read_order(**kwargs)
+            eager = postnl_client.read_order(**kwargs)
+
+        self.assertIsInstance(lazy, LazyResult)
+        self.assertEquals(lazy['Order']['ExtRef'], u'15200_001')
+
+        instance = G(Order, read_order_response=lazy)
+        instance = Order.objects.get(pk=instance.pk)
+
+        self.assertEquals(
+            instance.read_order_response,
+            json.loads(json.dumps(eager, cls=PostNLJSONEncoder))
+        )
+
+    @override_settings(POSTNL_CHECKOUT_READ_ORDER_CACHE_TTL=60)
+    def test_read_order_cache(self):
+        """ ReadOrder results are cached in the Django cache. """
+
+        calls = []
+
+        def response(url, request):
+            calls.append(request)
+            return self.read_file('read_order_response.xml')
+
+        client = get_client()
+        self.assertIsInstance(client.result_cache, DjangoResultCache)
+
+        # Shared between processes
+        other_client = get_client()
+
+        kwargs = {'Checkout': {'OrderToken': 'x'}}
+
+        with HTTMock(response):
+            result = client.read_order(**kwargs)
+            self.assertEquals(other_client.read_order(**kwargs), result)
+
+        self.assertEquals(len(calls), 1)
+        self.assertEquals(other_client.result_cache.stats()['hits'], 1)
+
+        other_client.result_cache.invalidate(
+            alias=client._get_result_cache_key(u'15200_001')
+        )
+        self.assertEquals(
+            client.result_cache.get(client._get_result_cache_key('x')), None
+        )
+
+    @override_settings(POSTNL_CHECKOUT_COALESCE_CALLS='cache')
+    def test_read_order_coalesced(self):
+        """ ReadOrder calls in flight are shared through the cache. """
+
+        calls = []
+        release = threading.Event()
+
+        def response(url, request):
+            calls.append(request)
+            release.wait(5)
+
+            return self.read_file('read_order_response.xml')
+
+        client = get_client()
+        self.assertIsInstance(client.single_flight, DjangoSingleFlight)
+
+        # Another process
+        other_client = get_client()
+        other_client.single_flight.poll_interval = 0.01
+
+        results = []
+
+        def read_order(client):
+            results.append(client.read_order(Checkout={'OrderToken': 'x'}))
+
+        threads = [
+            threading.Thread(target=read_order, args=(client, )),
+            threading.Thread(target=read_order, args=(other_client, ))
+        ]
+
+        with HTTMock(response):
+            threads[0].start()
+
+            deadline = time.time() + 5
+            while not calls and time.time() < deadline:
+                time.sleep(0.01)
+
+            threads[1].start()
+            time.sleep(0.1)
+
+            release.set()
+
+            for thread in threads:
+                thread.join()
+
+        self.assertEquals(len(calls), 1)
+        self.assertEquals(len(results), 2)
+        self.assertEquals(results[0], results[1])
+
+    def test_single_flight_outcomes(self):
+        """ Outcomes are shared with processes acquiring the lock next. """
+
+        cache.clear()
+
+        calls = []
+
+        def call():
+            calls.append(None)
+            return 'OK'
+
+        def fail():
+            calls.append(None)
+            raise ValueError('Failed')
+
+        single_flight = DjangoSingleFlight()
+
+        self.assertEquals(single_flight.do('ping', call), ('OK', False))
+
+        # Another process, acquiring the lock once released
+        self.assertEquals(
+            DjangoSingleFlight().do('ping', call), ('OK', True)
+        )
+
+        self.assertRaises(ValueError, single_flight.do, 'read', fail)
+        self.assertRaises(ValueError, DjangoSingleFlight().do, 'read', call)
+
+        self.assertEquals(len(calls), 2)
+
     def test_confirm_order(self):
         """ Test confirm_order """
 
@@ -416,3 +618,306 @@ class OrderTests(PostNLTestMixin, TestCase):
 
         with HTTMock(nok_response):
             self.assertEquals(instance.ping_status(), False)
+
+    def test_resilience_defaults(self):
+        """ Retries and the circuit breaker are disabled by default. """
+
+        client = get_client()
+
+        self.assertEquals(client.retries, 0)
+        self.assertEquals(client.circuit_breaker, None)
+
+    @override_settings(POSTNL_CHECKOUT_CIRCUIT_BREAKER_THRESHOLD=5)
+    def test_ping_status_circuit_open(self):
+        """ ping_status is False without calling while the circuit is open. """
+
+        instance = G(Order)
+
+        # Client with the circuit breaker, restoring it for other tests
+        self.addCleanup(
+            setattr, postnl_client, '_wrapped', postnl_client._wrapped
+        )
+        postnl_client._wrapped = get_client()
+
+        breaker = postnl_client.circuit_breaker
+        self.assertIsInstance(breaker, CircuitBreaker)
+
+        def response(url, request):
+            self.fail('Service should not be called.')
+
+        for index in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+        try:
+            with HTTMock(response):
+                self.assertEquals(instance.ping_status(), False)
+        finally:
+            breaker.reset()
+
+    @override_settings(POSTNL_CHECKOUT_TIMING_HOOKS=(
+        'postnl_checkout.contrib.django_postnl_checkout.timing.log_timing',
+        'postnl_checkout.contrib.django_postnl_checkout.timing.'
+        'send_timing_signal'
+    ))
+    def test_timing_signal(self):
+        """ Timing hooks from settings log and send api_call_timed. """
+
+        client = get_client()
+
+        timings = []
+
+        def receiver(sender, timing, **kwargs):
+            timings.append(timing)
+
+        def response(url, request):
+            return self.read_file('ping_status_response_ok.xml')
+
+        api_call_timed.connect(receiver)
+
+        try:
+            with HTTMock(response):
+                client.ping_status()
+        finally:
+            api_call_timed.disconnect(receiver)
+
+        self.assertEquals(len(timings), 1)
+        self.assertEquals(timings[0].operation, 'PingStatus')
+
+
+class SudsDjangoCacheTests(PostNLTestMixin, TestCase):
+    """ Tests for the two-tier suds cache. """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_tiers(self):
+        """ Values are shared through the Django cache, then kept local. """
+
+        suds_cache = SudsDjangoCache(digest='digest')
+        suds_cache.put('x-wsdl', {'value': 1})
+
+        # Compressed in the shared tier
+        data = cache.get(suds_cache._cache_key('x-wsdl'))
+        self.assertIsInstance(data, bytes)
+
+        other_cache = SudsDjangoCache(digest='digest')
+
+        value = other_cache.get('x-wsdl')
+        self.assertEquals(value, {'value': 1})
+
+        # Same object from the local tier
+        self.assertIs(other_cache.get('x-wsdl'), value)
+        self.assertEquals(other_cache.get('y-wsdl'), None)
+
+        stats = other_cache.stats()
+        self.assertEquals(
+            (stats['local']['hits'], stats['local']['misses']), (1, 2)
+        )
+        self.assertEquals(
+            (stats['shared']['hits'], stats['shared']['misses']), (1, 1)
+        )
+        self.assertEquals(stats['local']['hit_ratio'], 1 / 3.0)
+
+        other_cache.purge('x-wsdl')
+        self.assertEquals(suds_cache.get('x-wsdl'), {'value': 1})
+        self.assertEquals(other_cache.get('x-wsdl'), None)
+
+    def test_digest(self):
+        """ Values cached for other WSDL contents are not returned. """
+
+        SudsDjangoCache(digest='digest').put('x-wsdl', 1)
+
+        self.assertEquals(SudsDjangoCache(digest='other').get('x-wsdl'), None)
+
+    def test_lru(self):
+        """ The local tier evicts the least recently used values. """
+
+        suds_cache = SudsDjangoCache(max_entries=2)
+
+        suds_cache.put('a', 1)
+        suds_cache.put('b', 2)
+        suds_cache.get('a')
+        suds_cache.put('c', 3)
+
+        self.assertEquals(list(suds_cache._entries), ['a', 'c'])
+
+        # Values pickled larger than max_size are not kept
+        suds_cache = SudsDjangoCache(max_size=100)
+
+        suds_cache.put('a', 'x' * 10)
+        suds_cache.put('b', 'x' * 200)
+
+        self.assertEquals(list(suds_cache._entries), ['a'])
+        self.assertEquals(suds_cache.get('b'), 'x' * 200)
+
+    def test_duration(self):
+        """ Entries expire after the given duration, a day by default. """
+
+        self.assertEquals(SudsDjangoCache().timeout, 24 * 60 * 60)
+        self.assertEquals(SudsDjangoCache(days=2).timeout, 2 * 24 * 60 * 60)
+        self.assertEquals(SudsDjangoCache(hours=6).timeout, 6 * 60 * 60)
+        self.assertEquals(SudsDjangoCache(days=0).timeout, None)
+
+        # Days as the first argument, as before the digest was added
+        self.assertEquals(SudsDjangoCache(2).timeout, 2 * 24 * 60 * 60)
+        self.assertEquals(SudsDjangoCache(2).digest, '')
+
+        suds_cache = SudsDjangoCache(seconds=1)
+        suds_cache.put('x', 1)
+
+        entry = suds_cache._entries['x']
+        suds_cache._entries['x'] = (time.time() - 1, ) + entry[1:]
+
+        # Expired locally, read from the Django cache
+        self.assertEquals(suds_cache.get('x'), 1)
+        self.assertEquals(suds_cache.stats()['local']['misses'], 1)
+
+    @override_settings(POSTNL_CHECKOUT_BUNDLED_WSDL=True)
+    def test_get_client(self):
+        """ Clients share the cache of their WSDL. """
+
+        suds_cache = get_client().suds_client.options.cache
+
+        self.assertIsInstance(suds_cache, SudsDjangoCache)
+        self.assertEquals(
+            suds_cache.digest, PostNLCheckoutClient._get_bundle_digest()
+        )
+        self.assertIs(get_client().suds_client.options.cache, suds_cache)
+        self.assertGreater(len(suds_cache), 0)
+
+    def test_remote_digest(self):
+        """ Remote WSDL's are cached by digest of the fetched document. """
+
+        wsdl = self.read_file('wsdl/WebshopCheckoutWebService_1.wsdl')
+
+        def response(url, request):
+            if '.xsd' in url.path:
+                return self.read_file('wsdl/' + url.path.rsplit('/', 1)[1])
+
+            return wsdl
+
+        with HTTMock(response):
+            suds_cache = get_client().suds_client.options.cache
+
+        self.assertEquals(
+            suds_cache.digest,
+            hashlib.sha1(wsdl.encode('utf-8')).hexdigest()
+        )
+
+        # Cache without digest when the WSDL cannot be fetched
+        def failure(url, request):
+            return {'status_code': 503}
+
+        with HTTMock(failure):
+            self.assertEquals(get_remote_digest('sandbox'), '')
+
+    def test_credentials(self):
+        """ Clients sharing the cached WSDL send their own credentials. """
+
+        suds_cache = SudsDjangoCache(digest='digest')
+
+        def client(username):
+            return self.get_client(username=username, cache=suds_cache)
+
+        first, second = client('user_a'), client('user_b')
+
+        self.assertIs(first.suds_client.wsdl, second.suds_client.wsdl)
+
+        usernames = []
+
+        def response(url, request):
+            usernames.append(
+                request.body.split('Username>')[1].split('<')[0]
+            )
+
+            return self.read_file('ping_status_response_ok.xml')
+
+        with HTTMock(response):
+            first.ping_status()
+            second.ping_status()
+
+        self.assertEquals(usernames, ['user_a', 'user_b'])
+
+
+@override_settings(POSTNL_CHECKOUT_BUNDLED_WSDL=True)
+class WarmupTests(PostNLTestMixin, TestCase):
+    """ Tests for warming up before serving traffic. """
+
+    def ok_response(self, url, request):
+        return self.read_file('ping_status_response_ok.xml')
+
+    def nok_response(self, url, request):
+        return self.read_file('ping_status_response_nok.xml')
+
+    def test_command(self):
+        """ The command fills the cache and pings, reporting timings. """
+
+        suds_cache = get_client().suds_client.options.cache
+
+        cache.clear()
+        suds_cache.clear()
+
+        stdout = StringIO()
+
+        with HTTMock(self.ok_response):
+            call_command('postnl_checkout_warmup', stdout=stdout)
+
+        self.assertEquals(
+            [line.split()[:2] for line in stdout.getvalue().splitlines()],
+            [['sandbox', 'load'], ['sandbox', 'prepare'], ['sandbox', 'ping']]
+        )
+        self.assertTrue(all(
+            line.endswith('OK') for line in stdout.getvalue().splitlines()
+        ))
+
+        # Parsed WSDL, as cached by suds
+        url = PostNLCheckoutClient._get_bundled_wsdl_url()
+        self.assertTrue(
+            cache.get(suds_cache._cache_key('%s-wsdl' % abs(hash(url))))
+        )
+
+    def test_command_failure(self):
+        """ The command fails when the service is not OK. """
+
+        with HTTMock(self.nok_response):
+            with self.assertRaises(CommandError) as cm:
+                call_command('postnl_checkout_warmup', stdout=StringIO())
+
+        self.assertIn('sandbox ping: Service not OK.', str(cm.exception))
+
+    @override_settings(
+        POSTNL_CHECKOUT_WARMUP_ENVIRONMENTS=('sandbox', 'production')
+    )
+    def test_environments(self):
+        """ Configured environments are warmed up without pinging. """
+
+        def response(url, request):
+            self.fail('Service should not be called.')
+
+        with HTTMock(response):
+            steps = list(warm_up(ping=False))
+
+        self.assertEquals(
+            [(step.environment, step.step, step.error) for step in steps],
+            [
+                ('sandbox', 'load', None), ('sandbox', 'prepare', None),
+                ('production', 'load', None), ('production', 'prepare', None)
+            ]
+        )
+
+    @override_settings(POSTNL_CHECKOUT_WARMUP_ON_READY=True)
+    def test_ready(self):
+        """ The process' client is loaded on startup when enabled. """
+
+        app_config = apps.get_app_config('django_postnl_checkout')
+        self.assertIsInstance(app_config, PostNLCheckoutConfig)
+
+        # Unload the client, restoring it for other tests
+        self.addCleanup(
+            setattr, postnl_client, '_wrapped', postnl_client._wrapped
+        )
+        postnl_client._wrapped = empty
+
+        app_config.ready()
+
+        self.assertIsNot(postnl_client._wrapped, empty)
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+import datetime
+import unittest
+
+from postnl_checkout.envelope import UnsupportedValue
+
+from .base import PostNLTestMixin
+
+
+class EnvelopeTemplateTests(PostNLTestMixin, unittest.TestCase):
+    """ Compare envelopes rendered from templates with suds marshalling. """
+
+    webshop = {'IntRef': 'a0713e4083a049a996c302f48bb3f535'}
+
+    def setUp(self):
+        self.client = self.get_client(envelope_templates=True)
+
+    def render(self, operation, kwargs):
+        """ Return envelope rendered from template for Pythonic kwargs. """
+
+        kwargs = self.client._from_python(kwargs, operation)
+
+        return self.client._get_envelope_template(operation).render(
+            kwargs, self.client.security_header
+        )
+
+    def marshal(self, operation, kwargs):
+        """ Return envelope as marshalled and encoded by suds. """
+
+        kwargs = self.client._from_python(kwargs, operation)
+        method = getattr(self.client.service, operation).method
+
+        return method.binding.input.get_message(
+            method, [], kwargs
+        ).plain().encode('utf-8')
+
+    def assertRendered(self, operation, kwargs, filename=None):
+        """
+        Assert template renders the same bytes as suds and, without the
+        newlines in the fixture, as the request fixture.
+        """
+
+        envelope = self.render(operation, kwargs)
+
+        self.assertEquals(envelope, self.marshal(operation, kwargs))
+
+        if filename:
+            fixture = self.read_file(filename)
+            self.assertEquals(
+                envelope, fixture.replace('?>\n', '?>').rstrip('\n')
+            )
+
+    def test_fixtures(self):
+        """ Rendered envelopes match the request fixtures. """
+
+        checkout = {'OrderToken': '0cfb4be2-47cf-4eac-865c-d66657953d5c'}
+
+        self.assertRendered('PrepareOrder', {
+            'AangebodenBetaalMethoden': {
+                'PrepareOrderBetaalMethode': {
+                    'Code': 'IDEAL',
+                    'Prijs': '5.00'
+                }
+            },
+            'AangebodenCommunicatieOpties': {
+                'PrepareOrderCommunicatieOptie': {
+                    'Code': 'NEWS'
+                }
+            },
+            'Consument': {
+                'ExtRef': 'test@e-id.nl'
+            },
+            'Contact': {
+                'Url': 'http://www.kadowereld.nl/url/contact'
+            },
+            'Order': {
+                'ExtRef': '1105_900',
+                'OrderDatum': datetime.datetime(2011, 7, 21, 20, 11, 0),
+                'Subtotaal': '125.00',
+                'VerzendDatum': datetime.datetime(2011, 7, 22, 20, 11, 0),
+                'VerzendKosten': '12.50'
+            },
+            'Retour': {
+                'BeschrijvingUrl': 'http://www.kadowereld.nl/url/beschrijving',
+                'PolicyUrl': 'http://www.kadowereld.nl/url/policy',
+                'RetourTermijn': 28,
+                'StartProcesUrl': 'http://www.kadowereld.nl/url/startproces'
+            },
+            'Service': {
+                'Url': 'http://www.kadowereld.nl/url/service'
+            },
+            'Webshop': self.webshop
+        }, 'prepare_order_request.xml')
+
+        self.assertRendered('ReadOrder', {
+            'Checkout': checkout,
+            'Webshop': self.webshop
+        }, 'read_order_request.xml')
+
+        self.assertRendered('ConfirmOrder', {
+            'Checkout': checkout,
+            'Order': {
+                'PaymentTotal': '183.25'
+            },
+            'Webshop': self.webshop
+        }, 'confirm_order_request.xml')
+
+        self.assertRendered('UpdateOrder', {
+            'Order': {
+                'ExtRef': 'FDK004',
+                'Zending': {
+                    'UpdateOrderOrderZending': {
+                        'Busstuk': {
+                            'UpdateOrderOrderZendingBusstuk': {
+                                'Verzonden': '23-08-2011 12:00:00'
+                            }
+                        },
+                        'ExtRef': '642be996-6ab3-4a4c-b7d6-2417a4cee0df',
+                        'Pakket': {
+                            'UpdateOrderOrderZendingPakket': {
+                                'Barcode': '3s123456789',
+                                'Postcode': '4131LV'
+                            }
+                        }
+                    }
+                }
+            },
+            'Webshop': self.webshop
+        }, 'update_order_request.xml')
+
+        self.assertRendered('PingStatus', {}, 'ping_status_request.xml')
+
+    def test_edge_cases(self):
+        """ Escaping, lists, empty values and ordering. """
+
+        self.assertRendered('PrepareOrder', {
+            'Webshop': self.webshop,
+            'Order': {
+                # Out of schema order
+                'VerzendKosten': '1.00',
+                'ExtRef': [u'a & b', u'<\'caf\xe9\'>', u'&amp; &#39;'],
+                'Subtotaal': '',
+                'OrderDatum': None
+            },
+            'AangebodenOpties': {
+                'PrepareOrderOptie': [
+                    {'Code': 'WRAP', 'Prijs': '2.50'},
+                    {},
+                    {'Code': 'PRIO'}
+                ]
+            },
+            'Consument': {'ExtRef': None},
+            'Contact': {}
+        })
+
+    def test_empty(self):
+        """ Requests without content in the operation element. """
+
+        self.assertRendered('ReadOrder', {})
+        self.assertRendered('ReadOrder', {'Checkout': {'OrderToken': None}})
+        self.assertRendered('ReadOrder', {'Checkout': {'OrderToken': ''}})
+        self.assertRendered('UpdateOrder', {'Order': {'Zending': []}})
+
+    def test_empty_elements(self):
+        """ Complex elements with only empty nested values. """
+
+        self.assertRendered('UpdateOrder', {
+            'Order': {'Zending': {'UpdateOrderOrderZending': None}}
+        })
+        self.assertRendered('UpdateOrder', {
+            'Order': {'Zending': [{}]}
+        })
+        self.assertRendered('UpdateOrder', {
+            'Order': {'ExtRef': [''], 'Zending': {}}
+        })
+
+    def test_unsupported(self):
+        """ Values outside the schema are left to suds. """
+
+        template = self.client._get_envelope_template('ReadOrder')
+        header = self.client.security_header
+
+        for kwargs in (
+            {'Onbekend': u'x'},
+            {'Checkout': {'Onbekend': u'x'}},
+            {'Checkout': u'x'},
+            {'Checkout': {'OrderToken': {'Onbekend': u'x'}}},
+            {'Checkout': {'OrderToken': 1}},
+        ):
+            self.assertRaises(
+                UnsupportedValue, template.render, kwargs, header
+            )
+
+        self.assertEquals(
+            self.client._render_envelope('ReadOrder', {'Onbekend': u'x'}),
+            None
+        )
@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+import unittest
+
+try:
+    import django
+except ImportError:
+    django = None
+
+
+# Libraries to be imported on first use only
+HEAVY_MODULES = ('suds', 'suds_requests', 'requests', 'zeep', 'lxml')
+
+# Microseconds importing the client may take, generous for slow machines;
+# importing suds and requests took several times as long
+IMPORT_BUDGET = 100000
+
+PROJECT_DIR = os.path.join(os.path.dirname(__file__), '..')
+
+
+def run_python(code, *options):
+    """ Return stdout and stderr of code run by a fresh interpreter. """
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([
+        os.path.abspath(PROJECT_DIR),
+        os.path.abspath(os.path.join(PROJECT_DIR, 'test_project'))
+    ])
+    env['DJANGO_SETTINGS_MODULE'] = 'test_project.settings'
+
+    process = subprocess.Popen(
+        [sys.executable] + list(options) + ['-c', code],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env,
+        universal_newlines=True
+    )
+    stdout, stderr = process.communicate()
+
+    assert process.returncode == 0, stderr
+
+    return stdout, stderr
+
+
+class ImportTests(unittest.TestCase):
+    """ Importing the package does not load the SOAP and HTTP stack. """
+
+    def assertNotImported(self, code):
+        stdout, _ = run_python(code + (
+            '\nimport sys\n'
+            'print(" ".join(sorted(set(\n'
+            '    name.split(".")[0] for name in sys.modules\n'
+            '    if name.split(".")[0] in %r\n'
+            '))))' % (HEAVY_MODULES, )
+        ))
+
+        self.assertEquals(stdout.strip(), '')
+
+    def test_client(self):
+        """ Importing the client does not import suds or requests. """
+
+        self.assertNotImported('import postnl_checkout.client')
+
+    @unittest.skipIf(django is None, 'Django not installed')
+    def test_django(self):
+        """ Neither does loading the Django app. """
+
+        self.assertNotImported(
+            'import django\n'
+            'django.setup()\n'
+            'import postnl_checkout.contrib.django_postnl_checkout.models'
+        )
+
+    def get_import_time(self):
+        """ Return microseconds importing the client took. """
+
+        if sys.version_info < (3, 7):
+            # Without -X importtime, time the import itself
+            stdout, _ = run_python(
+                'import time\n'
+                'start = time.time()\n'
+                'import postnl_checkout.client\n'
+                'print(int((time.time() - start) * 1e6))'
+            )
+
+            return int(stdout)
+
+        _, stderr = run_python(
+            'import postnl_checkout.client', '-X', 'importtime'
+        )
+
+        for line in stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            _, cumulative, name = line.split('|')
+
+            if name.strip() == 'postnl_checkout.client':
+                return int(cumulative)
+
+        self.fail('No import time reported for the client.')
+
+    def test_import_time(self):
+        """ Importing the client stays within the budget. """
+
+        self.assertLess(self.get_import_time(), IMPORT_BUDGET)
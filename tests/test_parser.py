@@ -0,0 +1,85 @@
+import unittest
+
+from postnl_checkout.parser import FaultResponse
+
+from .base import PostNLTestMixin
+
+
+class ResponseParserTests(PostNLTestMixin, unittest.TestCase):
+    """ Compare ResponseParser with suds unmarshalling and _to_python. """
+
+    def setUp(self):
+        self.client = self.get_client()
+
+    def assertParsed(self, operation, reply):
+        """ Assert parser gives the same result as suds. """
+
+        method = getattr(self.client.service, operation)
+        expected = self.client._to_python(
+            method(__inject={'reply': reply}), operation
+        )
+
+        parser = self.client._get_response_parser(operation)
+
+        self.assertEquals(parser.parse(reply), expected)
+
+    def test_fixtures(self):
+        """ Test all response fixtures. """
+
+        for operation, filename in (
+            ('PrepareOrder', 'prepare_order_response.xml'),
+            ('ReadOrder', 'read_order_response.xml'),
+            ('ConfirmOrder', 'confirm_order_response.xml'),
+            ('UpdateOrder', 'update_order_response_success.xml'),
+            ('UpdateOrder', 'update_order_response_fail.xml'),
+            ('PingStatus', 'ping_status_response_ok.xml'),
+            ('PingStatus', 'ping_status_response_nok.xml'),
+        ):
+            self.assertParsed(operation, self.read_file(filename))
+
+    def test_edge_cases(self):
+        """ Empty complex elements, nil values, attributes and repeats. """
+
+        reply = self.read_file('read_order_response.xml')
+
+        # Empty complex element
+        reply = reply.replace(
+            '<tpp:ExtRef>15200_001</tpp:ExtRef>', ''
+        )
+        # Nil value and whitespace
+        reply = reply.replace(
+            '<tpp:Email>j.jansen@e-id.nl</tpp:Email>',
+            '<tpp:Email xmlns:i="http://www.w3.org/2001/XMLSchema-instance" '
+            'i:nil="true"/>'
+        )
+        reply = reply.replace(
+            '<tpp:ExtRef>jjansen</tpp:ExtRef>',
+            '<tpp:ExtRef> \n </tpp:ExtRef>'
+        )
+        # Attribute
+        reply = reply.replace('<tpp:Tijdvak>', '<tpp:Tijdvak foo="bar">')
+        # Repeated element
+        reply = reply.replace(
+            '<tpp:Opties>', '<tpp:Opties/><tpp:Opties>'
+        )
+
+        self.assertParsed('ReadOrder', reply)
+
+    def test_empty(self):
+        """ Test responses without content. """
+
+        reply = self.read_file('update_order_response_success.xml')
+        reply = reply.replace('<tpp:Succes>true</tpp:Succes>', '')
+
+        self.assertParsed('UpdateOrder', reply)
+        self.assertParsed('ReadOrder', reply.replace('Update', 'Read'))
+
+    def test_fault(self):
+        """ Faults raise FaultResponse. """
+
+        parser = self.client._get_response_parser('ReadOrder')
+
+        self.assertRaises(
+            FaultResponse, parser.parse,
+            self.read_file('read_order_response_fault.xml')
+        )
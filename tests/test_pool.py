@@ -0,0 +1,105 @@
+import threading
+import unittest
+
+from httmock import HTTMock
+
+from postnl_checkout.exceptions import PostNLPoolTimeoutException
+from postnl_checkout.pool import ClientPool
+
+from .base import PostNLTestMixin
+
+
+class ClientPoolTests(PostNLTestMixin, unittest.TestCase):
+    """ Tests for ClientPool. """
+
+    def setUp(self):
+        self.client = self.get_client()
+
+        self.pool = ClientPool(self.client, size=2, timeout=0.01)
+
+    def test_clone(self):
+        """ Clones share the parsed WSDL and connection pool. """
+
+        clone = self.client.clone()
+
+        self.assertIsNot(clone.suds_client, self.client.suds_client)
+        self.assertIs(clone.suds_client.wsdl, self.client.suds_client.wsdl)
+
+        transport = self.client.suds_client.options.transport
+        clone_transport = clone.suds_client.options.transport
+
+        self.assertIsNot(clone_transport, transport)
+        self.assertIs(clone_transport._session, transport._session)
+        self.assertEquals(
+            clone.suds_client.options.location,
+            self.client.suds_client.options.location
+        )
+
+    def test_checkout(self):
+        """ Clients are created up to size, after which checkout waits. """
+
+        first = self.pool.checkout()
+        second = self.pool.checkout()
+
+        self.assertIsNot(first, second)
+        self.assertIsNot(first, self.client)
+
+        self.assertRaises(PostNLPoolTimeoutException, self.pool.checkout)
+
+        self.pool.checkin(first)
+        self.assertIs(self.pool.checkout(), first)
+
+        self.assertEquals(self.pool.stats(), {
+            'size': 2,
+            'created': 2,
+            'idle': 0,
+            'in_use': 2,
+            'max_in_use': 2,
+            'checkouts': 3,
+            'waits': 1,
+            'timeouts': 1,
+            'wait_time': self.pool.stats()['wait_time']
+        })
+
+    def test_get_client(self):
+        """ Context manager checks in client on exceptions. """
+
+        with self.assertRaises(ValueError):
+            with self.pool.get_client():
+                raise ValueError()
+
+        self.assertEquals(self.pool.stats()['in_use'], 0)
+        self.assertEquals(self.pool.stats()['idle'], 1)
+
+    def test_threads(self):
+        """ Concurrent threads each use their own client. """
+
+        def response(url, request):
+            return self.read_file('ping_status_response_ok.xml')
+
+        pool = ClientPool(self.client, size=3)
+        results = []
+
+        def ping():
+            for index in range(5):
+                with pool.get_client() as client:
+                    try:
+                        results.append(client.ping_status())
+                    except Exception as e:
+                        results.append(e)
+
+        with HTTMock(response):
+            threads = [threading.Thread(target=ping) for index in range(6)]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+        self.assertEquals(results, [True] * 30)
+
+        stats = pool.stats()
+        self.assertEquals(stats['checkouts'], 30)
+        self.assertLessEqual(stats['created'], 3)
+        self.assertEquals(stats['in_use'], 0)
@@ -0,0 +1,177 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from httmock import HTTMock
+
+from postnl_checkout.exceptions import PostNLRequestException
+from postnl_checkout.recording import INDEX_ENTRY, MAGIC, Recording, \
+    RecordingTransport, ReplayTransport
+
+from .base import PostNLTestMixin
+
+
+class RecordingTests(PostNLTestMixin, unittest.TestCase):
+    """ Tests for recording and replaying exchanges. """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        self.path = os.path.join(self.directory, 'recording')
+
+    def record(self):
+        """ Record ReadOrder, a fault and PingStatus. """
+
+        def response(url, request):
+            if 'PingStatus' in request.headers['SOAPAction']:
+                return self.read_file('ping_status_response_ok.xml')
+
+            if 'fault' in request.body:
+                return {
+                    'status_code': 500,
+                    'headers': {'content-type': 'text/xml'},
+                    'content': self.read_file('read_order_response_fault.xml')
+                }
+
+            return {
+                'status_code': 200,
+                'headers': {'content-type': 'text/xml'},
+                'content': self.read_file('read_order_response.xml')
+            }
+
+        transport = RecordingTransport(self.path)
+        client = self.get_client(transport=transport)
+
+        with HTTMock(response):
+            self.result = client.read_order(Checkout={'OrderToken': 'a'})
+
+            # Recorded by clones as well
+            self.assertRaises(
+                PostNLRequestException, client.clone().read_order,
+                Checkout={'OrderToken': 'fault'}
+            )
+
+            client.ping_status()
+
+        transport.close()
+
+    def test_record(self):
+        """ Exchanges are stored with an index, less credentials. """
+
+        self.record()
+
+        with open(self.path, 'rb') as f:
+            self.assertEquals(f.read(len(MAGIC)), MAGIC)
+
+        self.assertEquals(
+            os.path.getsize(self.path + '.idx'), 3 * INDEX_ENTRY.size
+        )
+
+        exchanges = Recording(self.path).load()
+
+        self.assertEquals(
+            sorted(exchange.operation for exchange in exchanges.values()),
+            ['PingStatus', 'ReadOrder', 'ReadOrder']
+        )
+
+        for exchange in exchanges.values():
+            self.assertNotIn(b'Security', exchange.request)
+            self.assertNotIn(b'klant1', exchange.request)
+
+    def test_replay(self):
+        """ Recorded replies are served without network access. """
+
+        self.record()
+
+        client = self.get_client(
+            transport=ReplayTransport(self.path, strict=True)
+        )
+
+        def response(url, request):
+            self.fail('Replay should not use the network.')
+
+        with HTTMock(response):
+            self.assertEquals(
+                client.read_order(Checkout={'OrderToken': 'a'}), self.result
+            )
+
+            self.assertRaises(
+                PostNLRequestException, client.clone().read_order,
+                Checkout={'OrderToken': 'fault'}
+            )
+
+            self.assertEquals(client.ping_status(), True)
+
+            # Not recorded
+            self.assertRaises(
+                Exception, client.read_order, Checkout={'OrderToken': 'b'}
+            )
+
+    def test_replay_fault_status(self):
+        """ Faults raised as transport errors are recorded and replayed. """
+
+        def response(url, request):
+            # As sent by PostNL
+            return {
+                'status_code': 500,
+                'headers': {'content-type': 'text/xml; charset=utf-8'},
+                'content': self.read_file('read_order_response_fault.xml')
+            }
+
+        client = self.get_client(transport=RecordingTransport(self.path))
+
+        with HTTMock(response):
+            self.assertRaises(
+                PostNLRequestException, client.read_order,
+                Checkout={'OrderToken': 'fault'}
+            )
+
+        client.backend.transport.close()
+
+        exchanges = Recording(self.path).load()
+        self.assertEquals(
+            [exchange.status for exchange in exchanges.values()], [500]
+        )
+
+        for strict in (True, False):
+            client = self.get_client(
+                transport=ReplayTransport(self.path, strict=strict)
+            )
+
+            with self.assertRaises(PostNLRequestException) as cm:
+                client.read_order(Checkout={'OrderToken': 'fault'})
+
+            self.assertEquals(cm.exception.args[0], 'Unknown order token.')
+
+            # Unrecorded requests get the recorded fault as well
+            if not strict:
+                self.assertRaises(
+                    PostNLRequestException, client.read_order,
+                    Checkout={'OrderToken': 'b'}
+                )
+
+    def test_replay_operation(self):
+        """ Unrecorded requests get a reply recorded for the operation. """
+
+        self.record()
+
+        transport = ReplayTransport(self.path, latency=True)
+        client = self.get_client(transport=transport)
+
+        results = []
+
+        # Replies, including the fault, are served in turn
+        for index in range(2):
+            try:
+                results.append(client.read_order(Checkout={'OrderToken': 'b'}))
+            except PostNLRequestException as e:
+                results.append(e)
+
+        self.assertIn(self.result, results)
+
+        start, end, request_size, reply_size = transport.last_exchange
+        self.assertGreaterEqual(
+            end - start, min(transport._latencies['ReadOrder'])
+        )
@@ -0,0 +1,112 @@
+import datetime
+import decimal
+import json
+import pickle
+import unittest
+
+from postnl_checkout.codegen import OUTPUT_PATH, generate_records
+from postnl_checkout.records import Record
+from postnl_checkout.records_generated import AdresType, ReadOrderResponse
+
+from .base import PostNLTestMixin
+
+
+class RecordTests(PostNLTestMixin, unittest.TestCase):
+    """ Tests for records generated from the XSD's. """
+
+    def setUp(self):
+        self.client = self.get_client()
+
+    def get_response(self):
+        """ Return unmarshalled ReadOrder response. """
+
+        method = self.client.service.ReadOrder.method
+
+        return method.binding.output.get_reply(
+            method, self.read_file('read_order_response.xml')
+        )[1]
+
+    def test_generated(self):
+        """ Generated records are up to date with the bundled XSD's. """
+
+        with open(OUTPUT_PATH) as f:
+            self.assertEquals(
+                f.read(), generate_records(self.client._get_schema())
+            )
+
+    def test_to_python(self):
+        """ Records hold the values dictionaries would. """
+
+        response = self.get_response()
+
+        record = self.client._to_python(response, 'ReadOrder', records=True)
+        expected = self.client._to_python(response, 'ReadOrder')
+
+        self.assertIsInstance(record, ReadOrderResponse)
+        self.assertEquals(record, expected)
+        self.assertEquals(record.to_dict(), expected)
+
+        self.assertEquals(
+            record.Voorkeuren.Bezorging.Datum,
+            datetime.datetime(2012, 4, 26)
+        )
+        self.assertEquals(
+            record['Opties']['ReadOrderResponseOpties'][0].Prijs,
+            decimal.Decimal('2.00')
+        )
+
+        # No instance dictionaries
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertFalse(hasattr(record.Facturatie.Adres, '__dict__'))
+
+    def test_interning(self):
+        """ Values of low-cardinality elements are shared. """
+
+        response = self.get_response()
+
+        first = self.client._to_python(response, 'ReadOrder', records=True)
+        second = self.client._to_python(response, 'ReadOrder', records=True)
+
+        self.assertIs(
+            first.Facturatie.Adres.Land, second.Facturatie.Adres.Land
+        )
+        self.assertIsNot(
+            first.Facturatie.Adres.Straat, second.Facturatie.Adres.Straat
+        )
+
+    def test_mapping(self):
+        """ Records are read-only mappings of the elements present. """
+
+        address = AdresType(Land=u'NL', Postcode=u'4131LV', Onbekend=u'x')
+
+        self.assertEquals(address.Land, u'NL')
+        self.assertEquals(address.Straat, None)
+        self.assertRaises(AttributeError, getattr, address, 'Onbekend')
+
+        self.assertEquals(
+            address, {'Land': u'NL', 'Postcode': u'4131LV', 'Onbekend': u'x'}
+        )
+        self.assertEquals(len(address), 3)
+        self.assertIn('Onbekend', address)
+        self.assertNotIn('Straat', address)
+        self.assertRaises(KeyError, lambda: address['Straat'])
+        self.assertEquals(address.get('Straat', u'?'), u'?')
+
+        self.assertNotEquals(address, AdresType(Land=u'NL'))
+        self.assertNotEquals(address, None)
+
+    def test_serialization(self):
+        """ Records pickle as records and serialize to JSON as objects. """
+
+        record = self.client._to_python(
+            self.get_response(), 'ReadOrder', records=True
+        )
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copy = pickle.loads(pickle.dumps(record, protocol))
+
+            self.assertIsInstance(copy, Record)
+            self.assertEquals(copy, record)
+
+        data = json.loads(json.dumps(record.to_json(), default=str))
+        self.assertEquals(data['Order'], {'ExtRef': u'15200_001'})
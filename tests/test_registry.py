@@ -0,0 +1,96 @@
+import unittest
+
+from postnl_checkout.registry import ClientRegistry
+
+from .base import PostNLTestMixin
+
+
+class ClientRegistryTests(PostNLTestMixin, unittest.TestCase):
+    """ Tests for ClientRegistry. """
+
+    def setUp(self):
+        self.environments = []
+
+        self.registry = ClientRegistry(
+            self.factory, pool_size=2,
+            max_memory=2 * ClientRegistry.client_memory
+        )
+
+    def factory(self, environment):
+        self.environments.append(environment)
+
+        return self.get_client(environment=environment)
+
+    def test_get_pool(self):
+        """ Pools by webshop share the parsed WSDL of the environment. """
+
+        pool = self.registry.get_pool('sandbox', 'klant2', 'yy', 'webshop2')
+        other_pool = self.registry.get_pool(
+            'sandbox', 'klant3', 'zz', 'webshop3'
+        )
+
+        self.assertIs(
+            self.registry.get_pool('sandbox', 'klant2', 'yy', 'webshop2'),
+            pool
+        )
+        self.assertIsNot(other_pool, pool)
+
+        self.assertEquals(pool.client.webshop_id, 'webshop2')
+        self.assertEquals(other_pool.client.webshop_id, 'webshop3')
+        self.assertEquals(
+            pool.client.suds_client.options.wsse.tokens[0].username, 'klant2'
+        )
+        self.assertIs(
+            pool.client.suds_client.wsdl, other_pool.client.suds_client.wsdl
+        )
+
+        self.registry.get_pool('production', 'klant2', 'yy', 'webshop2')
+
+        self.assertEquals(self.environments, ['sandbox', 'production'])
+
+    def test_get_client(self):
+        """ Context manager checks out a client of the webshop's pool. """
+
+        with self.registry.get_client(
+            'sandbox', 'klant2', 'yy', 'webshop2'
+        ) as client:
+            self.assertEquals(client.webshop_id, 'webshop2')
+
+        pool = self.registry.get_pool('sandbox', 'klant2', 'yy', 'webshop2')
+        self.assertEquals(pool.stats()['checkouts'], 1)
+
+    def test_eviction(self):
+        """ Pools least recently used are evicted over the memory cap. """
+
+        first = self.registry.get_pool('sandbox', 'klant1', 'xx', 'webshop1')
+        self.registry.get_pool('sandbox', 'klant2', 'yy', 'webshop2')
+
+        # Most recently used
+        self.assertIs(
+            self.registry.get_pool('sandbox', 'klant1', 'xx', 'webshop1'),
+            first
+        )
+
+        self.registry.get_pool('sandbox', 'klant3', 'zz', 'webshop3')
+
+        self.assertEquals(list(self.registry._pools), [
+            ('sandbox', 'klant1', 'webshop1'),
+            ('sandbox', 'klant3', 'webshop3')
+        ])
+
+        # Clients in use count towards the cap
+        with first.get_client():
+            self.registry.get_pool('sandbox', 'klant1', 'xx', 'webshop1')
+
+        self.assertEquals(len(self.registry), 1)
+
+        self.assertEquals(self.registry.stats(), {
+            'environments': 1,
+            'pools': 1,
+            'memory': 2 * ClientRegistry.client_memory,
+            'max_memory': 2 * ClientRegistry.client_memory,
+            'evictions': 2
+        })
+
+        self.registry.remove('sandbox', 'klant1', 'webshop1')
+        self.assertEquals(len(self.registry), 0)
@@ -0,0 +1,90 @@
+import threading
+import time
+import unittest
+
+from postnl_checkout.singleflight import SingleFlight, get_key_digest, \
+    make_key
+
+
+class SingleFlightTests(unittest.TestCase):
+    """ Tests for coalescing of calls in flight. """
+
+    def run_concurrently(self, single_flight, function, count=3):
+        """
+        Call function for the same key from count threads, holding the
+        first call until the others wait for it. Return outcomes.
+        """
+
+        release = threading.Event()
+        outcomes = []
+
+        def held():
+            release.wait(5)
+            return function()
+
+        def call():
+            try:
+                outcomes.append(single_flight.do('key', held))
+            except Exception as e:
+                outcomes.append(e)
+
+        threads = [threading.Thread(target=call) for index in range(count)]
+
+        for thread in threads:
+            thread.start()
+
+        deadline = time.time() + 5
+        while single_flight.coalesced < count - 1 and time.time() < deadline:
+            time.sleep(0.01)
+
+        release.set()
+
+        for thread in threads:
+            thread.join()
+
+        return outcomes
+
+    def test_do(self):
+        """ Waiting callers share the result of the call in flight. """
+
+        single_flight = SingleFlight()
+
+        outcomes = self.run_concurrently(single_flight, lambda: 42)
+
+        self.assertEquals(
+            sorted(outcomes), [(42, False), (42, True), (42, True)]
+        )
+        self.assertEquals(single_flight.stats(), {'calls': 1, 'coalesced': 2})
+
+        # Finished calls are not shared
+        self.assertEquals(single_flight.do('key', lambda: 43), (43, False))
+
+    def test_exception(self):
+        """ Exceptions are raised to all waiting callers. """
+
+        def fail():
+            raise ValueError('failed')
+
+        outcomes = self.run_concurrently(SingleFlight(), fail)
+
+        self.assertEquals(len(outcomes), 3)
+        for outcome in outcomes:
+            self.assertIsInstance(outcome, ValueError)
+
+    def test_make_key(self):
+        """ Keys do not depend on the order of arguments. """
+
+        first = make_key('ReadOrder', {
+            'Checkout': {'OrderToken': 'x'}, 'Options': [1, {'a': 1, 'b': 2}]
+        })
+        second = make_key('ReadOrder', {
+            'Options': [1, {'b': 2, 'a': 1}], 'Checkout': {'OrderToken': 'x'}
+        })
+
+        self.assertEquals(first, second)
+        self.assertEquals(hash(first), hash(second))
+        self.assertEquals(get_key_digest(first), get_key_digest(second))
+
+        self.assertNotEquals(
+            first, make_key('PingStatus', {'Checkout': {'OrderToken': 'x'}})
+        )
@@ -0,0 +1,114 @@
+import time
+import unittest
+
+import requests
+import suds.client
+
+from postnl_checkout.exceptions import PostNLRequestException
+from postnl_checkout.standin import StandinApp, StandinServer
+
+from .base import PostNLTestMixin
+
+
+class StandinTests(PostNLTestMixin, unittest.TestCase):
+    """ Test clients against the stand-in server. """
+
+    def start(self, **kwargs):
+        """ Start stand-in, returning client for it. """
+
+        self.app = StandinApp(seed=1, **kwargs)
+        self.server = StandinServer(self.app).start()
+
+        self.addCleanup(self.server.stop)
+
+        client = self.get_client()
+        client.suds_client.set_options(location=self.server.location)
+
+        self.addCleanup(client.suds_client.options.transport._session.close)
+
+        return client
+
+    def test_operations(self):
+        """ All operations are answered, echoing request values. """
+
+        client = self.start()
+
+        result = client.prepare_order(Order={
+            'ExtRef': '1105_900', 'Subtotaal': '125.00'
+        })
+        token = result['Checkout']['OrderToken']
+
+        self.assertEquals(
+            result['Webshop']['IntRef'], 'a0713e4083a049a996c302f48bb3f535'
+        )
+        self.assertIn(token, result['Checkout']['Url'])
+
+        result = client.read_order(Checkout={'OrderToken': token})
+        self.assertIn('Consument', result)
+        self.assertIsNotNone(result['Voorkeuren']['Bezorging']['Datum'])
+
+        result = client.confirm_order(
+            Checkout={'OrderToken': token},
+            Order={'ExtRef': '1105_900', 'PaymentTotal': '183.25'}
+        )
+        self.assertEquals(result['Order']['ExtRef'], '1105_900')
+
+        self.assertIs(client.update_order(Order={'ExtRef': '1105_900'}), True)
+        self.assertIs(client.ping_status(), True)
+
+        with self.assertRaises(PostNLRequestException) as cm:
+            client.read_order(Checkout={'OrderToken': 'unknown'})
+
+        self.assertEquals(cm.exception.args[0], 'Unknown order token.')
+
+        self.assertEquals(self.app.stats[('ReadOrder', 'success')], 1)
+        self.assertEquals(self.app.stats[('ReadOrder', 'fault')], 1)
+
+    def test_documents(self):
+        """ WSDL is served with the stand-in location, along with XSD's. """
+
+        self.start()
+
+        wsdl = requests.get(self.server.location + '?wsdl')
+        self.assertIn(self.server.location, wsdl.text)
+
+        client = suds.client.Client(self.server.location + '?wsdl')
+        self.assertEquals(
+            client.wsdl.services[0].ports[0].location, self.server.location
+        )
+
+        self.assertEquals(
+            requests.get(self.server.url + 'missing.xsd').status_code, 404
+        )
+
+    def test_errors(self):
+        """ Injected errors are retried, injected faults raised. """
+
+        client = self.start(error_rate=0.5)
+        client.retries = 10
+        client.retry_backoff = 0
+
+        for index in range(10):
+            self.assertIs(client.ping_status(), True)
+
+        self.assertEquals(self.app.stats[('PingStatus', 'success')], 10)
+        self.assertGreater(self.app.stats[('PingStatus', 'error')], 0)
+
+        self.app.error_rate = 0
+        self.app.fault_rate = 1
+
+        self.assertRaises(
+            PostNLRequestException,
+            client.read_order, Checkout={'OrderToken': 'x'}
+        )
+
+    def test_drip(self):
+        """ Replies drip in chunk by chunk. """
+
+        client = self.start(drip_interval=0.01, drip_size=500)
+
+        start = time.time()
+        client.read_order(Checkout={'OrderToken': 'x'})
+
+        # Reply is several chunks
+        self.assertGreater(time.time() - start, 0.03)
@@ -0,0 +1,157 @@
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+from postnl_checkout.client import PostNLCheckoutClient
+from postnl_checkout.exceptions import PostNLRequestException
+from postnl_checkout.schema import Schema
+from postnl_checkout.validation import RequestValidator
+
+
+# Restrictions PostNL might declare, absent from the bundled XSD's
+RESTRICTED_XSD = '''<?xml version="1.0" encoding="utf-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns:tns="urn:test" targetNamespace="urn:test">
+  <xs:element name="Operation" type="tns:Operation"/>
+  <xs:complexType name="Operation">
+    <xs:sequence>
+      <xs:element name="Code" type="tns:Code"/>
+      <xs:element minOccurs="0" name="Naam" type="tns:Naam"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:simpleType name="Code">
+    <xs:restriction base="xs:string">
+      <xs:enumeration value="P"/>
+      <xs:enumeration value="Z"/>
+    </xs:restriction>
+  </xs:simpleType>
+  <xs:simpleType name="Naam">
+    <xs:restriction base="xs:string">
+      <xs:maxLength value="5"/>
+    </xs:restriction>
+  </xs:simpleType>
+</xs:schema>
+'''
+
+
+class RequestValidatorTests(unittest.TestCase):
+    """ Tests for request validators compiled from the XSD's. """
+
+    def get_validator(self, operation):
+        return PostNLCheckoutClient._get_request_validator(operation)
+
+    def assertInvalid(self, operation, kwargs, message):
+        with self.assertRaises(PostNLRequestException) as cm:
+            self.get_validator(operation).validate(kwargs)
+
+        self.assertEquals(
+            cm.exception.args[0],
+            'Invalid %s request: %s' % (operation, message)
+        )
+
+    def test_valid(self):
+        """ Arguments conforming to the schema pass. """
+
+        self.get_validator('PrepareOrder').validate({
+            'Webshop': {'IntRef': 'x'},
+            'Order': {
+                'ExtRef': '1105_900',
+                'OrderDatum': datetime.datetime(2011, 7, 21, 20, 11),
+                'Subtotaal': '125.00'
+            },
+            'AangebodenBetaalMethoden': {
+                'PrepareOrderBetaalMethode': [
+                    {'Code': 'IDEAL', 'Prijs': '0.00'},
+                    {'Code': 'CREDITCARD', 'Prijs': '1.00'}
+                ]
+            },
+            'Retour': {'RetourTermijn': 28},
+            'Consument': None
+        })
+
+        # Arguments outside the schema are left out by suds
+        self.get_validator('UpdateOrder').validate({
+            'Webshop': {'IntRef': 'x'},
+            'Order': {'ExtRef': 'FDK004'},
+            'Checkout': {'OrderToken': 'x'}
+        })
+
+    def test_required(self):
+        """ Required elements must be present. """
+
+        self.assertInvalid(
+            'ReadOrder', {'Webshop': {'IntRef': 'x'}},
+            'Checkout is required.'
+        )
+        self.assertInvalid(
+            'ReadOrder', {'Webshop': {'IntRef': 'x'}, 'Checkout': {}},
+            'Checkout.OrderToken is required.'
+        )
+        self.assertInvalid(
+            'UpdateOrder',
+            {'Webshop': {'IntRef': 'x'}, 'Order': {'ExtRef': None}},
+            'Order.ExtRef is required.'
+        )
+
+    def test_shape(self):
+        """ Complex elements take dictionaries, leaves single values. """
+
+        kwargs = {'Webshop': {'IntRef': 'x'}, 'Order': {'ExtRef': 'x'}}
+
+        kwargs['Order']['Zending'] = 'x'
+        self.assertInvalid(
+            'UpdateOrder', kwargs, 'Order.Zending should be a dictionary.'
+        )
+
+        kwargs['Order']['Zending'] = {
+            'UpdateOrderOrderZending': [{'ExtRef': {'Onbekend': 'x'}}]
+        }
+        self.assertInvalid(
+            'UpdateOrder', kwargs,
+            'Order.Zending.UpdateOrderOrderZending[0].ExtRef should be a '
+            'single value.'
+        )
+
+        kwargs['Order']['Zending'] = {'Onbekend': 'x'}
+        self.assertInvalid(
+            'UpdateOrder', kwargs,
+            'Order.Zending.Onbekend is not in the schema.'
+        )
+
+        kwargs['Order'] = [{'ExtRef': 'x'}]
+        self.assertInvalid('UpdateOrder', kwargs, 'Order occurs at most once.')
+
+    def test_restrictions(self):
+        """ Enumerations and maximum lengths are enforced. """
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        with open(os.path.join(directory, 'test.xsd'), 'w') as f:
+            f.write(RESTRICTED_XSD)
+
+        validator = RequestValidator(Schema(directory), 'Operation')
+
+        validator.validate({'Code': 'P', 'Naam': u'12345'})
+
+        for kwargs, message in (
+            ({}, 'Code is required.'),
+            ({'Code': 'X'}, 'Code should be one of P, Z.'),
+            (
+                {'Code': 'Z', 'Naam': u'123456'},
+                'Naam exceeds the maximum length of 5.'
+            )
+        ):
+            with self.assertRaises(PostNLRequestException) as cm:
+                validator.validate(kwargs)
+
+            self.assertEquals(
+                cm.exception.args[0], 'Invalid Operation request: ' + message
+            )
+
+        self.assertRaises(
+            ValueError, RequestValidator, Schema(directory), 'Operation',
+            ('Onbekend', )
+        )